@@ -4,7 +4,7 @@ import logging
 from os import getenv
 from typing import Any
 
-from django.core.cache import cache
+from redis import Redis
 from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
@@ -24,15 +24,18 @@ if USE_REDIS_FOR_CACHE:
         },
     }
 
-    # Ping the cache to see if it's working
+    # Ping Redis directly: going through `django.core.cache` here would create
+    # and keep a Redis cache connection even if we fall back to the dummy cache
     try:
-        cache.set("ping", "pong")
+        client = Redis.from_url(REDIS_URL, socket_connect_timeout=2)
+        client.set("ping", "pong")
 
-        if cache.get("ping") != "pong":
+        if client.get("ping") != b"pong":
             msg = "Cache is not working properly."
             raise ValueError(msg)  # noqa: TRY301
 
-        cache.delete("ping")
+        client.delete("ping")
+        client.close()
 
         logger.info("Cache is working properly")
     except (ValueError, RedisError):
@@ -45,3 +48,7 @@ else:
     CACHES["default"] = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     }
+
+# How long rendered catalog responses live in the cache (they are also
+# invalidated on every Category/Product change)
+CATALOG_CACHE_TIMEOUT = int(getenv("CATALOG_CACHE_TIMEOUT", default="3600"))
@@ -17,3 +17,11 @@ task_ignore_result = getenv("CELERY_TASK_IGNORE_RESULT", "false").lower() == "tr
 
 timezone = TIME_ZONE
 enable_utc = True
+
+# Расписание для `celery beat`: старт и окончание ценовых кампаний
+beat_schedule = {
+    "run-price-campaigns": {
+        "task": "tasks.pricing.run_price_campaigns",
+        "schedule": float(getenv("PRICE_CAMPAIGNS_INTERVAL", "60")),
+    },
+}
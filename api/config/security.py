@@ -11,6 +11,11 @@ SECRET_KEY = getenv("DJANGO_SECRET_KEY", _default_secret_key)
 if _default_secret_key == SECRET_KEY:
     logger.warning("You are using a default Django secret key")
 
+# Shared with the bot; it sends the token in X-Bot-Token to /customers/
+BOT_API_TOKEN = getenv("BOT_API_TOKEN", "")
+if not BOT_API_TOKEN:
+    logger.warning("BOT_API_TOKEN is not set, /customers/ is open to staff only")
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = getenv("DJANGO_DEBUG", "false").lower() == "true"
 
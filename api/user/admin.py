@@ -2,11 +2,26 @@ from __future__ import annotations
 
 from typing import Any
 
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.html import format_html
 
 from api.user.models import User
 
-from .models import Cart, CartItem, Category, Order, OrderItem, Product
+from .models import (
+    Cart,
+    CartItem,
+    Category,
+    Customer,
+    Order,
+    OrderItem,
+    PriceCampaign,
+    Product,
+)
+from .pricing import apply_campaign, finish_campaign, start_campaign
 
 
 @admin.register(User)
@@ -38,16 +53,143 @@ class UserAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ("telegram_id", "phone", "language", "updated_at")
+    list_filter = ("language",)
+    search_fields = ("=telegram_id", "phone")
+    readonly_fields = ("created_at", "updated_at")
+
+
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("id", "name")
 
 
+class RepriceForm(forms.Form):
+    kind = forms.ChoiceField(
+        label="Изменение",
+        choices=[("", "—"), *PriceCampaign.Kind.choices],
+        required=False,
+    )
+    value = forms.DecimalField(
+        label="Значение",
+        max_digits=10,
+        decimal_places=2,
+        required=False,
+    )
+    starts_at = forms.DateTimeField(
+        label="С",
+        required=False,
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local"}),
+    )
+    ends_at = forms.DateTimeField(
+        label="До",
+        required=False,
+        widget=forms.DateTimeInput(attrs={"type": "datetime-local"}),
+    )
+
+
+class RepriceActionForm(ActionForm, RepriceForm):
+    pass
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "category", "price")
+    list_display = ("id", "thumbnail", "name", "category", "price", "discount_percent")
     list_filter = ("category",)
     search_fields = ("name",)
+    action_form = RepriceActionForm
+    actions = ("reprice",)
+
+    @admin.action(description="Изменить цену или скидку")
+    def reprice(self, request: Any, queryset: Any) -> None:
+        form = RepriceForm(request.POST)
+        if not form.is_valid() or not form.cleaned_data["kind"]:
+            self.message_user(request, "Выберите вид изменения", messages.ERROR)
+            return
+        data = form.cleaned_data
+        if data["value"] is None:
+            self.message_user(request, "Укажите значение", messages.ERROR)
+            return
+
+        product_ids = sorted(queryset.values_list("id", flat=True))
+        campaign = PriceCampaign(
+            name=f"{PriceCampaign.Kind(data['kind']).label}: {data['value']}, "
+            f"{len(product_ids)} товаров",
+            kind=data["kind"],
+            value=data["value"],
+            product_ids=product_ids,
+            starts_at=data["starts_at"] or timezone.now(),
+            ends_at=data["ends_at"],
+        )
+        try:
+            campaign.full_clean()
+        except ValidationError as e:
+            self.message_user(request, "; ".join(e.messages), messages.ERROR)
+            return
+
+        # Одна кампания — один bulk_update пачками и одна инвалидация кэша каталога
+        try:
+            repriced = start_campaign(campaign)
+        except ValueError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        if repriced is None:
+            self.message_user(request, f"Кампания «{campaign}» запланирована")
+        else:
+            self.message_user(request, f"Цены изменены у {repriced} товаров")
+
+    @admin.display(description="Фото")
+    def thumbnail(self, obj: Product) -> str:
+        if not obj.image_thumbnail:
+            return "—"
+        return format_html('<img src="{}" height="48">', obj.image_thumbnail.url)
+
+
+@admin.register(PriceCampaign)
+class PriceCampaignAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "kind", "value", "status", "starts_at", "ends_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("status", "created_at")
+    actions = ("apply_now", "finish_now")
+
+    def get_readonly_fields(
+        self,
+        request: Any,  # noqa: ARG002
+        obj: PriceCampaign | None = None,
+    ) -> Any:
+        if obj and obj.status != PriceCampaign.Status.SCHEDULED:
+            # Применённую кампанию не меняют — её завершают и создают новую
+            return [field.name for field in obj._meta.fields]  # noqa: SLF001
+        return self.readonly_fields
+
+    def save_model(
+        self,
+        request: Any,  # noqa: ARG002
+        obj: PriceCampaign,
+        form: Any,  # noqa: ARG002
+        change: bool,  # noqa: ARG002, FBT001
+    ) -> None:
+        start_campaign(obj)
+
+    @admin.action(description="Применить сейчас")
+    def apply_now(self, request: Any, queryset: Any) -> None:
+        repriced = 0
+        for campaign in queryset.filter(status=PriceCampaign.Status.SCHEDULED):
+            try:
+                repriced += apply_campaign(campaign)
+            except ValueError as e:  # noqa: PERF203
+                self.message_user(request, f"{campaign}: {e}", messages.ERROR)
+        self.message_user(request, f"Цены изменены у {repriced} товаров")
+
+    @admin.action(description="Завершить и вернуть цены")
+    def finish_now(self, request: Any, queryset: Any) -> None:
+        restored = sum(
+            finish_campaign(campaign)
+            for campaign in queryset.filter(status=PriceCampaign.Status.ACTIVE)
+        )
+        self.message_user(request, f"Цены возвращены у {restored} товаров")
 
 
 @admin.register(Cart)
@@ -69,7 +211,9 @@ class OrderItemInline(admin.TabularInline):  # Можно также испол
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ("id", "phone", "total", "created_at")
-    search_fields = ("phone",)
+    # Часть телефона: LIKE '%…%' на PostgreSQL идёт по триграммному order_phone_trgm.
+    # Точный телефон — ?phone=… в адресе списка, по order_phone_created_idx
+    search_fields = ("phone__contains",)
     list_filter = ("created_at",)
     inlines = [OrderItemInline]
     readonly_fields = ("created_at",)
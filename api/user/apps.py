@@ -6,3 +6,6 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api.user"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
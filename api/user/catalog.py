@@ -0,0 +1,204 @@
+"""Cached, pre-rendered catalog responses.
+
+Payloads are stored as rendered JSON bytes together with their ETag and the
+catalog version, so a cache hit is a single cache get with no queries and no
+serializer run, and conditional requests are answered with 304 from the same
+entry. Product payloads and the full catalog snapshot contain absolute image
+URLs and are therefore cached per request origin; every origin seen is kept in
+a registry so invalidation can reach all of its entries.
+
+Every invalidation also replaces a generation token. A worker that started
+building a payload before an invalidation notices the new token after it
+stores the payload and deletes it again, so a build that read the database
+before a commit cannot outlive the invalidation that followed the commit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .rendering import dumps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from django.http import HttpRequest
+
+    from .models import CatalogVersion
+
+T = TypeVar("T")
+
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+
+CATEGORIES_KEY = "catalog:categories"
+GENERATION_KEY = "catalog:generation"
+# Реестр источников: по ключу на источник и счётчик занятых слотов
+ORIGIN_KEY = "catalog:origin:{}"
+ORIGIN_SLOT_KEY = "catalog:origins:{}"
+ORIGIN_COUNT_KEY = "catalog:origins:count"
+
+# Пока один воркер собирает ответ, остальные ждут готовый ответ в кэше, не обращаясь к БД
+BUILD_LOCK_TIMEOUT = 10
+BUILD_WAIT_TIMEOUT = 2.0
+BUILD_WAIT_STEP = 0.05
+
+
+def request_origin(request: HttpRequest) -> str:
+    return f"{request.scheme}://{request.get_host()}"
+
+
+def _origin_id(origin: str) -> str:
+    return hashlib.sha1(origin.encode()).hexdigest()[:12]  # noqa: S324
+
+
+def products_key(category_id: int, origin: str) -> str:
+    return f"catalog:products:{category_id}:{_origin_id(origin)}"
+
+
+def snapshot_key(origin: str) -> str:
+    return f"catalog:snapshot:{_origin_id(origin)}"
+
+
+def render_json(data: Any) -> bytes:
+    # Тот же JSON, что отдавал бы DRF Response, но через orjson
+    return dumps(data)
+
+
+def remember_origin(origin: str) -> None:
+    """Register `origin` for invalidation; safe to call from concurrent workers.
+
+    Each origin gets its own slot from an atomic counter instead of being
+    added to a shared set, so two workers can never overwrite each other.
+    """
+    marker = ORIGIN_KEY.format(_origin_id(origin))
+    if cache.get(marker) is not None:
+        return
+    cache.add(ORIGIN_COUNT_KEY, 0, timeout=None)
+    try:
+        slot = cache.incr(ORIGIN_COUNT_KEY)
+    except ValueError:
+        # DummyCache ничего не хранит — и сбрасывать нечего
+        return
+    # Гонка двух воркеров даст дубль в реестре, но не потерю источника
+    cache.set(ORIGIN_SLOT_KEY.format(slot), origin, timeout=None)
+    cache.set(marker, slot, timeout=None)
+
+
+def known_origins() -> set[str]:
+    count = cache.get(ORIGIN_COUNT_KEY) or 0
+    slots = [ORIGIN_SLOT_KEY.format(slot) for slot in range(1, count + 1)]
+    return set(cache.get_many(slots).values()) if slots else set()
+
+
+class CatalogPayload(NamedTuple):
+    body: bytes
+    etag: str
+    version: int
+    last_modified: int  # unix timestamp
+
+
+def build_payload(
+    data: Callable[[], Any],
+    version: CatalogVersion | None = None,
+) -> CatalogPayload:
+    from .models import CatalogVersion
+
+    # Версию читаем до данных: ответ не может оказаться старее своей версии
+    version = version or CatalogVersion.current()
+    body = render_json(data())
+    return CatalogPayload(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        version=version.version,
+        last_modified=int(version.updated_at.timestamp()),
+    )
+
+
+def catalog_response(request: HttpRequest, payload: CatalogPayload) -> HttpResponse:
+    """200 with the cached body, or 304 if `If-None-Match`/`If-Modified-Since` match."""
+    response = HttpResponse(payload.body, content_type="application/json")
+    response.headers["ETag"] = payload.etag
+    response.headers["Last-Modified"] = http_date(payload.last_modified)
+    response = get_conditional_response(
+        request,
+        etag=payload.etag,
+        last_modified=payload.last_modified,
+        response=response,
+    )
+    response.headers[CATALOG_VERSION_HEADER] = str(payload.version)
+    return response
+
+
+def get_or_build(key: str, build: Callable[[], T]) -> T:
+    """Return the cached payload for `key`, building it once on a miss.
+
+    Only the worker that wins `cache.add` on the lock key builds the payload;
+    concurrent misses poll the cache for up to `BUILD_WAIT_TIMEOUT` seconds
+    before building it themselves.
+    """
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=BUILD_LOCK_TIMEOUT):
+        try:
+            generation = cache.get(GENERATION_KEY)
+            payload = build()
+            cache.set(key, payload, timeout=settings.CATALOG_CACHE_TIMEOUT)
+            # Каталог изменился во время сборки — ответ мог прочитать старые данные
+            if cache.get(GENERATION_KEY) != generation:
+                cache.delete(key)
+        finally:
+            cache.delete(lock_key)
+        return payload
+
+    deadline = time.monotonic() + BUILD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(BUILD_WAIT_STEP)
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+    return build()
+
+
+def _new_generation() -> None:
+    # Меняем до удаления: сборка, начатая раньше, увидит новый токен
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_categories() -> None:
+    _new_generation()
+    origins = known_origins()
+    cache.delete_many([CATEGORIES_KEY, *(snapshot_key(origin) for origin in origins)])
+
+
+def invalidate_products(category_ids: Iterable[int]) -> None:
+    _new_generation()
+    origins = known_origins()
+    # Снимок каталога содержит все товары — он устаревает при любом изменении
+    keys = [snapshot_key(origin) for origin in origins]
+    keys += [
+        products_key(category_id, origin)
+        for category_id in category_ids
+        for origin in origins
+    ]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_catalog() -> None:
+    """Drop every cached catalog payload (e.g. after bulk updates that skip signals)."""
+    from .models import Category
+
+    invalidate_categories()
+    invalidate_products(Category.objects.values_list("id", flat=True))
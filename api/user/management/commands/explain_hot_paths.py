@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.user.models import Cart, CartItem, Category, Order, OrderItem, Product
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from datetime import datetime
+
+    from django.db.models import Model, QuerySet
+
+SAMPLE_PHONE = "+998900000001"
+
+
+def _new_orders_after(created_at: datetime, order_id: int) -> QuerySet:
+    # Тот же keyset-запрос, что делает get_new_orders при переданном cursor
+    return (
+        Order.objects.filter(is_new=True, created_at__lte=created_at)
+        .filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=order_id))
+        .order_by("-created_at", "-id")[:51]
+    )
+
+
+class HotPath(NamedTuple):
+    label: str
+    query: Callable[[], QuerySet]
+    model: type[Model]
+    # Имя индекса или ведущие колонки индекса, который должен попасть в план
+    index: str | tuple[str, ...]
+    # Индекс создаётся только на этой СУБД (например, триграммный на PostgreSQL)
+    vendor: str | None = None
+
+
+HOT_PATHS = [
+    HotPath(
+        "new orders, first page",
+        lambda: Order.objects.filter(is_new=True).order_by("-created_at", "-id")[:51],
+        Order,
+        "order_new_created_idx",
+    ),
+    HotPath(
+        "new orders, next page",
+        lambda: _new_orders_after(timezone.now(), 1),
+        Order,
+        "order_new_created_idx",
+    ),
+    HotPath(
+        "orders by phone",
+        lambda: Order.objects.filter(phone=SAMPLE_PHONE).order_by("-created_at")[:100],
+        Order,
+        "order_phone_created_idx",
+    ),
+    HotPath(
+        "admin search by part of phone",
+        lambda: Order.objects.filter(phone__contains=SAMPLE_PHONE[-7:]),
+        Order,
+        "order_phone_trgm",
+        vendor="postgresql",
+    ),
+    HotPath(
+        "cart item by (cart, product)",
+        lambda: CartItem.objects.filter(cart_id=1, product_id=1),
+        CartItem,
+        ("cart_id", "product_id"),
+    ),
+    HotPath(
+        "cart items by cart",
+        lambda: CartItem.objects.filter(cart_id=1),
+        CartItem,
+        ("cart_id",),
+    ),
+    HotPath(
+        "order items by order",
+        lambda: OrderItem.objects.filter(order_id__in=[1, 2, 3]),
+        OrderItem,
+        ("order_id",),
+    ),
+]
+
+
+def index_names(model: type[Model], index: str | tuple[str, ...]) -> set[str]:
+    if isinstance(index, str):
+        return {index}
+    table = model._meta.db_table  # noqa: SLF001
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    names = set()
+    for name, info in constraints.items():
+        if (info["index"] or info["unique"]) and tuple(
+            info["columns"][: len(index)],
+        ) == index:
+            names.add(name)
+            if info["unique"] and connection.vendor == "sqlite":
+                # SQLite держит UNIQUE таблицы в индексе sqlite_autoindex_<table>_N
+                names.add(f"sqlite_autoindex_{table}_")
+    return names
+
+
+@contextmanager
+def keep_created_at() -> Iterator[None]:
+    # auto_now_add перезаписал бы разброс дат, нужный для реалистичного плана
+    field = Order._meta.get_field("created_at")  # noqa: SLF001
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot order/cart queries and check that each uses its index. "
+        "With --orders, first seeds that many fake orders (rolled back afterwards)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--orders",
+            type=int,
+            default=0,
+            help="Seed this many orders before explaining, e.g. 1000000",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Use EXPLAIN ANALYZE (PostgreSQL only)",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        if options["analyze"] and connection.vendor != "postgresql":
+            msg = "--analyze is only supported on PostgreSQL"
+            raise CommandError(msg)
+
+        with transaction.atomic():
+            if options["orders"]:
+                self.seed(options["orders"], options["batch_size"])
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            failures = self.explain_all(analyze=options["analyze"])
+            # Сгенерированные данные не должны остаться в базе
+            transaction.set_rollback(True)
+
+        if failures:
+            msg = f"Index not used for: {', '.join(failures)}"
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("All hot paths use their indexes"))
+
+    def explain_all(self, *, analyze: bool) -> list[str]:
+        failures = []
+        for path in HOT_PATHS:
+            if path.vendor and path.vendor != connection.vendor:
+                self.stdout.write(f"[SKIP] {path.label}: only on {path.vendor}\n")
+                continue
+            plan = path.query().explain(**({"analyze": True} if analyze else {}))
+            names = index_names(path.model, path.index)
+            used = any(name in plan for name in names)
+            status = self.style.SUCCESS("OK") if used else self.style.ERROR("MISS")
+            self.stdout.write(f"[{status}] {path.label}\n{plan}\n")
+            if not used:
+                failures.append(path.label)
+        return failures
+
+    def seed(self, orders: int, batch_size: int) -> None:
+        rng = random.Random(42)  # noqa: S311
+        now = timezone.now()
+        category = Category.objects.create(name="explain_hot_paths")
+        products = Product.objects.bulk_create(
+            Product(category=category, name=f"Product {i}", price=Decimal("10.00"))
+            for i in range(50)
+        )
+        phones = [SAMPLE_PHONE, *(f"+99890{i:07d}" for i in range(2, 10_000))]
+
+        self.stdout.write(f"Seeding {orders} orders...")
+        with keep_created_at():
+            for start in range(0, orders, batch_size):
+                size = min(batch_size, orders - start)
+                batch = Order.objects.bulk_create(
+                    Order(
+                        created_at=now - timedelta(minutes=start + i),
+                        total=Decimal("10.00"),
+                        phone=rng.choice(phones),
+                        # Новых заказов всегда немного: админ их разбирает
+                        is_new=start + i < orders // 100,
+                    )
+                    for i in range(size)
+                )
+                OrderItem.objects.bulk_create(
+                    OrderItem(
+                        order=order,
+                        product=rng.choice(products),
+                        quantity=1,
+                        price=Decimal("10.00"),
+                    )
+                    for order in batch
+                )
+
+        carts = Cart.objects.bulk_create(
+            Cart(phone=phone) for phone in phones[: max(1, orders // 100)]
+        )
+        CartItem.objects.bulk_create(
+            CartItem(cart=cart, product=product, quantity=1, final_price=Decimal("10.00"))
+            for cart in carts
+            for product in rng.sample(products, 3)
+        )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import F
+
+from api.user.models import Product
+from tasks.images import generate_product_image_variants
+
+
+class Command(BaseCommand):
+    help = "Queue Telegram/thumbnail image variants for products that lack them."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild variants even if they are up to date",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Build variants in this process instead of queueing Celery tasks",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        products = Product.objects.exclude(image="").exclude(image__isnull=True)
+        if not options["all"]:
+            products = products.exclude(image_variants_source=F("image"))
+
+        count = 0
+        for product_id in products.values_list("id", flat=True).iterator():
+            if options["sync"]:
+                generate_product_image_variants(product_id)
+            else:
+                generate_product_image_variants.delay(product_id)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued image variants for {count} products"),
+        )
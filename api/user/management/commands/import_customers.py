@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from api.user.models import Customer
+
+
+class Command(BaseCommand):
+    help = "Import bot customer profiles from a phone_numbers.json file."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path, help="Path to phone_numbers.json")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        path: Path = options["path"]
+        if not path.exists():
+            msg = f"File {path} does not exist"
+            raise CommandError(msg)
+
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            msg = f"File {path} is not valid JSON: {exc}"
+            raise CommandError(msg) from exc
+
+        customers = []
+        for user_id, entry in raw.items():
+            # Old format stored just the phone: {"<user_id>": "<phone>"}
+            profile = {"phone": entry} if isinstance(entry, str) else entry
+            customers.append(
+                Customer(
+                    telegram_id=int(user_id),
+                    phone=profile.get("phone") or "",
+                    language=profile.get("language") or "ru",
+                ),
+            )
+
+        with transaction.atomic():
+            Customer.objects.bulk_create(
+                customers,
+                batch_size=options["batch_size"],
+                update_conflicts=True,
+                unique_fields=["telegram_id"],
+                update_fields=["phone", "language", "updated_at"],
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(customers)} customers"))
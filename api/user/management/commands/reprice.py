@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.user.models import PriceCampaign
+from api.user.pricing import BATCH_SIZE, run_due_campaigns, start_campaign
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+def _datetime(value: str) -> datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        msg = f"Invalid date/time: {value!r}, expected e.g. 2025-07-01T09:00"
+        raise CommandError(msg)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _ids(value: str) -> list[int]:
+    try:
+        return [int(i) for i in value.split(",") if i.strip()]
+    except ValueError as e:
+        msg = f"--ids must be comma-separated numbers: {value!r}"
+        raise CommandError(msg) from e
+
+
+class Command(BaseCommand):
+    help = (
+        "Change the price or discount of a filtered set of products, now or between "
+        "--starts-at and --ends-at. With --run-due, apply and finish the campaigns "
+        "whose time has come (for cron when celery beat is not running)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        change = parser.add_mutually_exclusive_group(required=True)
+        change.add_argument("--discount", type=int, help="Set discount_percent, 0-100")
+        change.add_argument("--percent", type=Decimal, help="Change prices by ±N %%")
+        change.add_argument("--amount", type=Decimal, help="Change prices by ±N")
+        change.add_argument("--run-due", action="store_true")
+
+        parser.add_argument("--category", type=int, help="Category id")
+        parser.add_argument("--name", default="", help="Part of the product name")
+        parser.add_argument("--ids", type=_ids, default=[], help="e.g. 1,2,3")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Allow a change without filters, i.e. for the whole menu",
+        )
+        parser.add_argument("--starts-at", type=_datetime)
+        parser.add_argument("--ends-at", type=_datetime)
+        parser.add_argument("--title", help="Campaign name shown in the admin")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the matching products",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        if options["run_due"]:
+            applied, finished = run_due_campaigns()
+            self.stdout.write(
+                self.style.SUCCESS(f"Applied {applied}, finished {finished} campaigns"),
+            )
+            return
+
+        kind, value = next(
+            (kind, Decimal(options[kind]))
+            for kind in PriceCampaign.Kind.values
+            if options[kind] is not None
+        )
+        if not (
+            options["category"] or options["name"] or options["ids"] or options["all"]
+        ):
+            msg = "Pass --category, --name or --ids, or --all for every product"
+            raise CommandError(msg)
+
+        campaign = PriceCampaign(
+            name=options["title"] or f"reprice --{kind} {value}",
+            kind=kind,
+            value=value,
+            category_id=options["category"],
+            name_pattern=options["name"],
+            product_ids=options["ids"],
+            all_products=options["all"],
+            starts_at=options["starts_at"] or timezone.now(),
+            ends_at=options["ends_at"],
+        )
+        try:
+            campaign.full_clean()
+        except ValidationError as e:
+            raise CommandError("; ".join(e.messages)) from e
+
+        if options["dry_run"]:
+            self.stdout.write(f"{campaign.products().count()} products match")
+            return
+
+        try:
+            repriced = start_campaign(campaign, batch_size=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        if repriced is None:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Campaign {campaign.pk} scheduled for {campaign.starts_at:%Y-%m-%d %H:%M}",
+                ),
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Campaign {campaign.pk}: repriced {repriced} products",
+                ),
+            )
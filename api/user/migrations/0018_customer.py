@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0017_remove_orderitem_is_new_order_is_new"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Customer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("telegram_id", models.BigIntegerField(unique=True)),
+                ("phone", models.CharField(blank=True, default="", max_length=20)),
+                ("language", models.CharField(default="ru", max_length=2)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["phone"], name="customer_phone_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:35
+
+from django.db import migrations
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_cart_items(apps, schema_editor):
+    """Collapse duplicate (cart, product) rows into the oldest one, summing quantities."""
+    CartItem = apps.get_model("user", "CartItem")
+    duplicates = (
+        CartItem.objects.values("cart_id", "product_id")
+        .annotate(rows=Count("id"), keep_id=Min("id"), total=Sum("quantity"))
+        .filter(rows__gt=1)
+    )
+    for group in list(duplicates):
+        CartItem.objects.filter(id=group["keep_id"]).update(quantity=group["total"])
+        CartItem.objects.filter(
+            cart_id=group["cart_id"],
+            product_id=group["product_id"],
+        ).exclude(id=group["keep_id"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0019_order_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_cart_items, migrations.RunPython.noop),
+    ]
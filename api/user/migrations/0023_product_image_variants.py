@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0022_catalogversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="image_telegram",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                null=True,
+                upload_to="product_images/variants/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="image_thumbnail",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                null=True,
+                upload_to="product_images/variants/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="image_variants_source",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Файл image, из которого сделаны копии",
+                max_length=255,
+            ),
+        ),
+    ]
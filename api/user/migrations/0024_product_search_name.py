@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:50
+
+from django.db import migrations, models
+
+
+def fill_search_name(apps, schema_editor):
+    Product = apps.get_model("user", "Product")
+    products = list(Product.objects.only("id", "name"))
+    for product in products:
+        product.search_name = " ".join(product.name.casefold().replace("ё", "е").split())
+    Product.objects.bulk_update(products, ["search_name"], batch_size=500)
+
+
+def create_trigram_index(apps, schema_editor):
+    # Триграммный индекс есть только в PostgreSQL; на SQLite хватает B-tree по префиксу
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS product_search_name_trgm "
+        "ON user_product USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS product_search_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0023_product_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_name",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=100
+            ),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0025_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceCampaign",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("discount", "Скидка, %"),
+                            ("percent", "Изменение цены, %"),
+                            ("amount", "Изменение цены, сумма"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "value",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Скидка в процентах, либо на сколько % или сумм изменить цену (±)",
+                        max_digits=10,
+                    ),
+                ),
+                (
+                    "name_pattern",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Часть названия товара",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "product_ids",
+                    models.JSONField(blank=True, default=list, help_text="[1, 2, 3]"),
+                ),
+                ("starts_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("ends_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("scheduled", "Запланирована"),
+                            ("active", "Действует"),
+                            ("finished", "Завершена"),
+                        ],
+                        default="scheduled",
+                        editable=False,
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="user.category",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PriceCampaignItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("previous_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("previous_discount_percent", models.PositiveIntegerField()),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("discount_percent", models.PositiveIntegerField()),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="user.pricecampaign",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="user.product",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("campaign", "product"), name="unique_campaign_product"
+                    )
+                ],
+            },
+        ),
+    ]
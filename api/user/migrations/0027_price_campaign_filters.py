@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0026_price_campaigns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pricecampaign",
+            name="all_products",
+            field=models.BooleanField(
+                default=False, help_text="Разрешить кампанию без фильтра — для всего меню"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pricecampaign",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="user.category",
+            ),
+        ),
+    ]
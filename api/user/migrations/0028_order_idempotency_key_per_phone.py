@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0027_price_campaign_filters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="order",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="order",
+            constraint=models.UniqueConstraint(
+                fields=("phone", "idempotency_key"),
+                name="unique_order_phone_idempotency_key",
+            ),
+        ),
+    ]
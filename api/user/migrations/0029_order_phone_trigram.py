@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-17 14:10
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    # Поиск заказа по части телефона в админке; на SQLite индекса для LIKE '%…%' нет
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS order_phone_trgm "
+        "ON user_order USING gin (phone gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS order_phone_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0028_order_idempotency_key_per_phone"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
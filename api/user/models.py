@@ -1,15 +1,56 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.db.models import F
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+MONEY_STEP = Decimal("0.01")
+HUNDRED_PERCENT = 100
+
+
+def round_money(value: Decimal) -> Decimal:
+    # Явное округление: Postgres и SQLite округляют numeric по-разному
+    return value.quantize(MONEY_STEP, rounding=ROUND_HALF_UP)
+
+
+def apply_discount(price: Decimal, discount_percent: int) -> Decimal:
+    if discount_percent:
+        return price * (Decimal(1) - Decimal(discount_percent) / Decimal(100))
+    return price
+
+
+def normalize_search_text(text: str) -> str:
+    # Регистр, «ё» и лишние пробелы не должны мешать поиску
+    return " ".join(text.casefold().replace("ё", "е").split())
 
 
 class User(AbstractUser):
     pass
 
 
+class Customer(models.Model):
+    telegram_id = models.BigIntegerField(unique=True)
+    phone = models.CharField(max_length=20, blank=True, default="")
+    language = models.CharField(max_length=2, default="ru")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = (models.Index(fields=["phone"], name="customer_phone_idx"),)
+
+    def __str__(self) -> str:
+        return f"Customer {self.telegram_id} ({self.phone})"
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
 
@@ -30,13 +71,44 @@ class Product(models.Model):
         help_text="Скидка в процентах",
     )
     image = models.ImageField(upload_to="product_images/", blank=True, null=True)
+    # Уменьшенные копии `image`, их готовит задача tasks.images
+    image_telegram = models.ImageField(
+        upload_to="product_images/variants/",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    image_thumbnail = models.ImageField(
+        upload_to="product_images/variants/",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    image_variants_source = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Файл image, из которого сделаны копии",
+    )
+    # Нормализованное имя: на SQLite по нему идёт поиск по префиксу через индекс
+    search_name = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+    )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.search_name = normalize_search_text(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_name"}
+        super().save(*args, **kwargs)
 
     def discounted_price(self):
-        if self.discount_percent:
-            return self.price * (
-                Decimal(1) - Decimal(self.discount_percent) / Decimal(100)
-            )
-        return self.price
+        return apply_discount(self.price, self.discount_percent)
 
     def __str__(self) -> str:
         return self.name
@@ -46,29 +118,84 @@ class Cart(models.Model):
     phone = models.CharField(max_length=20, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def total_price(self):
+    def total_price(self, items: Iterable[CartItem] | None = None) -> Decimal:
+        """Sum of line totals, rounded to cents.
+
+        Pass already loaded `items` (with `product` selected) to reuse them
+        instead of querying the cart lines again.
+        """
+        if items is None:
+            items = self.items.select_related("product")
         total = Decimal(0)
-        for item in self.items.all():
-            price = (
-                item.final_price if item.final_price else item.product.discounted_price()
-            )
-            total += price * item.quantity
-        return total
+        for item in items:
+            total += item.total_price()
+        return round_money(total)
 
     def __str__(self) -> str:
         return f"Cart for {self.phone}"
 
 
 class CartItem(models.Model):
-    cart = models.ForeignKey(Cart, related_name="items", on_delete=models.CASCADE)
+    # Отдельный индекс по cart не нужен — unique_cart_product уже покрывает этот столбец
+    cart = models.ForeignKey(
+        Cart,
+        related_name="items",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
     final_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
 
-    def total_price(self):
-        return (
-            self.final_price if self.final_price else self.product.discounted_price()
-        ) * self.quantity
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["cart", "product"],
+                name="unique_cart_product",
+            ),
+        )
+
+    @classmethod
+    def add(cls, phone: str, product: Product, quantity: int) -> None:
+        """Add `quantity` of `product` to the cart of `phone` in one statement.
+
+        The increment happens in the database (`ON CONFLICT DO UPDATE`), so
+        concurrent adds never lose updates. The cart is created on first use.
+        """
+        final_price = round_money(product.discounted_price())
+        if not cls._upsert(phone, product.id, quantity, final_price):
+            Cart.objects.get_or_create(phone=phone)
+            cls._upsert(phone, product.id, quantity, final_price)
+
+    @classmethod
+    def _upsert(
+        cls,
+        phone: str,
+        product_id: int,
+        quantity: int,
+        final_price: Decimal,
+    ) -> bool:
+        item_table = connection.ops.quote_name(cls._meta.db_table)
+        cart_table = connection.ops.quote_name(Cart._meta.db_table)  # noqa: SLF001
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {item_table} (cart_id, product_id, quantity, final_price)
+                SELECT id, %s, %s, %s FROM {cart_table} WHERE phone = %s
+                ON CONFLICT (cart_id, product_id) DO UPDATE
+                SET quantity = {item_table}.quantity + excluded.quantity,
+                    final_price = excluded.final_price
+                """,  # noqa: S608
+                [product_id, quantity, final_price, phone],
+            )
+            # 0 строк — корзины ещё нет
+            return cursor.rowcount > 0
+
+    def unit_price(self) -> Decimal:
+        return self.final_price if self.final_price else self.product.discounted_price()
+
+    def total_price(self) -> Decimal:
+        return self.unit_price() * self.quantity
 
     def __str__(self) -> str:
         return f"{self.product.name} x {self.quantity}"
@@ -79,6 +206,32 @@ class Order(models.Model):
     total = models.DecimalField(max_digits=10, decimal_places=2)
     phone = models.CharField(max_length=20)
     is_new = models.BooleanField(default=True)
+    # Ключ из заголовка Idempotency-Key: повтор запроса вернёт этот же заказ.
+    # Пустой ключ хранится как NULL — иначе заказы без ключа нарушили бы уникальность
+    idempotency_key = models.CharField(  # noqa: DJ001
+        max_length=64,
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        constraints = (
+            # Ключ задаёт клиент, поэтому уникален он только в пределах телефона
+            models.UniqueConstraint(
+                fields=["phone", "idempotency_key"],
+                name="unique_order_phone_idempotency_key",
+            ),
+        )
+        indexes = (
+            # Лента новых заказов: только is_new=True, в порядке выдачи get_new_orders
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_new=True),
+                name="order_new_created_idx",
+            ),
+            # Заказы клиента по телефону, свежие первыми
+            models.Index(fields=["phone", "-created_at"], name="order_phone_created_idx"),
+        )
 
     def __str__(self) -> str:
         return f"Order #{self.id} от {self.phone} на сумму {self.total}"
@@ -92,3 +245,186 @@ class OrderItem(models.Model):
 
     def __str__(self) -> str:
         return f"{self.product.name} x {self.quantity}"
+
+
+class CatalogVersion(models.Model):
+    """Single row whose `version` grows on every Category/Product change."""
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"Catalog v{self.version}"
+
+    @classmethod
+    def current(cls) -> CatalogVersion:
+        version, _ = cls.objects.get_or_create(pk=1)
+        return version
+
+    @classmethod
+    def bump(cls) -> None:
+        updated = cls.objects.filter(pk=1).update(
+            version=F("version") + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            cls.objects.get_or_create(pk=1, defaults={"version": 1})
+
+
+class PriceCampaign(models.Model):
+    """Bulk price or discount change for a filtered set of products.
+
+    Applied at `starts_at`; if `ends_at` is set, the previous prices come back
+    at `ends_at` for the products whose price the campaign still owns.
+    """
+
+    class Kind(models.TextChoices):
+        DISCOUNT = "discount", "Скидка, %"
+        PERCENT = "percent", "Изменение цены, %"
+        AMOUNT = "amount", "Изменение цены, сумма"
+
+    class Status(models.TextChoices):
+        SCHEDULED = "scheduled", "Запланирована"
+        ACTIVE = "active", "Действует"
+        FINISHED = "finished", "Завершена"
+
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    value = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text="Скидка в процентах, либо на сколько % или сумм изменить цену (±)",
+    )
+    # Фильтр товаров: все условия вместе, пустые не учитываются
+    category = models.ForeignKey(
+        Category,
+        # Без категории фильтр расширился бы до всего меню — кампания удаляется следом
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    name_pattern = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text="Часть названия товара",
+    )
+    product_ids = models.JSONField(default=list, blank=True, help_text="[1, 2, 3]")
+    all_products = models.BooleanField(
+        default=False,
+        help_text="Разрешить кампанию без фильтра — для всего меню",
+    )
+    starts_at = models.DateTimeField(default=timezone.now)
+    ends_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.SCHEDULED,
+        editable=False,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def has_filter(self) -> bool:
+        return bool(self.category_id or self.name_pattern or self.product_ids)
+
+    def products(self) -> models.QuerySet[Product]:
+        if not (self.has_filter() or self.all_products):
+            return Product.objects.none()
+        products = Product.objects.all()
+        if self.category_id:
+            products = products.filter(category_id=self.category_id)
+        if self.name_pattern:
+            products = products.filter(
+                search_name__contains=normalize_search_text(self.name_pattern),
+            )
+        if self.product_ids:
+            products = products.filter(id__in=self.product_ids)
+        return products
+
+    def new_values(self, price: Decimal, discount_percent: int) -> tuple[Decimal, int]:
+        if self.kind == self.Kind.DISCOUNT:
+            return price, int(self.value)
+        if self.kind == self.Kind.PERCENT:
+            price = price * (HUNDRED_PERCENT + self.value) / HUNDRED_PERCENT
+        else:
+            price += self.value
+        return round_money(price), discount_percent
+
+    def overlapping_campaigns(self) -> models.QuerySet[PriceCampaign]:
+        """Active campaigns that hold prices of this campaign's products."""
+        return (
+            PriceCampaign.objects.filter(
+                status=self.Status.ACTIVE,
+                items__product__in=self.products(),
+            )
+            .exclude(pk=self.pk)
+            .distinct()
+        )
+
+    def clean(self) -> None:
+        if self.ends_at and self.ends_at <= self.starts_at:
+            raise ValidationError({"ends_at": "Окончание должно быть позже начала"})
+        if not isinstance(self.product_ids, list) or not all(
+            isinstance(i, int) for i in self.product_ids
+        ):
+            raise ValidationError({"product_ids": "Нужен список id товаров"})
+        if not (self.has_filter() or self.all_products):
+            msg = (
+                "Укажите категорию, часть названия или id товаров, "
+                "либо включите all_products"
+            )
+            raise ValidationError(msg)
+        # Завершение одной из пересекающихся кампаний вернуло бы чужие цены
+        overlapping = self.overlapping_campaigns().filter(
+            models.Q(ends_at__isnull=True) | models.Q(ends_at__gt=self.starts_at),
+        )
+        if overlapping.exists():
+            names = ", ".join(str(campaign) for campaign in overlapping[:3])
+            msg = f"Часть товаров уже в действующей кампании: {names}"
+            raise ValidationError(msg)
+        if self.value is None:
+            return
+        if self.kind == self.Kind.DISCOUNT and (
+            self.value != int(self.value) or not 0 <= self.value <= HUNDRED_PERCENT
+        ):
+            raise ValidationError({"value": "Скидка — целое число от 0 до 100"})
+        if self.kind == self.Kind.PERCENT and self.value <= -HUNDRED_PERCENT:
+            raise ValidationError({"value": "Цена не может уменьшиться на 100% и больше"})
+        if (
+            self.kind == self.Kind.AMOUNT
+            and self.value < 0
+            and self.products().filter(price__lte=-self.value).exists()
+        ):
+            raise ValidationError(
+                {"value": "У части товаров цена станет нулевой или меньше"},
+            )
+
+
+class PriceCampaignItem(models.Model):
+    """Price of a product before and after a campaign, to roll it back later."""
+
+    campaign = models.ForeignKey(
+        PriceCampaign,
+        on_delete=models.CASCADE,
+        related_name="items",
+    )
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    previous_price = models.DecimalField(max_digits=10, decimal_places=2)
+    previous_discount_percent = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    discount_percent = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["campaign", "product"],
+                name="unique_campaign_product",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.campaign}: {self.product_id}"
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import hmac
 from typing import TYPE_CHECKING, Any, cast
 
+from django.conf import settings
 from rest_framework import permissions
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
 
+BOT_TOKEN_HEADER = "X-Bot-Token"  # noqa: S105
+
 
 class IsStaffPermission(permissions.BasePermission):
     def has_permission(self, request: Request, view: Any) -> bool:  # noqa: ARG002
         return cast(bool, request.user.is_staff)
+
+
+class IsBotPermission(permissions.BasePermission):
+    """Requests from the Telegram bot, which sends the shared `BOT_API_TOKEN`."""
+
+    def has_permission(self, request: Request, view: Any) -> bool:  # noqa: ARG002
+        token = settings.BOT_API_TOKEN
+        supplied = request.headers.get(BOT_TOKEN_HEADER, "")
+        # Пустой токен в настройках не пускает никого
+        return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
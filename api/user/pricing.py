@@ -0,0 +1,208 @@
+"""Bulk repricing through price campaigns.
+
+A campaign changes the price or discount of every product it matches with
+batched `bulk_update` calls inside one transaction. `bulk_update` sends no
+signals, so the catalog version is bumped and the cached catalog payloads
+are dropped once per campaign rather than once per product.
+"""
+
+from __future__ import annotations
+
+import logging
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .catalog import invalidate_products
+from .models import CatalogVersion, PriceCampaign, PriceCampaignItem, Product
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from datetime import datetime
+
+    from django.db.models import QuerySet
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def _batches(
+    queryset: QuerySet[T],
+    batch_size: int,
+    key: str,
+    last_key: Callable[[T], Any],
+) -> Iterator[list[T]]:
+    """Yield `queryset` in `key` order, reading one batch per query.
+
+    The next batch starts after the last key of the previous one, so memory
+    holds a single batch and no cursor stays open on a table being updated.
+    """
+    queryset = queryset.order_by(key)
+    batch = list(queryset[:batch_size])
+    while batch:
+        yield batch
+        if len(batch) < batch_size:
+            return
+        batch = list(queryset.filter(**{f"{key}__gt": last_key(batch[-1])})[:batch_size])
+
+
+def _catalog_changed(category_ids: Iterable[int]) -> None:
+    category_ids = set(category_ids)
+    if not category_ids:
+        return
+    CatalogVersion.bump()
+    transaction.on_commit(lambda: invalidate_products(category_ids))
+
+
+def start_campaign(
+    campaign: PriceCampaign,
+    *,
+    batch_size: int = BATCH_SIZE,
+) -> int | None:
+    """Save a new campaign and apply it at once if it is already due.
+
+    Returns the number of repriced products, or None if the campaign waits
+    for its `starts_at`.
+    """
+    with transaction.atomic():
+        campaign.save()
+        if campaign.starts_at <= timezone.now():
+            return apply_campaign(campaign, batch_size=batch_size)
+    return None
+
+
+def apply_campaign(campaign: PriceCampaign, *, batch_size: int = BATCH_SIZE) -> int:
+    """Reprice the products of a scheduled campaign and remember their old prices."""
+    with transaction.atomic():
+        # Блокировка: планировщик и админка не применят кампанию дважды
+        campaign = PriceCampaign.objects.select_for_update().get(pk=campaign.pk)
+        if campaign.status != PriceCampaign.Status.SCHEDULED:
+            return 0
+        # Предыдущие цены товаров в чужой кампании не её — откат их бы перепутал
+        if overlapping := list(campaign.overlapping_campaigns()[:3]):
+            msg = f"Products are held by active campaigns: {overlapping}"
+            raise ValueError(msg)
+
+        products = campaign.products().only(
+            "id",
+            "category_id",
+            "price",
+            "discount_percent",
+        )
+        count = 0
+        category_ids = set()
+        for batch in _batches(products, batch_size, "id", attrgetter("id")):
+            items = []
+            for product in batch:
+                price, discount = campaign.new_values(
+                    product.price,
+                    product.discount_percent,
+                )
+                if price <= 0:
+                    msg = f"Price of product {product.id} would become {price}"
+                    raise ValueError(msg)
+                items.append(
+                    PriceCampaignItem(
+                        campaign=campaign,
+                        product_id=product.id,
+                        previous_price=product.price,
+                        previous_discount_percent=product.discount_percent,
+                        price=price,
+                        discount_percent=discount,
+                    ),
+                )
+                product.price, product.discount_percent = price, discount
+                category_ids.add(product.category_id)
+            Product.objects.bulk_update(batch, ["price", "discount_percent"])
+            PriceCampaignItem.objects.bulk_create(items)
+            count += len(batch)
+
+        campaign.status = PriceCampaign.Status.ACTIVE
+        campaign.save(update_fields=["status"])
+        _catalog_changed(category_ids)
+
+    logger.info("Price campaign %s applied to %s products", campaign.pk, count)
+    return count
+
+
+def finish_campaign(campaign: PriceCampaign, *, batch_size: int = BATCH_SIZE) -> int:
+    """Restore the previous prices of an active campaign.
+
+    Products whose price or discount was changed after the campaign started
+    keep the newer values.
+    """
+    with transaction.atomic():
+        campaign = PriceCampaign.objects.select_for_update().get(pk=campaign.pk)
+        if campaign.status != PriceCampaign.Status.ACTIVE:
+            return 0
+
+        # Цену, которую кампания уже не «держит», не трогаем
+        items = campaign.items.filter(
+            product__price=F("price"),
+            product__discount_percent=F("discount_percent"),
+        ).values_list(
+            "product_id",
+            "product__category_id",
+            "previous_price",
+            "previous_discount_percent",
+        )
+        count = 0
+        category_ids = set()
+        for batch in _batches(items, batch_size, "product_id", itemgetter(0)):
+            Product.objects.bulk_update(
+                [
+                    Product(id=product_id, price=price, discount_percent=discount)
+                    for product_id, _category_id, price, discount in batch
+                ],
+                ["price", "discount_percent"],
+            )
+            category_ids.update(category_id for _id, category_id, _p, _d in batch)
+            count += len(batch)
+
+        campaign.status = PriceCampaign.Status.FINISHED
+        campaign.save(update_fields=["status"])
+        _catalog_changed(category_ids)
+
+    logger.info("Price campaign %s finished, %s products restored", campaign.pk, count)
+    return count
+
+
+def run_due_campaigns(now: datetime | None = None) -> tuple[int, int]:
+    """Finish campaigns past `ends_at`, then apply those past `starts_at`.
+
+    Returns the number of (applied, finished) campaigns.
+    """
+    now = now or timezone.now()
+    # Кампания, чьё окно целиком прошло до запуска, уже не применяется
+    PriceCampaign.objects.filter(
+        status=PriceCampaign.Status.SCHEDULED,
+        ends_at__lte=now,
+    ).update(status=PriceCampaign.Status.FINISHED)
+
+    finished = 0
+    for campaign in PriceCampaign.objects.filter(
+        status=PriceCampaign.Status.ACTIVE,
+        ends_at__lte=now,
+    ).order_by("ends_at"):
+        finish_campaign(campaign)
+        finished += 1
+
+    applied = 0
+    for campaign in PriceCampaign.objects.filter(
+        status=PriceCampaign.Status.SCHEDULED,
+        starts_at__lte=now,
+    ).order_by("starts_at"):
+        try:
+            apply_campaign(campaign)
+        except ValueError:
+            # Остальные кампании применяются; эта попробует снова при следующем запуске
+            logger.exception("Cannot apply price campaign %s", campaign.pk)
+            continue
+        applied += 1
+    return applied, finished
@@ -0,0 +1,102 @@
+"""Fast JSON rendering for the read-heavy endpoints.
+
+Rows are built from `.values()` projections instead of model instances and
+serializers, and encoded with orjson. Values orjson does not encode itself
+(Decimal, and datetimes to keep DRF's format) go through DRF's encoder, so
+the bytes match what `JSONRenderer` produces for the same data.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin
+
+import orjson
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from django.core.files.storage import Storage
+    from django.db.models import QuerySet
+
+IMAGE_FIELDS = ("image", "image_telegram", "image_thumbnail")
+PRODUCT_FIELDS = ("id", "name", "price", "discount_percent", *IMAGE_FIELDS)
+
+_drf_encoder = JSONEncoder()
+
+
+def dumps(data: Any) -> bytes:
+    return orjson.dumps(
+        data,
+        default=_drf_encoder.default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+def format_decimal(value: Decimal) -> str:
+    # Как DecimalField в DRF: строка без экспоненты
+    return f"{value:f}"
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,  # noqa: ARG002
+        renderer_context: Mapping[str, Any] | None = None,  # noqa: ARG002
+    ) -> bytes:
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+FAST_RENDERERS = (ORJSONRenderer, BrowsableAPIRenderer)
+
+
+def _url_builder(storage: Storage, origin: str) -> Callable[[str], str]:
+    """`request.build_absolute_uri(storage.url(name))` without parsing URLs per row."""
+    if isinstance(storage, FileSystemStorage):
+        # Локальное хранилище строит URL как base_url + имя файла
+        prefix = urljoin(origin, storage.base_url)
+        return lambda name: prefix + filepath_to_uri(name).lstrip("/")
+    # S3 и прочие могут подписывать каждый URL — спрашиваем хранилище
+    return lambda name: urljoin(origin, storage.url(name))
+
+
+def product_rows(products: QuerySet, origin: str) -> list[dict[str, Any]]:
+    """Rows identical to `ProductSerializer(many=True).data` for a request from `origin`."""
+    from .models import Product
+
+    opts = Product._meta  # noqa: SLF001
+    url_builders = {
+        name: _url_builder(opts.get_field(name).storage, origin) for name in IMAGE_FIELDS
+    }
+    hundred = Decimal(100)
+
+    def file_url(field: str, name: str) -> str | None:
+        return url_builders[field](name) if name else None
+
+    rows = []
+    for row in products.values(*PRODUCT_FIELDS):
+        price = row["price"]
+        discount = row["discount_percent"]
+        # Формула из ProductSerializer.get_final_price; DRF отдаёт её как float
+        final_price = price * (hundred - discount) / hundred if discount > 0 else price
+        rows.append(
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "price": format_decimal(price),
+                "discount_percent": discount,
+                "final_price": float(final_price),
+                "image": file_url("image", row["image"]),
+                "image_telegram": file_url("image_telegram", row["image_telegram"]),
+                "image_thumbnail": file_url("image_thumbnail", row["image_thumbnail"]),
+            },
+        )
+    return rows
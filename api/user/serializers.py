@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from typing import TYPE_CHECKING, ClassVar
 
 from rest_framework import serializers
 
-from .models import CartItem, Product, User
+from .models import CartItem, Category, Customer, Product, User
+
+if TYPE_CHECKING:
+    from django.db.models.fields.files import FieldFile
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,13 +18,33 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {"password": {"write_only": True}}
 
 
+class CustomerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ("telegram_id", "phone", "language", "updated_at")
+        read_only_fields = ("updated_at",)
+        # Уникальность проверяет сам upsert
+        extra_kwargs: ClassVar = {"telegram_id": {"validators": []}}
+
+
 class ProductSerializer(serializers.ModelSerializer):
     final_price = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
+    image_telegram = serializers.SerializerMethodField()
+    image_thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
-        fields = ["id", "name", "price", "discount_percent", "final_price", "image"]
+        fields = (
+            "id",
+            "name",
+            "price",
+            "discount_percent",
+            "final_price",
+            "image",
+            "image_telegram",
+            "image_thumbnail",
+        )
 
     def get_final_price(self, obj):
         if obj.discount_percent > 0:
@@ -29,12 +53,34 @@ class ProductSerializer(serializers.ModelSerializer):
             )
         return obj.price
 
-    def get_image(self, obj):
+    def _file_url(self, file: FieldFile | None) -> str | None:
         request = self.context.get("request")
-        if obj.image and hasattr(obj.image, "url"):
-            return request.build_absolute_uri(obj.image.url) if request else obj.image.url
+        if file and hasattr(file, "url"):
+            return request.build_absolute_uri(file.url) if request else file.url
         return None
 
+    def get_image(self, obj: Product) -> str | None:
+        return self._file_url(obj.image)
+
+    def get_image_telegram(self, obj: Product) -> str | None:
+        return self._file_url(obj.image_telegram)
+
+    def get_image_thumbnail(self, obj: Product) -> str | None:
+        return self._file_url(obj.image_thumbnail)
+
+
+class ProductSearchSerializer(ProductSerializer):
+    class Meta(ProductSerializer.Meta):
+        fields = (*ProductSerializer.Meta.fields, "category")
+
+
+class CatalogCategorySerializer(serializers.ModelSerializer):
+    products = ProductSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ("id", "name", "products")
+
 
 class CartItemSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source="product.name")
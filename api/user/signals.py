@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_categories, invalidate_products
+from .models import CatalogVersion, Category, Product
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_category(
+    sender: type[Product],  # noqa: ARG001
+    instance: Product,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    # Товар могли перенести в другую категорию — сбросить нужно старую и новую
+    instance._previous_category_id = (  # noqa: SLF001
+        Product.objects.filter(pk=instance.pk)
+        .values_list("category_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product_cache(
+    sender: type[Product],  # noqa: ARG001
+    instance: Product,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    category_ids = {
+        instance.category_id,
+        getattr(instance, "_previous_category_id", None),
+    }
+    category_ids.discard(None)
+    CatalogVersion.bump()
+    transaction.on_commit(lambda: invalidate_products(category_ids))
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_cache(
+    sender: type[Category],  # noqa: ARG001
+    instance: Category,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    category_id = instance.pk  # после delete() Django обнулит pk
+    CatalogVersion.bump()
+
+    def invalidate() -> None:
+        invalidate_categories()
+        invalidate_products([category_id])
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Product)
+def schedule_image_variants(
+    sender: type[Product],  # noqa: ARG001
+    instance: Product,
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    if not instance.image:
+        if instance.image_telegram or instance.image_thumbnail:
+            Product.objects.filter(pk=instance.pk).update(
+                image_telegram=None,
+                image_thumbnail=None,
+                image_variants_source="",
+            )
+        return
+    if instance.image.name == instance.image_variants_source:
+        return
+
+    from tasks.images import generate_product_image_variants
+
+    product_id = instance.pk
+    transaction.on_commit(lambda: generate_product_image_variants.delay(product_id))
@@ -13,9 +13,19 @@ urlpatterns = [
         views.get_products_by_category,
         name="get_products_by_category",
     ),
+    path("catalog/", views.get_catalog, name="get_catalog"),
+    path("catalog/version/", views.get_catalog_version, name="get_catalog_version"),
+    path("products/search/", views.search_products, name="search_products"),
     path("cart/add/", views.add_to_cart, name="add_to_cart"),
     path("cart/<str:phone>/", views.get_cart, name="get_cart_by_phone"),
     path("order/", views.make_order, name="make_order"),
     path("order/new/", views.get_new_orders, name="new-orders"),
+    path("customers/", views.get_customers, name="get_customers"),
+    path("customers/bulk/", views.upsert_customers, name="upsert_customers"),
+    path(
+        "customers/<int:telegram_id>/",
+        views.get_customer,
+        name="get_customer",
+    ),
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]
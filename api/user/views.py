@@ -1,25 +1,164 @@
 from __future__ import annotations
 
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 
-from .models import Cart, CartItem, Category, Order, OrderItem, Product
-from .serializers import ProductSerializer
+from .catalog import (
+    CATALOG_VERSION_HEADER,
+    CATEGORIES_KEY,
+    CatalogPayload,
+    build_payload,
+    catalog_response,
+    get_or_build,
+    products_key,
+    remember_origin,
+    request_origin,
+    snapshot_key,
+)
+from .models import (
+    Cart,
+    CartItem,
+    CatalogVersion,
+    Category,
+    Customer,
+    Order,
+    OrderItem,
+    Product,
+    apply_discount,
+    normalize_search_text,
+    round_money,
+)
+from .permissions import IsBotPermission, IsStaffPermission
+from .rendering import FAST_RENDERERS, product_rows
+from .serializers import (
+    CatalogCategorySerializer,
+    CustomerSerializer,
+    ProductSearchSerializer,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.http import HttpResponse
+    from rest_framework.request import Request
+
+MAX_CUSTOMERS_PER_REQUEST = 500
+DEFAULT_ORDERS_PAGE_SIZE = 50
+MAX_ORDERS_PAGE_SIZE = 200
+IDEMPOTENCY_KEY_MAX_LENGTH = 64
+MIN_SEARCH_QUERY_LENGTH = 2
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
 
 
 @api_view(["GET"])
 def get_categories(request):
-    categories = Category.objects.all().values("id", "name")
-    return Response(categories)
+    payload = get_or_build(
+        CATEGORIES_KEY,
+        lambda: build_payload(lambda: list(Category.objects.all().values("id", "name"))),
+    )
+    return catalog_response(request, payload)
 
 
 @api_view(["GET"])
 def get_products_by_category(request, category_id):
-    category = get_object_or_404(Category, id=category_id)
-    products = category.products.all()
-    serializer = ProductSerializer(products, many=True, context={"request": request})
-    return Response(serializer.data)
+    origin = request_origin(request)
+
+    def build() -> CatalogPayload:
+        category = get_object_or_404(Category, id=category_id)
+        remember_origin(origin)
+        # Строки из .values() вместо ProductSerializer — тот же JSON без моделей
+        return build_payload(lambda: product_rows(category.products.all(), origin))
+
+    payload = get_or_build(products_key(category_id, origin), build)
+    return catalog_response(request, payload)
+
+
+@api_view(["GET"])
+def get_catalog(request: Request) -> HttpResponse:
+    """Whole catalog in one document: categories with their products and the version."""
+    origin = request_origin(request)
+
+    def build() -> CatalogPayload:
+        remember_origin(origin)
+        version = CatalogVersion.current()
+        # Три запроса при любом размере каталога: версия, категории, товары
+        categories = Category.objects.order_by("id").prefetch_related(
+            Prefetch("products", queryset=Product.objects.order_by("id")),
+        )
+        return build_payload(
+            lambda: {
+                "version": version.version,
+                "updated_at": version.updated_at,
+                "categories": CatalogCategorySerializer(
+                    categories,
+                    many=True,
+                    context={"request": request},
+                ).data,
+            },
+            version=version,
+        )
+
+    payload = get_or_build(snapshot_key(origin), build)
+    return catalog_response(request, payload)
+
+
+@api_view(["GET"])
+def get_catalog_version(_request: Request) -> Response:
+    """Return the catalog version so clients can tell whether their copy is stale."""
+    version = CatalogVersion.current()
+    response = Response({"version": version.version, "updated_at": version.updated_at})
+    response.headers[CATALOG_VERSION_HEADER] = str(version.version)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@api_view(["GET"])
+def search_products(request: Request) -> Response:
+    """Products matching `q`: trigram match on PostgreSQL, name prefix elsewhere."""
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return Response({"error": "limit должен быть числом"}, status=400)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    query = normalize_search_text(request.query_params.get("q", ""))
+    if len(query) < MIN_SEARCH_QUERY_LENGTH:
+        return Response([])
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        # LIKE '%q%' по search_name обслуживает GIN-индекс gin_trgm_ops
+        products = (
+            Product.objects.filter(search_name__contains=query)
+            .annotate(rank=TrigramWordSimilarity(query, "search_name"))
+            .order_by("-rank", "search_name")
+        )
+    else:
+        # Диапазон вместо LIKE: так SQLite идёт по B-tree индексу search_name
+        products = Product.objects.filter(
+            search_name__gte=query,
+            search_name__lt=f"{query}\U0010ffff",
+        ).order_by("search_name")
+
+    return Response(
+        ProductSearchSerializer(
+            products[:limit],
+            many=True,
+            context={"request": request},
+        ).data,
+    )
 
 
 @api_view(["POST"])
@@ -31,129 +170,299 @@ def add_to_cart(request):
     if not phone or not product_id:
         return Response({"error": "phone и product_id обязательны"}, status=400)
 
-    product = get_object_or_404(Product, id=product_id)
-    cart, _ = Cart.objects.get_or_create(phone=phone)
-
-    item, created = CartItem.objects.get_or_create(
-        cart=cart,
-        product=product,
-        defaults={"quantity": quantity},
+    product = get_object_or_404(
+        Product.objects.only("price", "discount_percent"),
+        id=product_id,
     )
-
-    if not created:
-        item.quantity += quantity
-
-    item.final_price = product.discounted_price()
-    item.save()
+    CartItem.add(phone, product, quantity)
 
     return Response(
         {
             "message": "Товар добавлен в корзину",
             "discount_percent": product.discount_percent,
-            "final_price": str(item.final_price),
+            "final_price": str(round_money(product.discounted_price())),
         },
     )
 
 
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
 def get_cart(request, phone):
-    cart = get_object_or_404(Cart, phone=phone)
+    cart = get_object_or_404(Cart.objects.only("id"), phone=phone)
 
-    items = cart.items.select_related("product")
+    items = cart.items.values(
+        "quantity",
+        "final_price",
+        "product__name",
+        "product__price",
+        "product__discount_percent",
+    )
     result = []
+    total = Decimal(0)
     for item in items:
+        price = item["product__price"]
+        discount = item["product__discount_percent"]
         result.append(
             {
-                "name": item.product.name,
-                "price": float(item.product.price),
-                "discount_percent": float(item.product.discount_percent),
-                "quantity": item.quantity,
-                "final_price": float(item.final_price),
+                "name": item["product__name"],
+                "price": float(price),
+                "discount_percent": float(discount),
+                "quantity": item["quantity"],
+                "final_price": float(item["final_price"]),
             },
         )
+        # Как CartItem.unit_price: сохранённая цена строки или цена товара минус скидка
+        total += (item["final_price"] or apply_discount(price, discount)) * item[
+            "quantity"
+        ]
 
     return Response(
         {
             "phone": phone,
             "items": result,
-            "total_price": cart.total_price(),
+            "total_price": round_money(total),
+        },
+    )
+
+
+def _order_response(
+    order: Order,
+    order_items: Iterable[OrderItem],
+    *,
+    replayed: bool = False,
+) -> Response:
+    items_data = [
+        {
+            "name": item.product.name,
+            "price": float(item.product.price),
+            "discount_percent": float(item.product.discount_percent),
+            "quantity": item.quantity,
+            "final_price": float(item.price),
+        }
+        for item in order_items
+    ]
+    return Response(
+        {
+            "message": "Заказ оформлен",
+            "order_id": order.id,
+            "total": order.total,
+            "items": items_data,  # 👈 возвращаем товары
+            # True — заказ создан раньше, это ответ на повтор того же Idempotency-Key
+            "replayed": replayed,
         },
     )
 
 
+def _find_order_by_key(phone: str, idempotency_key: str) -> Order | None:
+    return (
+        Order.objects.filter(phone=phone, idempotency_key=idempotency_key)
+        .prefetch_related(
+            Prefetch("items", queryset=OrderItem.objects.select_related("product")),
+        )
+        .first()
+    )
+
+
 @api_view(["POST"])
 def make_order(request):
+    """Place an order from the cart.
+
+    An `Idempotency-Key` header makes retries return the order created by the
+    first request with that key for the same phone instead of placing a new
+    one, with `"replayed": true` so that the client does not confirm the order
+    twice.
+    """
     phone = request.data.get("phone")
     if not phone:
         return Response({"error": "Требуется указать номер телефона"}, status=400)
 
-    cart = get_object_or_404(Cart, phone=phone)
-    if not cart.items.exists():
-        return Response({"error": "Корзина пуста"}, status=400)
+    idempotency_key = request.headers.get("Idempotency-Key") or None
+    if idempotency_key and len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return Response({"error": "Слишком длинный Idempotency-Key"}, status=400)
 
-    order = Order.objects.create(
-        total=cart.total_price(),
-        phone=phone,
-    )
+    if idempotency_key and (order := _find_order_by_key(phone, idempotency_key)):
+        return _order_response(order, order.items.all(), replayed=True)
 
-    items_data = []
-    for item in cart.items.select_related("product").all():
-        OrderItem.objects.create(
-            order=order,
-            product=item.product,
-            quantity=item.quantity,
-            price=(
-                item.final_price if item.final_price else item.product.discounted_price()
-            ),
+    try:
+        return _place_order(phone, idempotency_key)
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        # Параллельный запрос, несущий тот же ключ, успел создать заказ первым
+        if order := _find_order_by_key(phone, idempotency_key):
+            return _order_response(order, order.items.all(), replayed=True)
+        return Response(
+            {"error": "Заказ с этим Idempotency-Key уже создаётся"},
+            status=409,
         )
-        items_data.append(
-            {
-                "name": item.product.name,
-                "price": float(item.product.price),
-                "discount_percent": float(item.product.discount_percent),
-                "quantity": item.quantity,
-                "final_price": float(item.final_price),
-            },
+
+
+def _place_order(phone: str, idempotency_key: str | None) -> Response:
+    with transaction.atomic():
+        # Блокировка корзины: повторное нажатие ждёт первое и видит пустую корзину
+        cart = get_object_or_404(Cart.objects.select_for_update(), phone=phone)
+
+        if idempotency_key and (order := _find_order_by_key(phone, idempotency_key)):
+            return _order_response(order, order.items.all(), replayed=True)
+
+        # Один проход по позициям корзины: и для суммы, и для позиций заказа
+        items = list(cart.items.select_related("product"))
+        if not items:
+            return Response({"error": "Корзина пуста"}, status=400)
+
+        order = Order.objects.create(
+            total=cart.total_price(items),
+            phone=phone,
+            idempotency_key=idempotency_key,
+        )
+        order_items = OrderItem.objects.bulk_create(
+            OrderItem(
+                order=order,
+                product=item.product,
+                quantity=item.quantity,
+                price=round_money(item.unit_price()),
+            )
+            for item in items
         )
+        CartItem.objects.filter(cart=cart).delete()
 
-    cart.items.all().delete()
+    return _order_response(order, order_items)
 
-    return Response(
-        {
-            "message": "Заказ оформлен",
-            "order_id": order.id,
-            "total": order.total,
-            "items": items_data,  # 👈 возвращаем товары
-        },
-    )
+
+def _encode_cursor(created_at: datetime, order_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{order_id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at, order_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(created_at), int(order_id)
 
 
 @api_view(["GET"])
+@renderer_classes(FAST_RENDERERS)
 def get_new_orders(request):
-    new_orders = Order.objects.filter(is_new=True).order_by("-created_at")
+    """Return new orders, newest first.
 
-    result = []
-    for order in new_orders:
-        items = order.items.all()
-        items_data = []
+    Without `limit` and `cursor` the response is the plain list of every new
+    order, as before pagination existed. With either of them it is a page,
+    `{"results": [...], "next_cursor": ...}`, where the opaque `cursor` holds
+    (created_at, id) of the last row.
+    """
+    paginated = "limit" in request.query_params or "cursor" in request.query_params
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_ORDERS_PAGE_SIZE))
+    except ValueError:
+        return Response({"error": "limit должен быть числом"}, status=400)
+    limit = max(1, min(limit, MAX_ORDERS_PAGE_SIZE))
+
+    new_orders = Order.objects.filter(is_new=True).order_by("-created_at", "-id")
+
+    cursor = request.query_params.get("cursor")
+    if cursor:
+        try:
+            created_at, order_id = _decode_cursor(cursor)
+        except (ValueError, UnicodeDecodeError, binascii.Error):
+            return Response({"error": "Неверный cursor"}, status=400)
+        # Отдельное условие created_at <= … даёт планировщику диапазон по индексу
+        new_orders = new_orders.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=order_id),
+        )
+
+    orders = new_orders.values("id", "created_at", "phone", "total")
+    if paginated:
+        # Берём лишнюю запись, чтобы узнать, есть ли следующая страница
+        orders = list(orders[: limit + 1])
+        has_next = len(orders) > limit
+        orders = orders[:limit]
+    else:
+        orders = list(orders)
+
+    # Позиции всех заказов страницы — вторым запросом, как делал prefetch_related
+    items_by_order = defaultdict(list)
+    if orders:
+        items = (
+            OrderItem.objects.filter(order_id__in=[order["id"] for order in orders])
+            .order_by("id")
+            .values("order_id", "quantity", "price", "product__name")
+        )
         for item in items:
-            items_data.append(
+            items_by_order[item["order_id"]].append(
                 {
-                    "product": item.product.name,
-                    "quantity": item.quantity,
-                    "price": float(item.price),
-                    "subtotal": float(item.price * item.quantity),
+                    "product": item["product__name"],
+                    "quantity": item["quantity"],
+                    "price": float(item["price"]),
+                    "subtotal": float(item["price"] * item["quantity"]),
                 },
             )
 
-        result.append(
-            {
-                "order_id": order.id,
-                "created_at": order.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "phone": order.phone,
-                "total": float(order.total),
-                "items": items_data,
-            },
+    result = [
+        {
+            "order_id": order["id"],
+            "created_at": order["created_at"].strftime("%Y-%m-%d %H:%M:%S"),
+            "phone": order["phone"],
+            "total": float(order["total"]),
+            "items": items_by_order[order["id"]],
+        }
+        for order in orders
+    ]
+
+    if not paginated:
+        return Response(result)
+    next_cursor = None
+    if has_next:
+        next_cursor = _encode_cursor(orders[-1]["created_at"], orders[-1]["id"])
+    return Response({"results": result, "next_cursor": next_cursor})
+
+
+@api_view(["GET"])
+@permission_classes([IsBotPermission | IsStaffPermission])
+def get_customers(request: Request) -> Response:
+    raw_ids = request.query_params.get("ids", "")
+    try:
+        ids = {int(i) for i in raw_ids.split(",") if i.strip()}
+    except ValueError:
+        return Response({"error": "ids должны быть числами"}, status=400)
+
+    if not ids:
+        return Response({"error": "ids обязательны"}, status=400)
+    if len(ids) > MAX_CUSTOMERS_PER_REQUEST:
+        return Response(
+            {"error": f"Не больше {MAX_CUSTOMERS_PER_REQUEST} ids за запрос"},
+            status=400,
+        )
+
+    customers = Customer.objects.filter(telegram_id__in=ids)
+    return Response(CustomerSerializer(customers, many=True).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsBotPermission | IsStaffPermission])
+def get_customer(_request: Request, telegram_id: int) -> Response:
+    customer = get_object_or_404(Customer, telegram_id=telegram_id)
+    return Response(CustomerSerializer(customer).data)
+
+
+@api_view(["POST"])
+@permission_classes([IsBotPermission | IsStaffPermission])
+def upsert_customers(request: Request) -> Response:
+    payload = request.data if isinstance(request.data, list) else [request.data]
+    if len(payload) > MAX_CUSTOMERS_PER_REQUEST:
+        return Response(
+            {"error": f"Не больше {MAX_CUSTOMERS_PER_REQUEST} записей за запрос"},
+            status=400,
         )
 
-    return Response(result)
+    serializer = CustomerSerializer(data=payload, many=True)
+    serializer.is_valid(raise_exception=True)
+
+    # Последняя запись для одного telegram_id побеждает
+    customers = {row["telegram_id"]: Customer(**row) for row in serializer.validated_data}
+    Customer.objects.bulk_create(
+        customers.values(),
+        update_conflicts=True,
+        unique_fields=["telegram_id"],
+        update_fields=["phone", "language", "updated_at"],
+    )
+
+    return Response({"upserted": len(customers)})
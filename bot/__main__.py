@@ -6,14 +6,34 @@ import sys
 from datetime import datetime, time
 
 import httpx
+
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.types import BotCommand
-
-from bot.config.bot import RUNNING_MODE, TELEGRAM_API_TOKEN, RunningMode
+from aiohttp import web
+
+from bot.config.bot import (
+    COMPANY_URL,
+    RUNNING_MODE,
+    TELEGRAM_API_TOKEN,
+    WEBHOOK_HOST,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
+    RunningMode,
+)
 from bot.handlers import router
 
-from .bot_func import router_func
+from .api_client import COMPANY_TIMEOUT, close_api_client, get_api_client, open_api_client
+from .bot_func import receipt_renderer, router_func
+from .cards import card_editor
+from .catalog import catalog_cache
+from .fsm import create_fsm_storage
+from .notifications import admin_notifier
+from .search import router_search
+from .utils import profile_store
+from .webhook import create_webhook_app, derive_webhook_secret
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -30,7 +50,12 @@ logger = logging.getLogger(__name__)
 
 bot = Bot(TELEGRAM_API_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
 
-dispatcher = Dispatcher()
+# Апдейты одного пользователя обрабатываются по очереди, чтобы быстрые
+# нажатия «плюс»/«минус» не теряли изменения количества в FSM
+fsm_storage, events_isolation = create_fsm_storage()
+dispatcher = Dispatcher(storage=fsm_storage, events_isolation=events_isolation)
+# Выбор из inline-поиска должен сработать в любом состоянии FSM
+dispatcher.include_router(router_search)
 dispatcher.include_router(router)
 dispatcher.include_router(router_func)
 
@@ -50,46 +75,46 @@ async def monitor_bot_activity() -> None:
 
     while True:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get("http://127.0.0.1:8000/company/1/")
-                if response.status_code == 200:
-                    data = response.json()
-                    is_active = (
-                        data.get("subscription_expires_at") > datetime.now().isoformat()
-                    )
-
-                    work_start_str = data.get("work_start")
-                    work_end_str = data.get("work_end")
-
-                    now_time = datetime.now().time()
-
-                    # Преобразуем строки времени в объекты time
-                    if work_start_str and work_end_str:
-                        work_start = time.fromisoformat(work_start_str)
-                        work_end = time.fromisoformat(work_end_str)
-
-                        in_working_hours = work_start <= now_time <= work_end
-                    else:
-                        in_working_hours = (
-                            True  # если не указано — считаем всегда рабочим
-                        )
-
-                    if not (is_active and in_working_hours):
-                        if is_bot_active:
-                            logger.warning(
-                                "🚫 Бот отключён: подписка неактивна или вне рабочего времени.",
-                            )
-                            is_bot_active = False
-                            await asyncio.sleep(
-                                60,
-                            )  # 1 минута ожидания перед повторной проверкой
-                    elif not is_bot_active:
-                        logger.info("✅ Бот снова активен.")
-                        is_bot_active = True
+            response = await get_api_client().get(COMPANY_URL, timeout=COMPANY_TIMEOUT)
+            if response.status_code == httpx.codes.OK:
+                data = response.json()
+                is_active = (
+                    # Срок подписки компания хранит в местном времени, без пояса
+                    data.get("subscription_expires_at")
+                    > datetime.now().isoformat()  # noqa: DTZ005
+                )
+
+                work_start_str = data.get("work_start")
+                work_end_str = data.get("work_end")
+
+                now_time = datetime.now().time()  # noqa: DTZ005
+
+                # Преобразуем строки времени в объекты time
+                if work_start_str and work_end_str:
+                    work_start = time.fromisoformat(work_start_str)
+                    work_end = time.fromisoformat(work_end_str)
+
+                    in_working_hours = work_start <= now_time <= work_end
                 else:
-                    logger.warning(
-                        f"⚠️ Ошибка запроса к /company/1/: статус {response.status_code}",
-                    )
+                    in_working_hours = True  # если не указано — считаем всегда рабочим
+
+                if not (is_active and in_working_hours):
+                    if is_bot_active:
+                        logger.warning(
+                            "🚫 Бот отключён: подписка неактивна или вне рабочего времени.",
+                        )
+                        is_bot_active = False
+                        await asyncio.sleep(
+                            60,
+                        )  # 1 минута ожидания перед повторной проверкой
+                elif not is_bot_active:
+                    logger.info("✅ Бот снова активен.")
+                    is_bot_active = True
+            else:
+                logger.warning(
+                    "⚠️ Ошибка запроса к /company/1/: статус %s",
+                    response.status_code,
+                )
         except Exception as e:
             logger.exception(f"Ошибка при проверке активности: {e}")
 
@@ -125,12 +150,30 @@ dispatcher.callback_query.middleware(BotActiveMiddleware())
 
 @dispatcher.startup()
 async def on_startup() -> None:
+    await open_api_client()
+    # Шрифт, логотип и воркеры чеков готовим заранее, до первого заказа
+    await receipt_renderer.start()
     await set_bot_commands()
+    # Весь каталог одним запросом, чтобы первые пользователи не ждали API
+    await catalog_cache.warm_up()
     logger.info("✅ Бот запущен.")
     asyncio.create_task(monitor_bot_activity())
     # asyncio.create_task(notify_admins_new_orders(bot))
 
 
+@dispatcher.shutdown()
+async def on_shutdown() -> None:
+    # Дописываем отложенные изменения профилей перед выходом
+    await profile_store.aflush()
+    await catalog_cache.close()
+    await card_editor.close()
+    # Досылаем админам уже поставленные в очередь чеки
+    await admin_notifier.close()
+    receipt_renderer.close()
+    await close_api_client()
+    logger.info("🛑 Бот остановлен.")
+
+
 def run_polling() -> None:
     loop = asyncio.get_event_loop()
     loop.create_task(monitor_bot_activity())  # запускаем мониторинг до polling
@@ -138,8 +181,28 @@ def run_polling() -> None:
 
 
 def run_webhook() -> None:
-    msg = "Webhook mode is not implemented yet"
-    raise NotImplementedError(msg)
+    if not WEBHOOK_URL:
+        logger.error("`WEBHOOK_URL` is not set")
+        sys.exit(1)
+
+    secret_token = WEBHOOK_SECRET or derive_webhook_secret(TELEGRAM_API_TOKEN)
+
+    @dispatcher.startup()
+    async def set_webhook() -> None:
+        # Каждая реплика регистрирует один и тот же URL балансировщика — это идемпотентно
+        await bot.set_webhook(
+            f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+            secret_token=secret_token,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+        )
+
+    app = create_webhook_app(
+        dispatcher,
+        bot,
+        path=WEBHOOK_PATH,
+        secret_token=secret_token,
+    )
+    web.run_app(app, host=WEBHOOK_HOST, port=WEBHOOK_PORT)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import importlib.util
+import logging
+
+import httpx
+
+from .config.bot import (
+    API_HTTP2,
+    API_KEEPALIVE_EXPIRY,
+    API_MAX_CONNECTIONS,
+    API_MAX_KEEPALIVE_CONNECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Таймауты по типам запросов: каталог должен отвечать быстро,
+# оформление заказа может занять больше времени
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+CATALOG_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+CART_TIMEOUT = httpx.Timeout(5.0, connect=1.0)
+ORDER_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+COMPANY_TIMEOUT = httpx.Timeout(5.0, connect=1.0)
+MEDIA_TIMEOUT = httpx.Timeout(15.0, connect=2.0)
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    if not API_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("API_HTTP2 включён, но пакет `h2` не установлен — HTTP/1.1")
+        return False
+    return True
+
+
+def create_api_client(**kwargs: object) -> httpx.AsyncClient:
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    kwargs.setdefault(
+        "limits",
+        httpx.Limits(
+            max_connections=API_MAX_CONNECTIONS,
+            max_keepalive_connections=API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=API_KEEPALIVE_EXPIRY,
+        ),
+    )
+    kwargs.setdefault("http2", _http2_available())
+    return httpx.AsyncClient(**kwargs)  # type: ignore[arg-type]
+
+
+async def open_api_client(**kwargs: object) -> httpx.AsyncClient:
+    """Открыть общий клиент (вызывается в `on_startup`)."""
+    global _client  # noqa: PLW0603
+
+    if _client is None or _client.is_closed:
+        _client = create_api_client(**kwargs)
+    return _client
+
+
+async def close_api_client() -> None:
+    """Закрыть общий клиент и все keep-alive соединения (вызывается при остановке)."""
+    global _client  # noqa: PLW0603
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_api_client() -> httpx.AsyncClient:
+    """Общий клиент для всех запросов бота к API.
+
+    Если бот ещё не прошёл `on_startup` (скрипты, тесты), клиент создаётся лениво.
+    """
+    global _client  # noqa: PLW0603
+
+    if _client is None or _client.is_closed:
+        _client = create_api_client()
+    return _client
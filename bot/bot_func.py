@@ -1,19 +1,16 @@
 from __future__ import annotations
 
 import os
-import re
-import tempfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-import aiohttp
 import httpx
 from aiogram import F, Router
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import (
+    BufferedInputFile,
     CallbackQuery,
-    FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     KeyboardButton,
@@ -21,15 +18,34 @@ from aiogram.types import (
     ReplyKeyboardMarkup,
     ReplyKeyboardRemove,
 )
-from fpdf import FPDF
 
+from .api_client import (
+    CART_TIMEOUT,
+    COMPANY_TIMEOUT,
+    ORDER_TIMEOUT,
+    get_api_client,
+)
+from .cards import card_editor
+from .catalog import CatalogProduct, catalog_cache
+from .config.bot import (
+    API_URL,
+    COMPANY_URL,
+    PRODUCT_CARD_MODE,
+    RECEIPT_FONT_PATH,
+    RECEIPT_USE_PROCESSES,
+    RECEIPT_WORKERS,
+    ProductCardMode,
+)
+from .notifications import admin_notifier
+from .photos import answer_cached_photo, photo_cache
+from .receipts import Receipt, ReceiptRenderer, strip_emojis
 from .utils import get_phone, get_user_lang, get_user_phone, save_phone
 
 if TYPE_CHECKING:
+    from aiogram import Bot
     from aiogram.fsm.context import FSMContext
 
 router_func = Router()
-API_URL = "http://127.0.0.1:8001"
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
@@ -90,7 +106,7 @@ async def show_menu(message: Message, state: FSMContext = None) -> None:
 
     # 2. Если нет в FSM — пробуем из файла
     if not lang:
-        lang = get_language(user_id)
+        lang = await get_language(user_id)
 
     # 3. Выбираем текст по языку
     if lang == "uz":
@@ -113,80 +129,77 @@ async def handle_order(message: Message, state: FSMContext) -> None:
 
     # 1. Получение языка из FSM или файла
     data = await state.get_data()
-    lang = data.get("language") or get_language(user_id)
+    lang = data.get("language") or await get_language(user_id)
 
-    # 2. Получаем категории
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{API_URL}/categories/")
-        if response.status_code == 200:
-            categories = response.json()
-            if categories:
-                keyboard = ReplyKeyboardMarkup(
-                    keyboard=[[KeyboardButton(text=c["name"])] for c in categories]
-                    + [
-                        [
-                            KeyboardButton(
-                                text=(
-                                    "⬅ Назад"
-                                    if lang == "ru"
-                                    else "⬅ Orqaga" if lang == "uz" else "⬅ Back"
-                                ),
+    # 2. Получаем категории (из кэша, API — только если данные устарели)
+    categories = await catalog_cache.get_categories()
+    if categories is not None:
+        if categories:
+            keyboard = ReplyKeyboardMarkup(
+                keyboard=[[KeyboardButton(text=c.name)] for c in categories]
+                + [
+                    [
+                        KeyboardButton(
+                            text=(
+                                "⬅ Назад"
+                                if lang == "ru"
+                                else "⬅ Orqaga" if lang == "uz" else "⬅ Back"
                             ),
-                        ],
+                        ),
                     ],
-                    resize_keyboard=True,
-                )
-                await state.update_data(categories=categories)
-                await state.set_state(OrderState.choosing_category)
-
-                # Мультиязычное сообщение
-                if lang == "uz":
-                    text = "📚 Kategoriyani tanlang:"
-                elif lang == "en":
-                    text = "📚 Choose a category:"
-                else:
-                    text = "📚 Выберите категорию:"
-
-                await message.answer(text, reply_markup=keyboard)
+                ],
+                resize_keyboard=True,
+            )
+            await state.set_state(OrderState.choosing_category)
+
+            # Мультиязычное сообщение
+            if lang == "uz":
+                text = "📚 Kategoriyani tanlang:"
+            elif lang == "en":
+                text = "📚 Choose a category:"
             else:
-                await message.answer(
-                    (
-                        "❗ Mavjud kategoriyalar yo‘q."
-                        if lang == "uz"
-                        else (
-                            "❗ No categories available."
-                            if lang == "en"
-                            else "❗ Нет доступных категорий."
-                        )
-                    ),
-                )
+                text = "📚 Выберите категорию:"
+
+            await message.answer(text, reply_markup=keyboard)
         else:
             await message.answer(
                 (
-                    "⚠️ Kategoriyalarni yuklashda xatolik."
+                    "❗ Mavjud kategoriyalar yo‘q."
                     if lang == "uz"
                     else (
-                        "⚠️ Error loading categories."
+                        "❗ No categories available."
                         if lang == "en"
-                        else "⚠️ Ошибка при получении категорий."
+                        else "❗ Нет доступных категорий."
                     )
                 ),
             )
+    else:
+        await message.answer(
+            (
+                "⚠️ Kategoriyalarni yuklashda xatolik."
+                if lang == "uz"
+                else (
+                    "⚠️ Error loading categories."
+                    if lang == "en"
+                    else "⚠️ Ошибка при получении категорий."
+                )
+            ),
+        )
 
 
 @router_func.message(OrderState.choosing_category)
 async def choose_category(message: Message, state: FSMContext):
     user_id = message.from_user.id
     data = await state.get_data()
-    lang = data.get("language") or get_language(user_id)
+    lang = data.get("language") or await get_language(user_id)
 
     # Проверка на "Назад"
     if message.text in ["⬅ Назад", "⬅ Orqaga", "⬅ Back"]:
         await state.clear()
         return await show_menu(message)
 
-    categories = data.get("categories", [])
-    selected = next((c for c in categories if c["name"] == message.text), None)
+    categories = await catalog_cache.get_categories() or ()
+    selected = next((c for c in categories if c.name == message.text), None)
 
     if not selected:
         return await message.answer(
@@ -201,69 +214,73 @@ async def choose_category(message: Message, state: FSMContext):
             ),
         )
 
-    category_id = selected["id"]
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{API_URL}/products/{category_id}/")
-        if response.status_code == 200:
-            products = response.json()
-            if not products:
-                return await message.answer(
-                    (
-                        "📭 Bu kategoriyada mahsulotlar yo‘q."
-                        if lang == "uz"
-                        else (
-                            "📭 No products in this category."
-                            if lang == "en"
-                            else "📭 Нет продуктов в этой категории."
-                        )
-                    ),
-                )
+    products = await catalog_cache.get_products(selected.id)
+    if products is not None:
+        if not products:
+            return await message.answer(
+                (
+                    "📭 Bu kategoriyada mahsulotlar yo‘q."
+                    if lang == "uz"
+                    else (
+                        "📭 No products in this category."
+                        if lang == "en"
+                        else "📭 Нет продуктов в этой категории."
+                    )
+                ),
+            )
 
-            await state.update_data(products=products)
-            await state.set_state(OrderState.choosing_product)
+        await state.update_data(category_id=selected.id)
+        await state.set_state(OrderState.choosing_product)
 
-            back_text = (
-                "⬅ Orqaga" if lang == "uz" else "⬅ Back" if lang == "en" else "⬅ Назад"
-            )
-            keyboard = ReplyKeyboardMarkup(
-                keyboard=[[KeyboardButton(text=p["name"])] for p in products]
-                + [[KeyboardButton(text=back_text)]],
-                resize_keyboard=True,
-            )
+        back_text = (
+            "⬅ Orqaga" if lang == "uz" else "⬅ Back" if lang == "en" else "⬅ Назад"
+        )
+        keyboard = ReplyKeyboardMarkup(
+            keyboard=[[KeyboardButton(text=p.name)] for p in products]
+            + [[KeyboardButton(text=back_text)]],
+            resize_keyboard=True,
+        )
 
-            choose_text = (
-                "📦 Mahsulotni tanlang:"
-                if lang == "uz"
-                else "📦 Choose a product:" if lang == "en" else "📦 Выберите продукт:"
+        choose_text = (
+            "📦 Mahsulotni tanlang:"
+            if lang == "uz"
+            else "📦 Choose a product:" if lang == "en" else "📦 Выберите продукт:"
+        )
+
+        await message.answer(choose_text, reply_markup=keyboard)
+        return None
+    return await message.answer(
+        (
+            "❌ Mahsulotlarni olishda xatolik."
+            if lang == "uz"
+            else (
+                "❌ Failed to fetch products."
+                if lang == "en"
+                else "❌ Ошибка при получении продуктов."
             )
+        ),
+    )
 
-            await message.answer(choose_text, reply_markup=keyboard)
-            return None
-        return await message.answer(
-            (
-                "❌ Mahsulotlarni olishda xatolik."
-                if lang == "uz"
-                else (
-                    "❌ Failed to fetch products."
-                    if lang == "en"
-                    else "❌ Ошибка при получении продуктов."
-                )
-            ),
-        )
+
+async def get_selected_category_products(data: dict) -> tuple[CatalogProduct, ...]:
+    category_id = data.get("category_id")
+    if category_id is None:
+        return ()
+    return await catalog_cache.get_products(category_id) or ()
 
 
 @router_func.message(OrderState.choosing_product)
 async def choose_product(message: Message, state: FSMContext):
     user_id = message.from_user.id
     data = await state.get_data()
-    lang = data.get("language") or get_language(user_id)
+    lang = data.get("language") or await get_language(user_id)
 
     if message.text in ["⬅ Назад", "⬅ Orqaga", "⬅ Back"]:
         await state.set_state(OrderState.choosing_category)
         return await handle_order(message, state)
 
-    products = data.get("products", [])
-    selected = next((p for p in products if p["name"] == message.text), None)
+    products = await get_selected_category_products(data)
+    selected = next((p.as_dict() for p in products if p.name == message.text), None)
 
     if not selected:
         return await message.answer(
@@ -280,26 +297,17 @@ async def choose_product(message: Message, state: FSMContext):
 
     await state.update_data(selected_product=selected, quantity=1)
 
-    # Удалить клавиатуру и сообщение
-    temp = await message.answer("🔄", reply_markup=ReplyKeyboardRemove())
-    await temp.delete()
+    if PRODUCT_CARD_MODE == ProductCardMode.RESEND:
+        # Удалить клавиатуру и сообщение
+        temp = await message.answer("🔄", reply_markup=ReplyKeyboardRemove())
+        await temp.delete()
 
     # Показать карточку товара
     await send_product_preview(message, selected, quantity=1, state=state)
     return None
 
 
-async def send_product_preview(
-    message: Message,
-    product: dict,
-    quantity: int,
-    state: FSMContext,
-) -> None:
-    data = await state.get_data()
-    user_id = message.from_user.id
-    lang = data.get("language") or get_language(user_id)
-
-    image_url_or_path = product.get("image")
+def build_product_caption(product: dict, quantity: int, lang: str) -> str:
     discount = product.get("discount_percent", 0)
     price = float(product["price"])
 
@@ -344,35 +352,15 @@ async def send_product_preview(
             ),
         }.get(lang, "")
 
-    # Фото
-    try:
-        if image_url_or_path and image_url_or_path.startswith("http"):
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url_or_path) as resp:
-                    if resp.status == 200:
-                        with NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-                            tmp.write(await resp.read())
-                            photo_path = tmp.name
-                    else:
-                        photo_path = DEFAULT_IMAGE_PATH
-        else:
-            photo_path = (
-                os.path.normpath(os.path.join(MEDIA_ROOT, image_url_or_path))
-                if image_url_or_path
-                else DEFAULT_IMAGE_PATH
-            )
-            if not os.path.isfile(photo_path):
-                photo_path = DEFAULT_IMAGE_PATH
+    return caption
 
-        photo = FSInputFile(photo_path)
-    except Exception:
-        photo = FSInputFile(DEFAULT_IMAGE_PATH)
 
+def build_product_keyboard(quantity: int, lang: str) -> InlineKeyboardMarkup:
     # Кнопки по языкам
     add_text = {"ru": "🛒 Добавить", "uz": "🛒 Qo‘shish", "en": "🛒 Add"}[lang]
     back_text = {"ru": "⬅ Назад", "uz": "⬅ Orqaga", "en": "⬅ Back"}[lang]
 
-    keyboard = InlineKeyboardMarkup(
+    return InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(text="➖", callback_data="decrease"),
@@ -384,8 +372,40 @@ async def send_product_preview(
         ],
     )
 
-    await message.answer_photo(
-        photo=photo,
+
+async def send_product_preview(
+    message: Message,
+    product: dict,
+    quantity: int,
+    state: FSMContext,
+) -> None:
+    data = await state.get_data()
+    user_id = message.from_user.id
+    lang = data.get("language") or await get_language(user_id)
+
+    caption = build_product_caption(product, quantity, lang)
+    keyboard = build_product_keyboard(quantity, lang)
+
+    image_url_or_path = product.get("image")
+
+    # Фото: URL из API или путь внутри media/
+    if image_url_or_path and image_url_or_path.startswith("http"):
+        photo_source = image_url_or_path
+    else:
+        photo_source = (
+            os.path.normpath(Path(MEDIA_ROOT) / image_url_or_path)
+            if image_url_or_path
+            else DEFAULT_IMAGE_PATH
+        )
+        if not Path(photo_source).is_file():
+            photo_source = DEFAULT_IMAGE_PATH
+
+    # Повторные показы уходят по file_id, без скачивания и загрузки
+    await answer_cached_photo(
+        message,
+        photo_source,
+        photo_cache,
+        DEFAULT_IMAGE_PATH,
         caption=caption,
         reply_markup=keyboard,
         parse_mode="HTML",
@@ -402,8 +422,8 @@ async def go_back_handler(callback: CallbackQuery, state: FSMContext) -> None:
 
     user_id = callback.from_user.id
     data = await state.get_data()
-    products = data.get("products", [])
-    lang = data.get("language") or get_language(user_id)
+    products = await get_selected_category_products(data)
+    lang = data.get("language") or await get_language(user_id)
 
     # Переводы
     choose_text = {
@@ -425,7 +445,7 @@ async def go_back_handler(callback: CallbackQuery, state: FSMContext) -> None:
 
     if products:
         keyboard = ReplyKeyboardMarkup(
-            keyboard=[[KeyboardButton(text=p["name"])] for p in products]
+            keyboard=[[KeyboardButton(text=p.name)] for p in products]
             + [[KeyboardButton(text=back_button_text)]],
             resize_keyboard=True,
         )
@@ -439,7 +459,7 @@ async def handle_quantity_buttons(call: CallbackQuery, state: FSMContext):
     data = await state.get_data()
     product = data.get("selected_product")
     quantity = data.get("quantity", 1)
-    lang = data.get("language") or get_language(call.from_user.id)
+    lang = data.get("language") or await get_language(call.from_user.id)
 
     # Переводы
     phone_missing = {
@@ -465,15 +485,17 @@ async def handle_quantity_buttons(call: CallbackQuery, state: FSMContext):
     elif call.data == "decrease":
         quantity = max(1, quantity - 1)
     elif call.data == "addtocart":
+        # Отложенная правка «плюс»/«минус» иначе вернёт кнопки, снятые ниже
+        await card_editor.cancel(call.message)
         phone = await get_user_phone(call.message, state)
         if not phone:
             return await call.message.answer(phone_missing)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{API_URL}/cart/add/",
-                json={"phone": phone, "product_id": product["id"], "quantity": quantity},
-            )
+        response = await get_api_client().post(
+            f"{API_URL}/cart/add/",
+            json={"phone": phone, "product_id": product["id"], "quantity": quantity},
+            timeout=CART_TIMEOUT,
+        )
 
         if response.status_code == 200:
             await call.message.edit_reply_markup()
@@ -489,6 +511,19 @@ async def handle_quantity_buttons(call: CallbackQuery, state: FSMContext):
 
         return None
     await state.update_data(quantity=quantity)
+
+    if PRODUCT_CARD_MODE == ProductCardMode.EDIT:
+        # Одна правка карточки на серию быстрых нажатий
+        await call.answer()
+        if quantity != data.get("quantity", 1):
+            card_editor.schedule(
+                call.message,
+                caption=build_product_caption(product, quantity, lang),
+                reply_markup=build_product_keyboard(quantity, lang),
+                parse_mode="HTML",
+            )
+        return None
+
     await call.message.delete()
     await send_product_preview(call.message, product, quantity, state)
     await call.answer()
@@ -507,8 +542,10 @@ async def handle_cart(message: Message, state: FSMContext):
             }.get(await get_user_lang(state, message.from_user.id), "❗ Ошибка"),
         )
 
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        response = await client.get(f"{API_URL}/cart/{phone}/")
+    response = await get_api_client().get(
+        f"{API_URL}/cart/{phone}/",
+        timeout=CART_TIMEOUT,
+    )
 
     lang = await get_user_lang(state, message.from_user.id)
 
@@ -589,21 +626,22 @@ async def handle_cart(message: Message, state: FSMContext):
 ADMIN_CHAT_IDS = [7591006387]
 
 
-class PDF(FPDF):
-    def __init__(self) -> None:
-        super().__init__(format=(80, 300))  # 80 мм ширина, высота авто
-        font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-        self.add_font("DejaVu", "", font_path, uni=True)
-        self.set_font("DejaVu", "", 9)  # чуть меньше шрифт
-        self.set_auto_page_break(auto=True, margin=10)
-        self.add_page()
-
-    def line_text(self, text: str, h=5) -> None:
-        self.cell(0, h, text, ln=True, align="C")  # ВСЕГДА ПО ЦЕНТРУ
+receipt_renderer = ReceiptRenderer(
+    RECEIPT_FONT_PATH,
+    LOGO,
+    workers=RECEIPT_WORKERS,
+    use_processes=RECEIPT_USE_PROCESSES,
+)
 
 
-def strip_emojis(text: str) -> str:
-    return re.sub(r"[^\w\s.,:;!?()%/\-+№\"\'=А-Яа-яёЁ]", "", text)
+async def send_receipt_to_admins(bot: Bot, receipt: Receipt) -> None:
+    pdf_bytes = await receipt_renderer.render(receipt)
+    admin_notifier.send_document(
+        bot,
+        ADMIN_CHAT_IDS,
+        BufferedInputFile(pdf_bytes, filename=f"order_{receipt.order_id}.pdf"),
+        caption="📥 Новый заказ (PDF чек)",
+    )
 
 
 def split_message(text: str, max_length: int = 4000) -> list[str]:
@@ -636,42 +674,59 @@ async def process_order(call: CallbackQuery, state: FSMContext):
             }.get(lang, "❗ Ошибка"),
         )
 
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        order_response = await client.post(f"{API_URL}/order/", json={"phone": phone})
-        if order_response.status_code != 200:
-            try:
-                error = order_response.json().get(
-                    "error",
-                    {
-                        "ru": "Произошла ошибка.",
-                        "uz": "Xatolik yuz berdi.",
-                        "en": "An error occurred.",
-                    }[lang],
-                )
-            except Exception:
-                error = {
-                    "ru": "Не удалось создать заказ. Попробуйте позже.",
-                    "uz": "Buyurtma yaratilmadi. Keyinroq urinib ko‘ring.",
-                    "en": "Could not create order. Try again later.",
-                }[lang]
-            return await call.message.answer(f"❌ {error}")
-
-        order_data = order_response.json()
-        order_id = order_data["order_id"]
-        total = order_data["total"]
-        items = order_data.get("items", [])
-
-        company_response = await client.get("http://127.0.0.1:8000/company/1/")
-        if company_response.status_code == 200:
-            company = company_response.json()
-            company_name = company.get(
-                "name",
-                {"ru": "Компания", "uz": "Kompaniya", "en": "Company"}[lang],
+    client = get_api_client()
+    # Повторное нажатие или ретрай того же сообщения корзины не создаст второй заказ
+    order_response = await client.post(
+        f"{API_URL}/order/",
+        json={"phone": phone},
+        headers={"Idempotency-Key": f"{call.message.chat.id}:{call.message.message_id}"},
+        timeout=ORDER_TIMEOUT,
+    )
+    if order_response.status_code != httpx.codes.OK:
+        try:
+            error = order_response.json().get(
+                "error",
+                {
+                    "ru": "Произошла ошибка.",
+                    "uz": "Xatolik yuz berdi.",
+                    "en": "An error occurred.",
+                }[lang],
             )
-            company_phone = company.get("phone", "N/A")
-        else:
-            company_name = {"ru": "Компания", "uz": "Kompaniya", "en": "Company"}[lang]
-            company_phone = "N/A"
+        except (ValueError, AttributeError):
+            # Ответ без JSON-объекта внутри
+            error = {
+                "ru": "Не удалось создать заказ. Попробуйте позже.",
+                "uz": "Buyurtma yaratilmadi. Keyinroq urinib ko‘ring.",
+                "en": "Could not create order. Try again later.",
+            }[lang]
+        return await call.message.answer(f"❌ {error}")
+
+    # Заказ принят — снимаем кнопку сразу, пока не нажали ещё раз
+    if call.message.reply_markup:
+        await call.message.edit_reply_markup(reply_markup=None)
+
+    order_data = order_response.json()
+    if order_data.get("replayed"):
+        # Повтор уже оформленного заказа: чек клиенту и админам ушёл в первый раз
+        await call.answer()
+        return None
+    order_id = order_data["order_id"]
+    total = order_data["total"]
+    items = order_data.get("items", [])
+
+    # Время на чеке — местное, без часового пояса
+    created_at = datetime.now().strftime("%d.%m.%Y %H:%M")  # noqa: DTZ005
+    company_response = await client.get(COMPANY_URL, timeout=COMPANY_TIMEOUT)
+    if company_response.status_code == httpx.codes.OK:
+        company = company_response.json()
+        company_name = company.get(
+            "name",
+            {"ru": "Компания", "uz": "Kompaniya", "en": "Company"}[lang],
+        )
+        company_phone = company.get("phone", "N/A")
+    else:
+        company_name = {"ru": "Компания", "uz": "Kompaniya", "en": "Company"}[lang]
+        company_phone = "N/A"
 
     # Чек — текст
 
@@ -688,7 +743,7 @@ async def process_order(call: CallbackQuery, state: FSMContext):
             "uz": f"📦 Buyurtma raqami: {order_id}",
             "en": f"📦 Order ID: {order_id}",
         }[lang],
-        f"🕓 {datetime.now().strftime('%d.%m.%Y %H:%M')}",
+        f"🕓 {created_at}",
         "-" * 30,
         {"ru": "🛍 Товары:", "uz": "🛍 Mahsulotlar:", "en": "🛍 Products:"}[lang],
     ]
@@ -724,10 +779,6 @@ async def process_order(call: CallbackQuery, state: FSMContext):
         }[lang],
     )
 
-    # Удалить клавиатуру, если она есть
-    if call.message.reply_markup:
-        await call.message.edit_reply_markup(reply_markup=None)
-
     # Отправка чека
     for part in split_message("\n".join(lines)):
         await call.message.answer(part)
@@ -742,58 +793,22 @@ async def process_order(call: CallbackQuery, state: FSMContext):
         reply_markup=get_main_keyboard_multilang(lang),
     )
 
-    # Генерация PDF чека
-    pdf = PDF()
-    logo = LOGO
-    pdf.image(logo, x=(80 - 40) / 2, w=40)
-    pdf.ln(3)
-    pdf.line_text("КАССОВЫЙ ЧЕК / CHIQARILGAN CHEK / RECEIPT", 6)
-    pdf.line_text("-" * 66)
-    pdf.line_text(strip_emojis(company_name))
-    pdf.line_text(f"Тел.: +998 {company_phone}")
-    pdf.line_text(f"Клиент: {order_data.get('phone', phone)}")
-    pdf.line_text(f"№: {order_id}")
-    pdf.line_text(datetime.now().strftime("%d.%m.%Y %H:%M"))
-    pdf.line_text("-" * 66)
-    pdf.line_text("Товары / Mahsulotlar / Products:")
-
-    for item in items:
-        name = strip_emojis(item["name"])[:25]
-        quantity = item["quantity"]
-        price = float(item["price"])
-        discount = float(item.get("discount_percent", 0))
-        if discount > 0:
-            new_price = price * (1 - discount / 100)
-            subtotal = quantity * new_price
-            pdf.line_text(f"{name} x{quantity} = {subtotal:.2f}")
-            pdf.line_text(f"Скидка {discount}%: {price:.2f} → {new_price:.2f}")
-        else:
-            subtotal = quantity * price
-            pdf.line_text(f"{name} x{quantity} = {subtotal:.2f}")
-
-    pdf.line_text("-" * 66)
-    pdf.line_text(f"ИТОГО: {total:.2f} сум")
-    pdf.line_text("СПАСИБО ЗА ВНИМАНИЕ")
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        pdf_path = tmp_file.name
-        pdf.output(pdf_path)
-
-    pdf_filename = f"order_{order_id}.pdf"
-    pdf_path = os.path.join(tempfile.gettempdir(), pdf_filename)
-    pdf.output(pdf_path)
-
-    for admin_id in ADMIN_CHAT_IDS:
-        try:
-            await call.bot.send_document(
-                admin_id,
-                FSInputFile(pdf_path),
-                caption="📥 Новый заказ (PDF чек)",
-            )
-        except Exception as e:
-            print(f"Ошибка отправки PDF админу {admin_id}: {e}")
+    # PDF чек админам — в фоне, клиент не ждёт рендера и доставки
+    admin_notifier.run_in_background(
+        send_receipt_to_admins(
+            call.bot,
+            Receipt(
+                order_id=order_id,
+                company_name=company_name,
+                company_phone=company_phone,
+                client_phone=order_data.get("phone", phone),
+                created_at=created_at,
+                total=total,
+                items=items,
+            ),
+        ),
+    )
 
-    os.remove(pdf_path)
     await restore_basic_context(state, lang, phone)
     return None
 
@@ -803,8 +818,7 @@ async def handle_contacts(message: Message, state: FSMContext) -> None:
     lang = await get_user_lang(state, message.from_user.id)
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get("http://127.0.0.1:8000/company/1/")
+        response = await get_api_client().get(COMPANY_URL, timeout=COMPANY_TIMEOUT)
 
         if response.status_code == 200:
             company = response.json()
@@ -942,9 +956,9 @@ async def change_language_handler(call: CallbackQuery, state: FSMContext) -> Non
 async def set_language_handler(call: CallbackQuery, state: FSMContext) -> None:
     lang_code = call.data.split("_")[1]
     user_id = call.from_user.id
-    phone = get_phone(user_id) or ""
+    phone = await get_phone(user_id) or ""
 
-    save_phone(user_id, phone, lang_code)
+    await save_phone(user_id, phone, lang_code)
     await state.update_data(language=lang_code)
 
     confirmation = {
@@ -988,7 +1002,7 @@ async def process_contact(msg: Message, state: FSMContext) -> None:
     phone = contact.phone_number
 
     lang = await get_user_lang(state, user_id)
-    save_phone(user_id, phone, lang)
+    await save_phone(user_id, phone, lang)
     await state.update_data(phone=phone)
 
     confirmation = {
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from .config.bot import CARD_EDIT_DEBOUNCE
+
+if TYPE_CHECKING:
+    from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+
+class CardEditor:
+    """Правит подпись и кнопки карточки товара на месте, склеивая быстрые нажатия.
+
+    Каждое нажатие «плюс»/«минус» только запоминает новое состояние карточки. Через
+    `delay` секунд после первого нажатия уходит один `editMessageCaption`
+    для последнего состояния; нажатия во время правки попадут в следующую.
+    """
+
+    def __init__(self, delay: float = 0.3) -> None:
+        self.delay = delay
+        self._pending: dict[tuple[int, int], dict[str, Any]] = {}
+        self._tasks: dict[tuple[int, int], asyncio.Task] = {}
+
+    def schedule(self, message: Message, **edit_kwargs: Any) -> None:
+        key = (message.chat.id, message.message_id)
+        self._pending[key] = edit_kwargs
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key, message))
+
+    async def _run(self, key: tuple[int, int], message: Message) -> None:
+        last_sent: dict[str, Any] | None = None
+        try:
+            while True:
+                await asyncio.sleep(self.delay)
+                edit_kwargs = self._pending.pop(key, None)
+                if edit_kwargs is None:
+                    return
+                if edit_kwargs == last_sent:
+                    continue
+                try:
+                    await message.edit_caption(**edit_kwargs)
+                except TelegramRetryAfter as e:
+                    # Вернём правку в очередь, если за это время не пришла новее
+                    self._pending.setdefault(key, edit_kwargs)
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                except TelegramBadRequest as e:
+                    if "message is not modified" not in str(e):
+                        logger.warning("[CARD] Не удалось обновить карточку: %s", e)
+                last_sent = edit_kwargs
+        finally:
+            # После cancel() под этим ключом может быть уже новая задача
+            if self._tasks.get(key) is asyncio.current_task():
+                self._tasks.pop(key)
+
+    async def cancel(self, message: Message) -> None:
+        """Отменить отложенную правку карточки, например перед снятием кнопок."""
+        key = (message.chat.id, message.message_id)
+        self._pending.pop(key, None)
+        # Задача могла ещё не стартовать — тогда её finally не выполнится
+        task = self._tasks.pop(key, None)
+        if task:
+            task.cancel()
+            # Дожидаемся: начатая правка не должна прийти после нашей
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def close(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._pending.clear()
+
+
+card_editor = CardEditor(CARD_EDIT_DEBOUNCE)
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from .api_client import CATALOG_TIMEOUT, get_api_client
+from .config.bot import (
+    API_URL,
+    CATALOG_STALE_TTL,
+    CATALOG_TTL,
+    CATALOG_VERSION_INTERVAL,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+MIN_SEARCH_QUERY_LENGTH = 2
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogCategory:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogProduct:
+    id: int
+    name: str
+    price: str
+    discount_percent: int
+    final_price: Any
+    image: str | None
+    category_id: int | None = None
+
+    @classmethod
+    def from_api(cls, row: dict) -> CatalogProduct:
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            price=row["price"],
+            discount_percent=row.get("discount_percent", 0),
+            final_price=row.get("final_price"),
+            # Уменьшенная копия для Telegram, пока её нет — оригинал
+            image=row.get("image_telegram") or row.get("image"),
+            category_id=row.get("category"),
+        )
+
+    def as_dict(self) -> dict:
+        # Формат, который ждут send_product_preview и FSM
+        return {
+            "id": self.id,
+            "name": self.name,
+            "price": self.price,
+            "discount_percent": self.discount_percent,
+            "final_price": self.final_price,
+            "image": self.image,
+        }
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: tuple
+    fetched_at: float
+    etag: str | None = None
+
+
+class CatalogCache:
+    """Категории и товары в памяти бота (stale-while-revalidate).
+
+    Свежие данные (моложе `ttl`) отдаются сразу. Устаревшие (моложе `stale_ttl`)
+    тоже отдаются сразу, и обновление уходит в фон. Обновление передаёт
+    `If-None-Match`: если каталог не менялся, API отвечает 304 без тела.
+    Если API сообщает новую версию каталога в заголовке `X-Catalog-Version`,
+    весь кэш сбрасывается. Перед выдачей свежей записи версия проверяется
+    через `/catalog/version/` не чаще раза в `version_interval` секунд, чтобы
+    новые цены и скидки доходили до пользователей раньше, чем истечёт `ttl`.
+
+    Результаты поиска хранятся отдельно: по нормализованному запросу,
+    не дольше `search_ttl` и не больше `search_size` запросов (LRU).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str,
+        ttl: float = 300.0,
+        stale_ttl: float = 86400.0,
+        search_ttl: float = 60.0,
+        search_size: int = 1000,
+        version_interval: float | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.search_ttl = search_ttl
+        self.search_size = search_size
+        # None — версию отдельно не проверяем, только по заголовкам ответов
+        self.version_interval = version_interval
+        self.version: str | None = None
+        self._entries: dict[str, _Entry] = {}
+        self._searches: OrderedDict[str, _Entry] = OrderedDict()
+        self._pending: dict[str, asyncio.Task] = {}
+        self._version_checked_at = time.monotonic()
+
+    async def get_categories(self) -> tuple[CatalogCategory, ...] | None:
+        return await self._get("categories", "/categories/")
+
+    async def get_products(self, category_id: int) -> tuple[CatalogProduct, ...] | None:
+        return await self._get(f"products:{category_id}", f"/products/{category_id}/")
+
+    async def warm_up(self) -> bool:
+        """Заполнить весь кэш одним запросом к `/catalog/`."""
+        try:
+            response = await get_api_client().get(
+                f"{self.base_url}/catalog/",
+                timeout=CATALOG_TIMEOUT,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.warning("[CATALOG] Не удалось загрузить снимок каталога")
+            return False
+
+        snapshot = response.json()
+        self._observe_version(str(snapshot["version"]))
+        fetched_at = time.monotonic()
+        self._entries["categories"] = _Entry(
+            value=tuple(
+                CatalogCategory(id=c["id"], name=c["name"])
+                for c in snapshot["categories"]
+            ),
+            fetched_at=fetched_at,
+        )
+        for category in snapshot["categories"]:
+            self._entries[f"products:{category['id']}"] = _Entry(
+                value=tuple(CatalogProduct.from_api(r) for r in category["products"]),
+                fetched_at=fetched_at,
+            )
+        return True
+
+    async def search_products(self, query: str) -> tuple[CatalogProduct, ...]:
+        key = " ".join(query.casefold().replace("ё", "е").split())
+        if len(key) < MIN_SEARCH_QUERY_LENGTH:
+            return ()
+
+        if key in self._searches:
+            await self._probe_version()
+        entry = self._searches.get(key)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.search_ttl:
+            self._searches.move_to_end(key)
+            return entry.value
+
+        try:
+            response = await get_api_client().get(
+                f"{self.base_url}/products/search/",
+                params={"q": key},
+                timeout=CATALOG_TIMEOUT,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.warning("[CATALOG] Поиск «%s» не удался", key)
+            return entry.value if entry is not None else ()
+
+        value = tuple(CatalogProduct.from_api(r) for r in response.json())
+        self._searches[key] = _Entry(value=value, fetched_at=time.monotonic())
+        self._searches.move_to_end(key)
+        while len(self._searches) > self.search_size:
+            self._searches.popitem(last=False)
+        return value
+
+    def find_product(self, product_id: int) -> CatalogProduct | None:
+        # Сначала недавние результаты поиска, затем загруженные категории
+        entries = [
+            *reversed(self._searches.values()),
+            *(
+                entry
+                for key, entry in self._entries.items()
+                if key.startswith("products:")
+            ),
+        ]
+        for entry in entries:
+            for product in entry.value:
+                if product.id == product_id:
+                    return product
+        return None
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self._searches.clear()
+
+    async def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        await asyncio.gather(*self._pending.values(), return_exceptions=True)
+        self._pending.clear()
+
+    async def _get(self, key: str, path: str) -> tuple | None:
+        if key in self._entries:
+            # Новая версия сбросит кэш, и запись ниже загрузится заново
+            await self._probe_version()
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry.fetched_at if entry else None
+
+        if entry is not None and age < self.ttl:
+            return entry.value
+
+        if entry is not None and age < self.stale_ttl:
+            self._refresh(key, path)
+            return entry.value
+
+        try:
+            return await asyncio.shield(self._refresh(key, path))
+        except httpx.HTTPError:
+            logger.warning("[CATALOG] Не удалось загрузить %s", path)
+            return None
+
+    def _refresh(self, key: str, path: str) -> asyncio.Task:
+        # Одновременные промахи по одному ключу ждут один и тот же запрос
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, path))
+            self._pending[key] = task
+            task.add_done_callback(lambda t: self._on_refreshed(key, t))
+        return task
+
+    def _on_refreshed(self, key: str, task: asyncio.Task) -> None:
+        self._pending.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("[CATALOG] Фоновое обновление %s не удалось", key)
+
+    async def _fetch(self, key: str, path: str) -> tuple:
+        if key == "version":
+            # Отметка до запроса: недоступный API не опрашиваем на каждом нажатии
+            self._version_checked_at = time.monotonic()
+            response = await get_api_client().get(
+                f"{self.base_url}{path}",
+                timeout=CATALOG_TIMEOUT,
+            )
+            response.raise_for_status()
+            self._observe_version(response.headers.get(CATALOG_VERSION_HEADER))
+            return ()
+
+        cached = self._entries.get(key)
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        response = await get_api_client().get(
+            f"{self.base_url}{path}",
+            headers=headers,
+            timeout=CATALOG_TIMEOUT,
+        )
+        self._observe_version(response.headers.get(CATALOG_VERSION_HEADER))
+
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+            cached.fetched_at = time.monotonic()
+            # Очистка по новой версии не должна выкинуть подтверждённую запись
+            self._entries[key] = cached
+            return cached.value
+
+        response.raise_for_status()
+        rows = response.json()
+        if key == "categories":
+            value: tuple = tuple(
+                CatalogCategory(id=r["id"], name=r["name"]) for r in rows
+            )
+        else:
+            value = tuple(CatalogProduct.from_api(r) for r in rows)
+
+        self._entries[key] = _Entry(
+            value=value,
+            fetched_at=time.monotonic(),
+            etag=response.headers.get("ETag"),
+        )
+        return value
+
+    async def _probe_version(self) -> None:
+        if (
+            self.version_interval is None
+            or time.monotonic() - self._version_checked_at < self.version_interval
+        ):
+            return
+        try:
+            # Одна проверка на всех, кто пришёл за данными одновременно
+            await asyncio.shield(self._refresh("version", "/catalog/version/"))
+        except httpx.HTTPError:
+            logger.warning("[CATALOG] Не удалось проверить версию каталога")
+
+    def _observe_version(self, version: str | None) -> None:
+        if version is None or version == self.version:
+            return
+        if self.version is not None:
+            logger.info("[CATALOG] Новая версия каталога %s, сбрасываем кэш", version)
+            self.invalidate()
+        self.version = version
+
+
+catalog_cache = CatalogCache(
+    API_URL,
+    ttl=CATALOG_TTL,
+    stale_ttl=CATALOG_STALE_TTL,
+    search_ttl=SEARCH_CACHE_TTL,
+    search_size=SEARCH_CACHE_SIZE,
+    version_interval=CATALOG_VERSION_INTERVAL,
+)
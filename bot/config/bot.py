@@ -6,6 +6,7 @@ from enum import Enum
 from os import getenv
 
 from dotenv import load_dotenv  # <- добавь это
+
 load_dotenv()  # <- и это
 
 logger = logging.getLogger(__name__)
@@ -23,3 +24,71 @@ if not TELEGRAM_API_TOKEN:
 
 RUNNING_MODE = RunningMode(getenv("RUNNING_MODE", default="LONG_POLLING"))
 WEBHOOK_URL = getenv("WEBHOOK_URL", default="")
+WEBHOOK_PATH = getenv("WEBHOOK_PATH", default="/webhook")
+WEBHOOK_SECRET = getenv("WEBHOOK_SECRET", default="")
+WEBHOOK_HOST = getenv("WEBHOOK_HOST", default="0.0.0.0")  # noqa: S104
+WEBHOOK_PORT = int(getenv("WEBHOOK_PORT", default="8080"))
+
+API_URL = getenv("API_URL", default="http://127.0.0.1:8001")
+# Значение BOT_API_TOKEN API-сервера: без него /customers/ отвечает 403
+BOT_API_TOKEN = getenv("BOT_API_TOKEN", default="")
+
+
+class ProfileBackend(str, Enum):
+    FILE = "FILE"
+    API = "API"
+
+
+PROFILE_BACKEND = ProfileBackend(getenv("PROFILE_BACKEND", default="FILE"))
+PROFILE_CACHE_TTL = float(getenv("PROFILE_CACHE_TTL", default="300"))
+if PROFILE_BACKEND == ProfileBackend.API and not BOT_API_TOKEN:
+    logger.warning("`BOT_API_TOKEN` is not set, /customers/ will answer 403")
+
+COMPANY_URL = getenv("COMPANY_URL", default="http://127.0.0.1:8000/company/1/")
+
+API_HTTP2 = getenv("API_HTTP2", default="false").lower() == "true"
+API_MAX_CONNECTIONS = int(getenv("API_MAX_CONNECTIONS", default="100"))
+API_MAX_KEEPALIVE_CONNECTIONS = int(getenv("API_MAX_KEEPALIVE_CONNECTIONS", default="20"))
+API_KEEPALIVE_EXPIRY = float(getenv("API_KEEPALIVE_EXPIRY", default="30"))
+
+CATALOG_TTL = float(getenv("CATALOG_TTL", default="300"))
+CATALOG_STALE_TTL = float(getenv("CATALOG_STALE_TTL", default="86400"))
+CATALOG_VERSION_INTERVAL = float(getenv("CATALOG_VERSION_INTERVAL", default="10"))
+SEARCH_CACHE_TTL = float(getenv("SEARCH_CACHE_TTL", default="60"))
+SEARCH_CACHE_SIZE = int(getenv("SEARCH_CACHE_SIZE", default="1000"))
+
+PHOTO_CACHE_FILE = getenv("PHOTO_CACHE_FILE", default="photo_file_ids.json")
+PHOTO_REVALIDATE_INTERVAL = float(getenv("PHOTO_REVALIDATE_INTERVAL", default="600"))
+
+
+class ProductCardMode(str, Enum):
+    EDIT = "EDIT"
+    RESEND = "RESEND"
+
+
+PRODUCT_CARD_MODE = ProductCardMode(getenv("PRODUCT_CARD_MODE", default="EDIT"))
+CARD_EDIT_DEBOUNCE = float(getenv("CARD_EDIT_DEBOUNCE", default="0.3"))
+
+RECEIPT_FONT_PATH = getenv(
+    "RECEIPT_FONT_PATH",
+    default="/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+RECEIPT_WORKERS = int(getenv("RECEIPT_WORKERS", default="2"))
+RECEIPT_USE_PROCESSES = getenv("RECEIPT_USE_PROCESSES", default="true").lower() == "true"
+
+ADMIN_NOTIFY_WORKERS = int(getenv("ADMIN_NOTIFY_WORKERS", default="4"))
+ADMIN_NOTIFY_GLOBAL_RATE = float(getenv("ADMIN_NOTIFY_GLOBAL_RATE", default="25"))
+ADMIN_NOTIFY_CHAT_RATE = float(getenv("ADMIN_NOTIFY_CHAT_RATE", default="1"))
+ADMIN_NOTIFY_MAX_ATTEMPTS = int(getenv("ADMIN_NOTIFY_MAX_ATTEMPTS", default="5"))
+
+
+class FsmStorage(str, Enum):
+    MEMORY = "MEMORY"
+    REDIS = "REDIS"
+
+
+FSM_STORAGE = FsmStorage(getenv("FSM_STORAGE", default="MEMORY"))
+REDIS_URL = getenv("REDIS_URL", default="redis://localhost:6379/0")
+# Сколько хранить состояние и данные неактивного пользователя (секунды, 0 — вечно)
+FSM_STATE_TTL = int(getenv("FSM_STATE_TTL", default="604800"))
+FSM_DATA_TTL = int(getenv("FSM_DATA_TTL", default="604800"))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .api_client import get_api_client
+
+if TYPE_CHECKING:
+    from .storage import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+# Сколько помним, что профиля нет: профиль могла создать другая реплика
+NEGATIVE_CACHE_TTL = 30.0
+
+BOT_TOKEN_HEADER = "X-Bot-Token"  # noqa: S105
+
+
+class CustomerClient:
+    """Профили клиентов из API (`/customers/`) и локальный кэш на чтение.
+
+    Если API недоступен, чтения и записи идут в локальный `ProfileStore`,
+    чтобы бот продолжал работать на последних известных данных.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        cache_ttl: float = 300.0,
+        fallback: ProfileStore | None = None,
+        token: str = "",
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        # Только для запросов к своему API: общий клиент ходит и по чужим URL
+        self.headers = {BOT_TOKEN_HEADER: token} if token else {}
+        self.cache_ttl = cache_ttl
+        self.fallback = fallback
+        self._cache: dict[int, tuple[float, dict[str, str] | None]] = {}
+
+    def _remember(self, user_id: int, entry: dict[str, str] | None) -> None:
+        ttl = self.cache_ttl if entry else NEGATIVE_CACHE_TTL
+        self._cache[user_id] = (time.monotonic() + ttl, entry)
+
+    def _cached(self, user_id: int) -> tuple[bool, dict[str, str] | None]:
+        hit = self._cache.get(user_id)
+        if hit is None or hit[0] < time.monotonic():
+            return False, None
+        return True, hit[1]
+
+    @staticmethod
+    def _entry(row: dict) -> dict[str, str]:
+        return {"phone": row.get("phone") or "", "language": row.get("language") or "ru"}
+
+    async def get(self, user_id: int) -> dict[str, str] | None:
+        found, entry = self._cached(user_id)
+        if found:
+            return entry
+        return (await self.get_many([user_id])).get(user_id)
+
+    async def get_many(self, user_ids: list[int]) -> dict[int, dict[str, str]]:
+        result = {}
+        missing = []
+        for user_id in user_ids:
+            found, entry = self._cached(user_id)
+            if not found:
+                missing.append(user_id)
+            elif entry:
+                result[user_id] = entry
+
+        if not missing:
+            return result
+
+        try:
+            response = await get_api_client().get(
+                f"{self.base_url}/customers/",
+                headers=self.headers,
+                params={"ids": ",".join(map(str, missing))},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.warning("[CUSTOMERS] API недоступен, читаем локальную копию")
+            return {**result, **self._from_fallback(missing)}
+
+        fetched = {row["telegram_id"]: self._entry(row) for row in response.json()}
+        for user_id in missing:
+            entry = fetched.get(user_id)
+            self._remember(user_id, entry)
+            if entry:
+                result[user_id] = entry
+                self._sync_fallback(user_id, entry)
+        return result
+
+    def _from_fallback(self, user_ids: list[int]) -> dict[int, dict[str, str]]:
+        if self.fallback is None:
+            return {}
+        entries = {user_id: self.fallback.get(user_id) for user_id in user_ids}
+        return {user_id: entry for user_id, entry in entries.items() if entry}
+
+    def _sync_fallback(self, user_id: int, entry: dict[str, str]) -> None:
+        if self.fallback is not None and self.fallback.get(user_id) != entry:
+            self.fallback.set(user_id, entry["phone"], entry["language"])
+
+    async def save(self, user_id: int, phone: str, language: str = "ru") -> None:
+        entry = {"phone": phone, "language": language}
+        self._remember(user_id, entry)
+        if self.fallback is not None:
+            self.fallback.set(user_id, phone, language)
+
+        try:
+            response = await get_api_client().post(
+                f"{self.base_url}/customers/bulk/",
+                headers=self.headers,
+                json=[{"telegram_id": user_id, **entry}],
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.exception("[CUSTOMERS] Не удалось сохранить профиль %s", user_id)
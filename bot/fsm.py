@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+import logging
+from functools import partial
+from typing import TYPE_CHECKING
+
+from aiogram.fsm.storage.base import DefaultKeyBuilder
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
+from aiogram.fsm.storage.redis import RedisStorage
+
+from .config.bot import FSM_DATA_TTL, FSM_STATE_TTL, FSM_STORAGE, REDIS_URL, FsmStorage
+
+if TYPE_CHECKING:
+    from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+
+logger = logging.getLogger(__name__)
+
+# Компактный JSON: без пробелов и \u-экранирования кириллицы
+compact_json_dumps = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
+
+def create_fsm_storage() -> tuple[BaseStorage, BaseEventIsolation]:
+    """FSM-хранилище и изоляция апдейтов для диспетчера.
+
+    Redis хранит состояние между перезапусками, общее для всех воркеров бота;
+    блокировка апдейтов одного пользователя тоже действует между процессами.
+    """
+    if FSM_STORAGE == FsmStorage.REDIS:
+        logger.info("Using Redis for FSM storage")
+        storage = RedisStorage.from_url(
+            REDIS_URL,
+            key_builder=DefaultKeyBuilder(prefix="bot:fsm"),
+            state_ttl=FSM_STATE_TTL or None,
+            data_ttl=FSM_DATA_TTL or None,
+            json_dumps=compact_json_dumps,
+        )
+        return storage, storage.create_isolation()
+
+    return MemoryStorage(), SimpleEventIsolation()
@@ -8,7 +8,7 @@ from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import KeyboardButton, Message, ReplyKeyboardMarkup
 
 from .bot_func import show_menu  # меню одно, и само проверяет язык
-from .utils import get_language, get_phone, save_phone  # ← функции для хранения
+from .utils import get_profile, save_phone  # ← функции для хранения
 
 if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
@@ -28,8 +28,9 @@ class RegState(StatesGroup):
 @router.message(Command("start"))
 async def start_registration(message: Message, state: FSMContext):
     user_id = message.from_user.id
-    phone = get_phone(user_id)
-    lang = get_language(user_id)
+    profile = await get_profile(user_id) or {}
+    phone = profile.get("phone")
+    lang = profile.get("language", "ru")
 
     if phone and lang:
         await state.update_data(phone=phone)
@@ -97,9 +98,9 @@ async def handle_contact(message: Message, state: FSMContext):
     data = await state.get_data()
     language = data.get("language", "ru")  # ← language, не lang
 
-    save_phone(user_id, phone, language)
-    await state.update_data(phone=phone)
-    await state.update_data(language=language)
+    await save_phone(user_id, phone, language)
+    # Сначала сбрасываем состояние регистрации, потом сохраняем данные — не наоборот
     await state.clear()
+    await state.update_data(phone=phone, language=language)
 
     return await show_menu(message)  # просто вызываем общее меню
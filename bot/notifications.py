@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+from .config.bot import (
+    ADMIN_NOTIFY_CHAT_RATE,
+    ADMIN_NOTIFY_GLOBAL_RATE,
+    ADMIN_NOTIFY_MAX_ATTEMPTS,
+    ADMIN_NOTIFY_WORKERS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine, Iterable
+
+    from aiogram import Bot
+    from aiogram.types import InputFile
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+class TokenBucket:
+    """Максимум `rate` операций в секунду, всплеском до `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        # Telegram попросил подождать (429 retry_after) — до этого момента не отдаём токены
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(slots=True)
+class _Job:
+    chat_id: int
+    send: Callable[[], Awaitable[Any]]
+
+
+class AdminNotifier:
+    """Фоновая очередь уведомлений админам.
+
+    Отправку выполняют `workers` задач. Каждая отправка берёт токен из бакета
+    чата и из общего бакета бота. При 429 ждём `retry_after`, при сетевых
+    ошибках и 5xx повторяем, увеличивая задержку экспоненциально.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        global_rate: float = 25.0,
+        chat_rate: float = 1.0,
+        max_attempts: int = 5,
+    ) -> None:
+        self.workers = workers
+        self.chat_rate = chat_rate
+        self.max_attempts = max_attempts
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._background: set[asyncio.Task] = set()
+
+    def _ensure_started(self) -> asyncio.Queue[_Job]:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._worker(self._queue))
+                for _ in range(self.workers)
+            ]
+        return self._queue
+
+    def enqueue(self, chat_id: int, send: Callable[[], Awaitable[Any]]) -> None:
+        """Поставить отправку в очередь. `send` вызывается заново на каждую попытку."""
+        self._ensure_started().put_nowait(_Job(chat_id, send))
+
+    def send_document(
+        self,
+        bot: Bot,
+        chat_ids: Iterable[int],
+        document: InputFile,
+        **kwargs: Any,
+    ) -> None:
+        for chat_id in chat_ids:
+            self.enqueue(chat_id, partial(bot.send_document, chat_id, document, **kwargs))
+
+    def run_in_background(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Запустить подготовку уведомления (например, рендер PDF), не дожидаясь её."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._on_background_done)
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[NOTIFY] Фоновая задача упала", exc_info=task.exception())
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate)
+        return bucket
+
+    async def _worker(self, queue: asyncio.Queue[_Job]) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                await self._deliver(job)
+            except Exception:
+                logger.exception("[NOTIFY] Ошибка отправки в чат %s", job.chat_id)
+            finally:
+                queue.task_done()
+
+    async def _deliver(self, job: _Job) -> None:
+        chat_bucket = self._chat_bucket(job.chat_id)
+        for attempt in range(1, self.max_attempts + 1):
+            await chat_bucket.acquire()
+            await self._global_bucket.acquire()
+            try:
+                await job.send()
+            except TelegramRetryAfter as e:
+                # Следующий acquire() сам подождёт retry_after — и для других задач чата
+                chat_bucket.pause(float(e.retry_after))
+                continue
+            except (TelegramNetworkError, TelegramServerError) as e:
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)  # noqa: S311
+                logger.warning("[NOTIFY] Чат %s, попытка %s: %s", job.chat_id, attempt, e)
+            except TelegramAPIError as e:
+                # Бот заблокирован, чат не найден и т.п. — повтор не поможет
+                logger.warning("[NOTIFY] Чат %s: %s", job.chat_id, e)
+                return
+            else:
+                return
+            if attempt < self.max_attempts:
+                await asyncio.sleep(delay)
+        logger.error(
+            "[NOTIFY] Чат %s: не доставлено за %s попыток",
+            job.chat_id,
+            self.max_attempts,
+        )
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Дождаться фоновых задач и очереди (не дольше `timeout`), затем остановить воркеров."""
+        try:
+            async with asyncio.timeout(timeout):
+                if self._background:
+                    await asyncio.gather(*self._background, return_exceptions=True)
+                if self._queue is not None:
+                    await self._queue.join()
+        except TimeoutError:
+            logger.warning("[NOTIFY] Остановка: не все уведомления отправлены")
+        for task in (*self._workers, *self._background):
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._background, return_exceptions=True)
+        self._workers.clear()
+        self._queue = None
+
+
+admin_notifier = AdminNotifier(
+    workers=ADMIN_NOTIFY_WORKERS,
+    global_rate=ADMIN_NOTIFY_GLOBAL_RATE,
+    chat_rate=ADMIN_NOTIFY_CHAT_RATE,
+    max_attempts=ADMIN_NOTIFY_MAX_ATTEMPTS,
+)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import httpx
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile
+
+from .api_client import MEDIA_TIMEOUT, get_api_client
+from .config.bot import PHOTO_CACHE_FILE, PHOTO_REVALIDATE_INTERVAL
+from .storage import atomic_write_json
+
+if TYPE_CHECKING:
+    from aiogram.types import Message
+
+logger = logging.getLogger(__name__)
+
+
+class PhotoCache:
+    """Telegram `file_id` загруженных фото: `url -> (sha256, file_id)` и `sha256 -> file_id`.
+
+    После первой загрузки фото отправляется по `file_id` — без скачивания,
+    записи на диск и повторной загрузки в Telegram. Индекс по хэшу позволяет
+    переиспользовать `file_id`, если та же картинка доступна по другому URL.
+
+    Файл по тому же URL могут заменить, поэтому запись для URL старше
+    `revalidate_after` секунд проверяется условным запросом (ETag,
+    Last-Modified); если содержимое изменилось, фото загружается заново.
+    """
+
+    def __init__(self, path: str, revalidate_after: float = 600.0) -> None:
+        self.path = path
+        self.revalidate_after = revalidate_after
+        self._urls: dict[str, dict[str, str]] = {}
+        self._hashes: dict[str, str] = {}
+        self._loaded = False
+        self._save_lock = asyncio.Lock()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        path = Path(self.path)
+        if not path.exists():
+            return
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.warning(
+                "[PHOTOS] Не удалось прочитать %s — начинаем с пустого",
+                self.path,
+            )
+            return
+        self._urls = raw.get("urls", {})
+        self._hashes = raw.get("hashes", {})
+
+    def get(self, key: str) -> str | None:
+        entry = self.get_entry(key)
+        return entry["file_id"] if entry else None
+
+    def get_entry(self, key: str) -> dict[str, Any] | None:
+        self._load()
+        return self._urls.get(key)
+
+    def needs_revalidation(self, entry: dict[str, Any]) -> bool:
+        # Записи из старого формата без checked_at проверяем сразу
+        return time.time() - entry.get("checked_at", 0) >= self.revalidate_after
+
+    def get_by_hash(self, digest: str) -> str | None:
+        self._load()
+        return self._hashes.get(digest)
+
+    def remember(
+        self,
+        key: str,
+        digest: str,
+        file_id: str,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        self._load()
+        self._urls[key] = {
+            "sha256": digest,
+            "file_id": file_id,
+            "checked_at": time.time(),
+            **(validators or {}),
+        }
+        self._hashes[digest] = file_id
+        self._schedule_save()
+
+    def touch(self, key: str, validators: dict[str, str] | None = None) -> None:
+        # Содержимое по URL не изменилось — следующая проверка через revalidate_after
+        entry = self._urls.get(key)
+        if entry:
+            entry.update(validators or {}, checked_at=time.time())
+            self._schedule_save()
+
+    def forget(self, key: str) -> None:
+        self._load()
+        entry = self._urls.pop(key, None)
+        if entry:
+            self._hashes.pop(entry["sha256"], None)
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        snapshot = {"urls": dict(self._urls), "hashes": dict(self._hashes)}
+        try:
+            asyncio.get_running_loop().create_task(self._save(snapshot))
+        except RuntimeError:
+            atomic_write_json(self.path, snapshot)
+
+    async def _save(self, snapshot: dict[str, Any]) -> None:
+        async with self._save_lock:
+            try:
+                await asyncio.to_thread(atomic_write_json, self.path, snapshot)
+            except OSError:
+                logger.exception("[PHOTOS] Не удалось сохранить %s", self.path)
+
+
+class _Download(NamedTuple):
+    content: bytes
+    filename: str
+    # ETag / Last-Modified ответа для следующей условной проверки
+    validators: dict[str, str]
+
+
+NOT_MODIFIED = _Download(b"", "", {})
+
+_VALIDATOR_HEADERS = {"etag": "If-None-Match", "last_modified": "If-Modified-Since"}
+
+
+def _cache_key(source: str) -> str:
+    if source.startswith("http"):
+        return source
+    # Для локальных файлов учитываем mtime: заменили файл — загрузим заново
+    return f"file://{source}:{Path(source).stat().st_mtime_ns}"
+
+
+async def _load_bytes(
+    source: str,
+    cached: dict[str, Any] | None = None,
+) -> _Download | None:
+    """Скачать фото; при `cached` — условно, NOT_MODIFIED если файл тот же."""
+    if not source.startswith("http"):
+        path = Path(source)
+        content = await asyncio.to_thread(path.read_bytes)
+        return _Download(content, path.name, {})
+
+    headers = {
+        header: cached[field]
+        for field, header in _VALIDATOR_HEADERS.items()
+        if cached and cached.get(field)
+    }
+    try:
+        response = await get_api_client().get(
+            source,
+            headers=headers,
+            timeout=MEDIA_TIMEOUT,
+        )
+    except httpx.HTTPError:
+        logger.warning("[PHOTOS] Не удалось скачать %s", source)
+        return None
+    if response.status_code == httpx.codes.NOT_MODIFIED and headers:
+        return NOT_MODIFIED
+    if response.status_code != httpx.codes.OK:
+        logger.warning("[PHOTOS] %s ответил %s", source, response.status_code)
+        return None
+    validators = {
+        field: value
+        for field, value in (
+            ("etag", response.headers.get("ETag")),
+            ("last_modified", response.headers.get("Last-Modified")),
+        )
+        if value
+    }
+    filename = Path(response.url.path).name or "photo.jpg"
+    return _Download(response.content, filename, validators)
+
+
+async def _revalidate(
+    source: str,
+    key: str,
+    entry: dict[str, Any],
+    cache: PhotoCache,
+) -> tuple[dict[str, Any] | None, _Download | None]:
+    """Проверить запись кэша на сервере: (запись или None, если фото сменилось; скачанное)."""
+    loaded = await _load_bytes(source, entry)
+    if loaded is None:
+        # Сеть недоступна — отправляем по file_id, проверим в следующий раз
+        return entry, None
+    if loaded is NOT_MODIFIED:
+        cache.touch(key)
+        return entry, None
+    if hashlib.sha256(loaded.content).hexdigest() == entry["sha256"]:
+        cache.touch(key, loaded.validators)
+        return entry, loaded
+    # По тому же URL теперь другая картинка — старый file_id не годится
+    cache.forget(key)
+    return None, loaded
+
+
+async def answer_cached_photo(
+    message: Message,
+    source: str,
+    cache: PhotoCache,
+    default_path: str,
+    **kwargs: Any,
+) -> Message:
+    """Ответить фото из `source` (URL или путь), по возможности по `file_id`."""
+    key = _cache_key(source)
+
+    entry = cache.get_entry(key)
+    loaded = None
+    if entry and source.startswith("http") and cache.needs_revalidation(entry):
+        entry, loaded = await _revalidate(source, key, entry, cache)
+
+    file_id = entry["file_id"] if entry else None
+    if file_id:
+        try:
+            return await message.answer_photo(photo=file_id, **kwargs)
+        except TelegramBadRequest:
+            # file_id протух (например, сменился токен бота) — загрузим заново
+            cache.forget(key)
+
+    loaded = loaded or await _load_bytes(source)
+    if loaded is None:
+        # Заглушку под URL товара не кэшируем: в следующий раз попробуем снова
+        return await answer_cached_photo(
+            message,
+            default_path,
+            cache,
+            default_path,
+            **kwargs,
+        )
+    content, filename, validators = loaded
+    digest = hashlib.sha256(content).hexdigest()
+
+    file_id = cache.get_by_hash(digest)
+    if file_id:
+        try:
+            sent = await message.answer_photo(photo=file_id, **kwargs)
+        except TelegramBadRequest:
+            file_id = None
+        else:
+            cache.remember(key, digest, file_id, validators)
+            return sent
+
+    sent = await message.answer_photo(
+        photo=BufferedInputFile(content, filename=filename),
+        **kwargs,
+    )
+    cache.remember(key, digest, sent.photo[-1].file_id, validators)
+    return sent
+
+
+photo_cache = PhotoCache(PHOTO_CACHE_FILE, revalidate_after=PHOTO_REVALIDATE_INTERVAL)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fontTools import subset as ftsubset
+from fontTools.ttLib import TTFont
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PAGE_WIDTH = 80  # мм, ширина кассовой ленты
+LOGO_WIDTH = 40  # мм
+LOGO_MAX_PX = 320  # ~203 dpi термопринтера на 40 мм
+
+# Латиница (включая узбекскую), кириллица, пунктуация, стрелки и знаки вроде №
+RECEIPT_UNICODE_RANGES = (
+    (0x0020, 0x024F),
+    (0x02B0, 0x02FF),
+    (0x0370, 0x03FF),
+    (0x0400, 0x052F),
+    (0x1E00, 0x1EFF),
+    (0x2000, 0x206F),
+    (0x20A0, 0x20CF),
+    (0x2100, 0x21FF),
+)
+
+
+def strip_emojis(text: str) -> str:
+    return re.sub(r"[^\w\s.,:;!?()%/\-+№\"\'=А-Яа-яёЁ]", "", text)
+
+
+@dataclass(frozen=True)
+class ReceiptAssets:
+    """Шрифт и логотип, подготовленные один раз на процесс."""
+
+    font_path: str
+    logo: bytes
+
+
+@dataclass(frozen=True)
+class Receipt:
+    order_id: int
+    company_name: str
+    company_phone: str
+    client_phone: str
+    created_at: str
+    total: float
+    items: list[dict] = field(default_factory=list)
+
+
+def _subset_font(font_path: str) -> str:
+    """Урезать TTF до нужных чеку символов и сохранить рядом во временной папке.
+
+    Полный DejaVuSans содержит ~6000 глифов, и FPDF разбирает их для каждого
+    документа; подмножество разбирается в несколько раз быстрее.
+    """
+    stat = Path(font_path).stat()
+    key = hashlib.sha1(
+        f"{font_path}:{stat.st_mtime_ns}:{stat.st_size}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()[:12]
+    target = Path(tempfile.gettempdir()) / f"receipt-font-{key}.ttf"
+    if target.exists():
+        return str(target)
+
+    options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+    options.drop_tables += ["FFTM", "GDEF", "GPOS", "GSUB"]
+    subsetter = ftsubset.Subsetter(options)
+    subsetter.populate(
+        unicodes=[
+            c for start, end in RECEIPT_UNICODE_RANGES for c in range(start, end + 1)
+        ],
+    )
+    font = TTFont(font_path)
+    subsetter.subset(font)
+
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".ttf")
+    with os.fdopen(fd, "wb") as f:
+        font.save(f)
+    Path(tmp_path).replace(target)
+    return str(target)
+
+
+def _prepare_logo(logo_path: str) -> bytes:
+    # Исходник — PNG 1024 на 1024: FPDF заново распаковывал и сжимал логотип для
+    # каждого чека. Маленький JPEG встраивается как есть, без перекодирования.
+    with Image.open(logo_path) as source:
+        image = source.convert("RGB")
+    image.thumbnail((LOGO_MAX_PX, LOGO_MAX_PX))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90, optimize=True)
+    return buffer.getvalue()
+
+
+def prepare_assets(font_path: str, logo_path: str) -> ReceiptAssets:
+    return ReceiptAssets(font_path=_subset_font(font_path), logo=_prepare_logo(logo_path))
+
+
+class ReceiptPDF(FPDF):
+    def __init__(self, assets: ReceiptAssets) -> None:
+        super().__init__(format=(PAGE_WIDTH, 300))  # 80 мм ширина, высота авто
+        self.add_font("DejaVu", "", assets.font_path)
+        self.set_font("DejaVu", "", 9)  # чуть меньше шрифт
+        self.set_auto_page_break(auto=True, margin=10)
+        self.add_page()
+
+    def line_text(self, text: str, h: float = 5) -> None:
+        # ВСЕГДА ПО ЦЕНТРУ
+        self.cell(0, h, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+
+
+def build_receipt_pdf(receipt: Receipt, assets: ReceiptAssets) -> bytes:
+    pdf = ReceiptPDF(assets)
+    pdf.image(io.BytesIO(assets.logo), x=(PAGE_WIDTH - LOGO_WIDTH) / 2, w=LOGO_WIDTH)
+    pdf.ln(3)
+    pdf.line_text("КАССОВЫЙ ЧЕК / CHIQARILGAN CHEK / RECEIPT", 6)
+    pdf.line_text("-" * 66)
+    pdf.line_text(strip_emojis(receipt.company_name))
+    pdf.line_text(f"Тел.: +998 {receipt.company_phone}")
+    pdf.line_text(f"Клиент: {receipt.client_phone}")
+    pdf.line_text(f"№: {receipt.order_id}")
+    pdf.line_text(receipt.created_at)
+    pdf.line_text("-" * 66)
+    pdf.line_text("Товары / Mahsulotlar / Products:")
+
+    for item in receipt.items:
+        name = strip_emojis(item["name"])[:25]
+        quantity = item["quantity"]
+        price = float(item["price"])
+        discount = float(item.get("discount_percent", 0))
+        if discount > 0:
+            new_price = price * (1 - discount / 100)
+            subtotal = quantity * new_price
+            pdf.line_text(f"{name} x{quantity} = {subtotal:.2f}")
+            pdf.line_text(f"Скидка {discount}%: {price:.2f} → {new_price:.2f}")
+        else:
+            subtotal = quantity * price
+            pdf.line_text(f"{name} x{quantity} = {subtotal:.2f}")
+
+    pdf.line_text("-" * 66)
+    pdf.line_text(f"ИТОГО: {receipt.total:.2f} сум")
+    pdf.line_text("СПАСИБО ЗА ВНИМАНИЕ")
+
+    return bytes(pdf.output())
+
+
+# Ассеты процесса-воркера (задаются инициализатором пула)
+_worker_assets: ReceiptAssets | None = None
+
+
+def _init_worker(assets: ReceiptAssets) -> None:
+    global _worker_assets  # noqa: PLW0603
+
+    _worker_assets = assets
+
+
+def _render_in_worker(receipt: Receipt) -> bytes:
+    if _worker_assets is None:
+        msg = "Receipt worker is not initialized"
+        raise RuntimeError(msg)
+    return build_receipt_pdf(receipt, _worker_assets)
+
+
+class ReceiptRenderer:
+    """Рендер PDF-чеков в памяти в пуле воркеров, вне event loop бота.
+
+    Шрифт и логотип готовятся один раз при первом использовании и передаются
+    воркерам при старте пула.
+    """
+
+    def __init__(
+        self,
+        font_path: str,
+        logo_path: str,
+        workers: int = 2,
+        use_processes: bool = True,  # noqa: FBT001, FBT002
+    ) -> None:
+        self.font_path = font_path
+        self.logo_path = logo_path
+        self.workers = workers
+        self.use_processes = use_processes
+        self._executor: Executor | None = None
+        self._starting: asyncio.Lock | None = None
+
+    def _create_executor(self) -> Executor:
+        assets = prepare_assets(self.font_path, self.logo_path)
+        if self.use_processes:
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(assets,),
+            )
+        _init_worker(assets)
+        return ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="receipt",
+        )
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self._starting is None:
+            self._starting = asyncio.Lock()
+        async with self._starting:
+            if self._executor is None:
+                self._executor = await asyncio.to_thread(self._create_executor)
+
+    async def render(self, receipt: Receipt) -> bytes:
+        await self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _render_in_worker, receipt)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
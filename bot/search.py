@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from aiogram import F, Router
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.enums import ChatType
+from aiogram.types import InlineQueryResultArticle, InputTextMessageContent
+
+from .bot_func import OrderState, send_product_preview
+from .catalog import catalog_cache
+from .config.bot import SEARCH_CACHE_TTL
+from .utils import get_language
+
+if TYPE_CHECKING:
+    from aiogram.fsm.context import FSMContext
+    from aiogram.types import InlineQuery, Message
+
+    from .catalog import CatalogProduct
+
+logger = logging.getLogger(__name__)
+
+router_search = Router()
+
+CURRENCY = {"ru": "сум", "uz": "so‘m", "en": "UZS"}
+
+# Последняя строка сообщения из результата поиска — id товара: «Маргарита\n#12»
+PRODUCT_ID_PATTERN = re.compile(r"\n#(\d+)\Z")
+
+
+def build_search_result(product: CatalogProduct, lang: str) -> InlineQueryResultArticle:
+    price = float(product.final_price or product.price)
+    description = f"{price:.2f} {CURRENCY.get(lang, CURRENCY['ru'])}"
+    if product.discount_percent:
+        description += f" (−{product.discount_percent}%)"
+    thumbnail = (
+        product.image if product.image and product.image.startswith("http") else None
+    )
+    return InlineQueryResultArticle(
+        id=str(product.id),
+        title=product.name,
+        description=description,
+        thumbnail_url=thumbnail,
+        # Выбранный результат приходит боту как обычное сообщение: название и id
+        input_message_content=InputTextMessageContent(
+            message_text=f"{product.name}\n#{product.id}",
+        ),
+    )
+
+
+@router_search.inline_query()
+async def search_inline(query: InlineQuery) -> None:
+    products = await catalog_cache.search_products(query.query)
+    lang = await get_language(query.from_user.id)
+    await query.answer(
+        [build_search_result(product, lang) for product in products],
+        cache_time=int(SEARCH_CACHE_TTL),
+        is_personal=False,
+    )
+
+
+@router_search.message(F.via_bot, F.chat.type == ChatType.PRIVATE, F.text)
+async def open_found_product(message: Message, state: FSMContext) -> object:
+    # Результаты других inline-ботов и чужой текст — не наши
+    match = PRODUCT_ID_PATTERN.search(message.text)
+    if message.via_bot.id != message.bot.id or match is None:
+        return UNHANDLED
+    product = catalog_cache.find_product(int(match[1]))
+    if product is None:
+        return UNHANDLED
+
+    # Дальше — как после выбора товара из категории
+    await state.set_state(OrderState.choosing_product)
+    await state.update_data(
+        category_id=product.category_id,
+        selected_product=product.as_dict(),
+        quantity=1,
+    )
+    await send_product_preview(message, product.as_dict(), quantity=1, state=state)
+    return None
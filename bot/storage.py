@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write JSON next to `path` and rename it over the original."""
+    directory = Path(path).resolve().parent
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class ProfileStore:
+    """In-memory index of `user_id -> {"phone", "language"}` backed by a JSON file.
+
+    Lookups never touch the disk: the file is parsed once and re-read only when
+    its mtime/size changes. Writes are batched and flushed in the background
+    with an atomic rename.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_delay: float = 1.0,
+        reload_interval: float = 2.0,
+    ) -> None:
+        self.path = path
+        self.flush_delay = flush_delay
+        self.reload_interval = reload_interval
+
+        self._profiles: dict[str, dict[str, str]] = {}
+        self._dirty: dict[str, dict[str, str]] = {}
+        self._signature: tuple[int, int] | None = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._write_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+
+    # --- чтение
+
+    def get(self, user_id: int | str) -> dict[str, str] | None:
+        self._maybe_reload()
+        return self._profiles.get(str(user_id))
+
+    def __len__(self) -> int:
+        self._maybe_reload()
+        return len(self._profiles)
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = Path(self.path).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+
+        self._profiles = self._read_file()
+        # Несохранённые изменения важнее того, что лежит на диске
+        self._profiles.update(self._dirty)
+        self._signature = signature
+        self._loaded = True
+
+    def _read_file(self) -> dict[str, dict[str, str]]:
+        path = Path(self.path)
+        if not path.exists():
+            return {}
+        with path.open(encoding="utf-8") as f:
+            try:
+                raw = json.load(f)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "[PROFILES] JSON файл %s повреждён или пуст — начинаем с пустого",
+                    self.path,
+                )
+                return {}
+
+        profiles = {}
+        for user_id, entry in raw.items():
+            # Старый формат: {"<user_id>": "<phone>"}
+            profiles[str(user_id)] = (
+                {"phone": entry, "language": "ru"} if isinstance(entry, str) else entry
+            )
+        return profiles
+
+    # --- запись
+
+    def set(self, user_id: int | str, phone: str, language: str = "ru") -> None:
+        self._maybe_reload()
+        entry = {"phone": phone, "language": language}
+        self._profiles[str(user_id)] = entry
+        self._dirty[str(user_id)] = entry
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Вне event loop (скрипты, тесты) — пишем сразу
+            self.flush()
+            return
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.flush_delay,
+                lambda: loop.create_task(self.aflush()),
+            )
+
+    def _take_snapshot(self) -> tuple[dict, dict] | None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty:
+            return None
+        dirty, self._dirty = self._dirty, {}
+        return dirty, dict(self._profiles)
+
+    def _write(self, snapshot: dict[str, dict[str, str]]) -> None:
+        with self._write_lock:
+            atomic_write_json(self.path, snapshot)
+            self._signature = self._file_signature()
+
+    def _restore_dirty(self, dirty: dict[str, dict[str, str]]) -> None:
+        logger.exception("[PROFILES] Не удалось сохранить %s", self.path)
+        self._dirty = {**dirty, **self._dirty}
+
+    def flush(self) -> None:
+        taken = self._take_snapshot()
+        if taken is None:
+            return
+        dirty, snapshot = taken
+        try:
+            self._write(snapshot)
+        except OSError:
+            self._restore_dirty(dirty)
+
+    async def aflush(self) -> None:
+        # Снимки пишутся строго по очереди, чтобы старый не перезаписал новый
+        async with self._flush_lock:
+            taken = self._take_snapshot()
+            if taken is None:
+                return
+            dirty, snapshot = taken
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._write, snapshot)
+            except OSError:
+                self._restore_dirty(dirty)
@@ -1,50 +1,66 @@
 from __future__ import annotations
 
-import json
-import os
+import logging
 from typing import TYPE_CHECKING
 
+from .config.bot import (
+    API_URL,
+    BOT_API_TOKEN,
+    PROFILE_BACKEND,
+    PROFILE_CACHE_TTL,
+    ProfileBackend,
+)
+from .customers import CustomerClient
+from .storage import ProfileStore
+
 if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
 
+logger = logging.getLogger(__name__)
+
 PHONE_STORAGE_FILE = "phone_numbers.json"
 
+profile_store = ProfileStore(PHONE_STORAGE_FILE)
+
+# При работе через API локальный файл остаётся запасной копией на случай недоступности API
+customer_client = (
+    CustomerClient(
+        API_URL,
+        cache_ttl=PROFILE_CACHE_TTL,
+        fallback=profile_store,
+        token=BOT_API_TOKEN,
+    )
+    if PROFILE_BACKEND == ProfileBackend.API
+    else None
+)
+
 
-def load_phones():
-    if os.path.exists(PHONE_STORAGE_FILE):
-        with open(PHONE_STORAGE_FILE) as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                print(
-                    "[LOAD_PHONES] JSON файл повреждён или пуст — возвращаем пустой словарь",
-                )
-                return {}
-    return {}
+async def get_profile(user_id: int) -> dict[str, str] | None:
+    if customer_client is not None:
+        return await customer_client.get(user_id)
+    return profile_store.get(user_id)
 
 
-def save_phone(user_id: int, phone: str, language: str = "ru") -> None:
-    phones = load_phones()
-    phones[str(user_id)] = {"phone": phone, "language": language}
-    with open(PHONE_STORAGE_FILE, "w") as f:
-        json.dump(phones, f, ensure_ascii=False, indent=2)
+async def save_phone(user_id: int, phone: str, language: str = "ru") -> None:
+    if customer_client is not None:
+        await customer_client.save(user_id, phone, language)
+    else:
+        profile_store.set(user_id, phone, language)
 
 
-def get_phone(user_id: int):
-    phones = load_phones()
-    entry = phones.get(str(user_id))
+async def get_phone(user_id: int) -> str | None:
+    entry = await get_profile(user_id)
     if entry:
         return entry.get("phone")
-    print(f"[GET_PHONE] Not found for user {user_id}")
+    logger.debug("[GET_PHONE] Not found for user %s", user_id)
     return None
 
 
-def get_language(user_id: int):
-    phones = load_phones()
-    entry = phones.get(str(user_id))
+async def get_language(user_id: int) -> str:
+    entry = await get_profile(user_id)
     if entry:
         return entry.get("language", "ru")
-    print(f"[GET_LANG] Not found for user {user_id}, defaulting to 'ru'")
+    logger.debug("[GET_LANG] Not found for user %s, defaulting to 'ru'", user_id)
     return "ru"
 
 
@@ -58,10 +74,13 @@ async def get_user_phone(source, state: FSMContext):
         user_id = source.from_user.id
     except AttributeError:
         user_id = source.message.from_user.id
+    if getattr(source, "from_user", None) is not None and source.from_user.is_bot:
+        # call.message написал сам бот; в личке id пользователя — это id чата
+        user_id = source.chat.id
 
-    return get_phone(user_id)
+    return await get_phone(user_id)
 
 
 async def get_user_lang(state: FSMContext, user_id: int):
     data = await state.get_data()
-    return data.get("language") or get_language(user_id) or "ru"
+    return data.get("language") or await get_language(user_id) or "ru"
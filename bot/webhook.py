@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from aiogram import Bot, Dispatcher
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"  # noqa: S105 — имя заголовка
+
+
+def derive_webhook_secret(token: str) -> str:
+    """Секрет вебхука из токена бота: одинаковый на всех репликах за балансировщиком.
+
+    Telegram допускает в секрете только `A-Z`, `a-z`, `0-9`, `_` и `-`.
+    """
+    return hashlib.sha256(f"webhook:{token}".encode()).hexdigest()
+
+
+class WebhookRequestHandler(SimpleRequestHandler):
+    """Отвечает Telegram `200` сразу, апдейт обрабатывается в фоне.
+
+    При остановке сервера ждёт уже принятые апдейты (не дольше `drain_timeout`);
+    сессию бота закрывает в `on_cleanup` — после shutdown-хендлеров
+    диспетчера, которым она ещё нужна.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str,
+        drain_timeout: float = 10.0,
+        **data: Any,
+    ) -> None:
+        if not secret_token:
+            msg = "Webhook secret token must not be empty"
+            raise ValueError(msg)
+        super().__init__(
+            dispatcher,
+            bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.drain_timeout = drain_timeout
+
+    async def close(self) -> None:
+        tasks = set(self._background_feed_update_tasks)
+        if not tasks:
+            return
+        _done, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        if pending:
+            logger.warning("[WEBHOOK] Остановка: %s апдейтов не обработано", len(pending))
+            for task in pending:
+                task.cancel()
+
+
+async def _healthcheck(_request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+def create_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    *,
+    path: str,
+    secret_token: str,
+) -> web.Application:
+    app = web.Application()
+    # Порядок важен: сначала дожидаемся апдейтов, потом shutdown диспетчера
+    WebhookRequestHandler(dispatcher, bot, secret_token=secret_token).register(
+        app,
+        path=path,
+    )
+    setup_application(app, dispatcher, bot=bot)
+    app.router.add_get("/healthz", _healthcheck)
+
+    async def close_bot_session(_app: web.Application) -> None:
+        await bot.session.close()
+
+    app.on_cleanup.append(close_bot_session)
+    return app
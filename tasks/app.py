@@ -4,6 +4,6 @@ from celery import Celery
 
 from api.config import celery as config
 
-app = Celery("main")
+app = Celery("main", include=["tasks.images", "tasks.pricing"])
 app.config_from_object(config)
 app.autodiscover_tasks()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from api.user.catalog import invalidate_products
+from api.user.models import CatalogVersion, Product
+from tasks.app import app
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "product_images/variants"
+
+# Telegram сам ужимает фото до 1280 px по большей стороне
+TELEGRAM_MAX_SIDE = 1280
+TELEGRAM_JPEG_QUALITY = 85
+
+THUMBNAIL_MAX_SIDE = 320
+THUMBNAIL_WEBP_QUALITY = 80
+
+
+def _resize(image: Image.Image, max_side: int) -> Image.Image:
+    image = image.copy()
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return image
+
+
+def render_telegram_jpeg(image: Image.Image) -> bytes:
+    if image.mode == "RGBA":
+        # JPEG не хранит прозрачность — подкладываем белый фон вместо чёрного
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    buffer = io.BytesIO()
+    _resize(image, TELEGRAM_MAX_SIDE).save(
+        buffer,
+        format="JPEG",
+        quality=TELEGRAM_JPEG_QUALITY,
+        optimize=True,
+        progressive=True,
+    )
+    return buffer.getvalue()
+
+
+def render_thumbnail_webp(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    _resize(image, THUMBNAIL_MAX_SIDE).save(
+        buffer,
+        format="WEBP",
+        quality=THUMBNAIL_WEBP_QUALITY,
+        method=6,
+    )
+    return buffer.getvalue()
+
+
+@app.task(ignore_result=True)
+def generate_product_image_variants(product_id: int) -> None:
+    """Build the Telegram JPEG and admin WebP thumbnail for a product photo."""
+    product = Product.objects.filter(pk=product_id).first()
+    if product is None or not product.image:
+        return
+
+    source = product.image.name
+    try:
+        with product.image.open("rb") as f:
+            raw = f.read()
+        with Image.open(io.BytesIO(raw)) as opened:
+            # Фото из телефона часто повёрнуты только через EXIF
+            image = ImageOps.exif_transpose(opened)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            telegram = render_telegram_jpeg(image)
+            thumbnail = render_thumbnail_webp(image)
+    except (OSError, Image.DecompressionBombError):
+        logger.exception(
+            "Cannot build image variants for product %s (%s)",
+            product_id,
+            source,
+        )
+        return
+
+    stem = f"{PurePosixPath(source).stem}_{hashlib.sha256(raw).hexdigest()[:8]}"
+    storage = product.image.storage
+    telegram_name = storage.save(f"{VARIANTS_DIR}/{stem}_tg.jpg", ContentFile(telegram))
+    thumbnail_name = storage.save(
+        f"{VARIANTS_DIR}/{stem}_thumb.webp",
+        ContentFile(thumbnail),
+    )
+    old_names = {product.image_telegram.name, product.image_thumbnail.name} - {None, ""}
+
+    with transaction.atomic():
+        # Фото могли заменить, пока задача работала, — тогда эти копии уже не нужны
+        updated = Product.objects.filter(pk=product_id, image=source).update(
+            image_telegram=telegram_name,
+            image_thumbnail=thumbnail_name,
+            image_variants_source=source,
+        )
+        if updated:
+            # update() не шлёт сигналы — версия и кэш каталога сбрасываются вручную
+            CatalogVersion.bump()
+            transaction.on_commit(lambda: invalidate_products([product.category_id]))
+
+    for name in {telegram_name, thumbnail_name} if not updated else old_names:
+        storage.delete(name)
+
+    logger.info(
+        "Product %s image variants: %s -> %s KB (telegram), %s KB (thumbnail)",
+        product_id,
+        len(raw) // 1024,
+        len(telegram) // 1024,
+        len(thumbnail) // 1024,
+    )
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from api.user.pricing import run_due_campaigns
+from tasks.app import app
+
+
+@app.task(ignore_result=True)
+def run_price_campaigns() -> None:
+    """Apply and finish the price campaigns whose start or end time has come."""
+    run_due_campaigns()
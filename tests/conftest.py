@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import os
+
+# bot.config.bot завершает процесс без токена; для тестов подойдёт фиктивный
+os.environ.setdefault("TELEGRAM_API_TOKEN", "42:TEST")
+# Задачи Celery в тестах выполняются сразу, без брокера
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    # Время ответа эндпоинтов из tests/integration/test_query_budget.py
+    rows = [
+        (props["endpoint"], props["queries"], props["duration_ms"], report.nodeid)
+        for report in terminalreporter.stats.get("passed", [])
+        if report.when == "call" and "endpoint" in (props := dict(report.user_properties))
+    ]
+    if not rows:
+        return
+    terminalreporter.write_sep("-", "endpoint budgets")
+    for endpoint, queries, duration_ms, nodeid in rows:
+        terminalreporter.write_line(
+            f"{endpoint:<26} {queries:>3} queries {duration_ms:>9.2f} ms  {nodeid}",
+        )
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import threading
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+
+from api.user import views
+from api.user.models import Cart, CartItem, Category, Order, Product
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+PHONE = "+998901234567"
+
+
+def fill_cart(lines: int) -> Cart:
+    category = Category.objects.create(name="Сладости")
+    cart = Cart.objects.create(phone=PHONE)
+    for i in range(lines):
+        product = Product.objects.create(
+            category=category,
+            name=f"Конфета {i}",
+            price=Decimal("12.35"),
+            discount_percent=15 if i % 2 else 0,
+        )
+        # final_price 0 — цена считается по скидке товара
+        CartItem.objects.create(cart=cart, product=product, quantity=i + 1)
+    return cart
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("lines", [1, 12])
+def test_get_cart_loads_lines_once(
+    client: Client,
+    django_assert_num_queries,
+    lines: int,
+) -> None:
+    cart = fill_cart(lines)
+
+    with django_assert_num_queries(2):
+        response = client.get(f"/cart/{PHONE}/")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == lines
+    assert Decimal(str(response.json()["total_price"])) == cart.total_price()
+
+
+@pytest.mark.django_db
+def test_order_total_matches_cart_total(client: Client) -> None:
+    cart = fill_cart(5)
+    expected = sum(
+        (
+            item.product.discounted_price() * item.quantity
+            for item in cart.items.select_related("product")
+        ),
+        Decimal(0),
+    )
+    cart_total = client.get(f"/cart/{PHONE}/").json()["total_price"]
+
+    response = client.post("/order/", {"phone": PHONE}, content_type="application/json")
+
+    assert response.status_code == 200
+    order = Order.objects.get(id=response.json()["order_id"])
+    assert order.total == expected.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    assert response.json()["total"] == cart_total
+    assert not cart.items.exists()
+
+
+@pytest.mark.django_db
+def test_make_order_is_idempotent(client: Client) -> None:
+    fill_cart(3)
+    headers = {"HTTP_IDEMPOTENCY_KEY": "42:1001"}
+
+    first = client.post(
+        "/order/",
+        {"phone": PHONE},
+        content_type="application/json",
+        **headers,
+    )
+    retry = client.post(
+        "/order/",
+        {"phone": PHONE},
+        content_type="application/json",
+        **headers,
+    )
+    other = client.post("/order/", {"phone": PHONE}, content_type="application/json")
+
+    assert first.status_code == retry.status_code == 200
+    assert first.json()["replayed"] is False
+    assert retry.json() == {**first.json(), "replayed": True}
+    assert len(first.json()["items"]) == 3
+    assert other.status_code == 400  # корзина уже пуста
+    assert Order.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_idempotency_key_is_scoped_to_the_phone(client: Client) -> None:
+    fill_cart(2)
+    headers = {"HTTP_IDEMPOTENCY_KEY": "42:1001"}
+    first = client.post(
+        "/order/",
+        {"phone": PHONE},
+        content_type="application/json",
+        **headers,
+    )
+
+    # Чужой телефон, передав тот же ключ, не получает заказ первого клиента
+    other = client.post(
+        "/order/",
+        {"phone": "+998909999999"},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert first.status_code == 200
+    assert other.status_code == 404  # корзины этого телефона нет
+    assert Order.objects.get().phone == PHONE
+
+
+@pytest.mark.django_db
+def test_concurrent_order_with_same_key_is_replayed(client: Client, monkeypatch) -> None:
+    fill_cart(2)
+    headers = {"HTTP_IDEMPOTENCY_KEY": "42:1001"}
+    first = client.post(
+        "/order/",
+        {"phone": PHONE},
+        content_type="application/json",
+        **headers,
+    )
+    cart = Cart.objects.get()
+    CartItem.objects.create(cart=cart, product=Product.objects.first(), quantity=1)
+
+    # Повтор не увидел заказ ни в одной из двух проверок — как при гонке
+    find_order = views._find_order_by_key
+    misses = iter([None, None])
+    monkeypatch.setattr(
+        views,
+        "_find_order_by_key",
+        lambda *args: next(misses, None) or find_order(*args),
+    )
+    retry = client.post(
+        "/order/",
+        {"phone": PHONE},
+        content_type="application/json",
+        **headers,
+    )
+
+    assert retry.status_code == 200
+    assert retry.json() == {**first.json(), "replayed": True}
+    assert Order.objects.count() == 1
+    assert cart.items.count() == 1
+
+
+@pytest.mark.django_db
+def test_make_order_query_count_does_not_grow_with_cart(client: Client) -> None:
+    def place_order(lines: int) -> int:
+        Category.objects.all().delete()
+        Cart.objects.all().delete()
+        fill_cart(lines)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                "/order/",
+                {"phone": PHONE},
+                content_type="application/json",
+            )
+        assert response.status_code == 200
+        return len(queries)
+
+    assert place_order(1) == place_order(15)
+
+
+@pytest.mark.django_db
+def test_add_to_cart_upserts_in_two_queries(
+    client: Client,
+    django_assert_num_queries,
+) -> None:
+    category = Category.objects.create(name="Чай")
+    product = Product.objects.create(
+        category=category,
+        name="Зелёный",
+        price=Decimal("9.99"),
+    )
+    payload = {"phone": PHONE, "product_id": product.id, "quantity": 2}
+
+    client.post("/cart/add/", payload, content_type="application/json")
+    # Товар + upsert позиции, когда корзина уже есть
+    with django_assert_num_queries(2):
+        response = client.post("/cart/add/", payload, content_type="application/json")
+
+    assert response.json()["final_price"] == "9.99"
+    item = CartItem.objects.get()
+    assert item.quantity == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_adds_do_not_lose_increments() -> None:
+    category = Category.objects.create(name="Чай")
+    product = Product.objects.create(
+        category=category,
+        name="Чёрный",
+        price=Decimal("5.00"),
+    )
+    workers, adds = 8, 25
+    barrier = threading.Barrier(workers)
+
+    def add_one() -> None:
+        while True:
+            try:
+                CartItem.add(PHONE, product, 1)
+            except OperationalError:  # noqa: PERF203
+                # Общий in-memory SQLite тестов не ждёт блокировку и сразу падает —
+                # оператор не выполнен, повторяем. Для Postgres ошибка не ожидается.
+                if connection.vendor != "sqlite":
+                    raise
+                time.sleep(0.001)
+            else:
+                return
+
+    def add_many() -> None:
+        barrier.wait()
+        try:
+            for _ in range(adds):
+                add_one()
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=add_many) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    item = CartItem.objects.get(cart__phone=PHONE, product=product)
+    assert item.quantity == workers * adds
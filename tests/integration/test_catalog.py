@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import threading
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.cache import cache
+
+from api.user.catalog import (
+    get_or_build,
+    invalidate_products,
+    known_origins,
+    remember_origin,
+)
+from api.user.models import Category, Product
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.test import Client
+
+
+@pytest.fixture
+def locmem_cache(settings) -> Iterator[None]:
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_catalog_hits_are_served_from_cache(
+    client: Client,
+    locmem_cache,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    category = Category.objects.create(name="Выпечка")
+    product = Product.objects.create(
+        category=category,
+        name="Сомса",
+        price=Decimal("8.00"),
+    )
+
+    first = client.get(f"/products/{category.id}/").json()
+    client.get("/categories/")
+    with django_assert_num_queries(0):
+        assert client.get(f"/products/{category.id}/").json() == first
+        assert client.get("/categories/").json() == [
+            {"id": category.id, "name": "Выпечка"},
+        ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.price = Decimal("9.50")
+        product.save()
+    assert client.get(f"/products/{category.id}/").json()[0]["price"] == "9.50"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        category.name = "Хлеб"
+        category.save()
+    assert client.get("/categories/").json()[0]["name"] == "Хлеб"
+
+
+@pytest.mark.django_db
+def test_products_cache_is_per_origin(client: Client, locmem_cache, settings) -> None:
+    settings.ALLOWED_HOSTS = ["api", "shop.example.com"]
+    category = Category.objects.create(name="Фрукты")
+    Product.objects.create(
+        category=category,
+        name="Яблоко",
+        price=Decimal("3.00"),
+        image="product_images/a.jpg",
+    )
+
+    internal = client.get(f"/products/{category.id}/", HTTP_HOST="api:8001").json()
+    public = client.get(f"/products/{category.id}/", HTTP_HOST="shop.example.com").json()
+
+    assert internal[0]["image"].startswith("http://api:8001/")
+    assert public[0]["image"].startswith("http://shop.example.com/")
+
+
+def test_concurrent_misses_build_once(locmem_cache) -> None:
+    builds = []
+    started = threading.Event()
+
+    def build() -> bytes:
+        builds.append(1)
+        started.set()
+        threading.Event().wait(0.2)
+        return b"[]"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(get_or_build("catalog:test", build)),
+        )
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == [1]
+    assert results == [b"[]"] * 5
+
+
+def test_build_overtaken_by_invalidation_is_not_cached(locmem_cache) -> None:
+    def build() -> bytes:
+        # Коммит, изменивший каталог, пришёлся на середину сборки
+        invalidate_products([1])
+        return b"stale"
+
+    assert get_or_build("catalog:test", build) == b"stale"
+    assert cache.get("catalog:test") is None
+    assert get_or_build("catalog:test", lambda: b"fresh") == b"fresh"
+    assert cache.get("catalog:test") == b"fresh"
+
+
+def test_concurrent_origins_are_all_remembered(locmem_cache) -> None:
+    origins = {f"http://shop{i}.example.com" for i in range(20)}
+    threads = [
+        threading.Thread(target=remember_origin, args=(origin,)) for origin in origins
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    remember_origin("http://shop0.example.com")
+
+    assert known_origins() == origins
+
+
+@pytest.mark.django_db
+def test_catalog_conditional_get(
+    client: Client,
+    locmem_cache,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    category = Category.objects.create(name="Соки")
+    product = Product.objects.create(
+        category=category,
+        name="Гранат",
+        price=Decimal("4.00"),
+    )
+    url = f"/products/{category.id}/"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    version = int(response.headers["X-Catalog-Version"])
+    assert etag.startswith('"')
+    assert "Last-Modified" in response.headers
+
+    with django_assert_num_queries(0):
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    since = client.get(url, HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"])
+    assert since.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.discount_percent = 10
+        product.save()
+
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert int(changed.headers["X-Catalog-Version"]) > version
+
+
+@pytest.mark.django_db
+def test_catalog_snapshot_has_fixed_query_count(
+    client: Client,
+    locmem_cache,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    for name in ("Выпечка", "Напитки", "Салаты"):
+        category = Category.objects.create(name=name)
+        for i in range(5):
+            Product.objects.create(
+                category=category,
+                name=f"{name} {i}",
+                price=Decimal("10.00"),
+            )
+
+    with django_assert_num_queries(3):
+        snapshot = client.get("/catalog/").json()
+    assert [c["name"] for c in snapshot["categories"]] == ["Выпечка", "Напитки", "Салаты"]
+    assert all(len(c["products"]) == 5 for c in snapshot["categories"])
+
+    with django_assert_num_queries(1):
+        probe = client.get("/catalog/version/")
+    assert probe.json()["version"] == snapshot["version"]
+
+    with django_assert_num_queries(0):
+        assert client.get("/catalog/").json() == snapshot
+
+    product = Product.objects.first()
+    with django_capture_on_commit_callbacks(execute=True):
+        product.discount_percent = 20
+        product.save()
+
+    updated = client.get("/catalog/").json()
+    assert updated["version"] > snapshot["version"]
+    assert client.get("/catalog/version/").json()["version"] == updated["version"]
+    first = updated["categories"][0]["products"][0]
+    assert first["final_price"] == 8.0
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.management import call_command
+
+from api.user.models import Customer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from django.test import Client
+
+BOT_TOKEN = "bot-secret"  # noqa: S105
+
+
+@pytest.fixture
+def bot_client(client: Client, settings) -> Client:
+    settings.BOT_API_TOKEN = BOT_TOKEN
+    client.defaults["HTTP_X_BOT_TOKEN"] = BOT_TOKEN
+    return client
+
+
+@pytest.mark.django_db
+def test_customers_require_bot_token_or_staff(
+    client: Client,
+    admin_user,
+    settings,
+) -> None:
+    Customer.objects.create(telegram_id=1, phone="+998901112233", language="uz")
+    row = {"telegram_id": 1, "phone": "+15550000000", "language": "en"}
+
+    assert client.get("/customers/", {"ids": "1"}).status_code == 403
+    assert client.get("/customers/1/").status_code == 403
+    response = client.post("/customers/bulk/", row, content_type="application/json")
+    assert response.status_code == 403
+
+    # Пустой BOT_API_TOKEN в настройках не пускает даже запрос без заголовка
+    settings.BOT_API_TOKEN = ""
+    assert client.get("/customers/1/", HTTP_X_BOT_TOKEN="").status_code == 403
+    settings.BOT_API_TOKEN = BOT_TOKEN
+    response = client.get("/customers/1/", HTTP_X_BOT_TOKEN="wrong")  # noqa: S106
+    assert response.status_code == 403
+    assert Customer.objects.get().phone == "+998901112233"
+
+    assert client.get("/customers/1/", HTTP_X_BOT_TOKEN=BOT_TOKEN).status_code == 200
+    settings.AXES_ENABLED = False
+    client.force_login(admin_user)
+    assert client.get("/customers/1/").status_code == 200
+
+
+@pytest.mark.django_db
+def test_upsert_and_read_customers(bot_client: Client) -> None:
+    client = bot_client
+    response = client.post(
+        "/customers/bulk/",
+        [
+            {"telegram_id": 1, "phone": "+998901112233", "language": "uz"},
+            {"telegram_id": 2, "phone": "+15550000000", "language": "en"},
+        ],
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert response.json() == {"upserted": 2}
+
+    response = client.post(
+        "/customers/bulk/",
+        {"telegram_id": 1, "phone": "+998900000000", "language": "ru"},
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert Customer.objects.count() == 2
+
+    response = client.get("/customers/", {"ids": "1,2,3"})
+    assert response.status_code == 200
+    rows = {row["telegram_id"]: row for row in response.json()}
+    assert rows.keys() == {1, 2}
+    assert rows[1]["phone"] == "+998900000000"
+    assert rows[1]["language"] == "ru"
+
+    assert client.get("/customers/2/").json()["language"] == "en"
+    assert client.get("/customers/3/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_get_customers_requires_ids(bot_client: Client) -> None:
+    client = bot_client
+    assert client.get("/customers/").status_code == 400
+    assert client.get("/customers/", {"ids": "a,b"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_import_customers_command(tmp_path: Path) -> None:
+    Customer.objects.create(telegram_id=7, phone="old", language="ru")
+    path = tmp_path / "phone_numbers.json"
+    path.write_text(
+        json.dumps(
+            {
+                "7": {"phone": "+998907150999", "language": "uz"},
+                "8": "+15813037118",
+            },
+        ),
+    )
+
+    call_command("import_customers", str(path))
+
+    assert Customer.objects.get(telegram_id=7).language == "uz"
+    assert Customer.objects.get(telegram_id=8).phone == "+15813037118"
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from api.user.models import CatalogVersion, Category, Product
+from api.user.serializers import ProductSerializer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def media_storage(settings, tmp_path: Path) -> Path:
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": tmp_path.as_posix(), "base_url": "/media/"},
+        },
+    }
+    return tmp_path
+
+
+def _photo(size: tuple[int, int]) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 64).convert("RGB").save(buffer, format="PNG")
+    return SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db
+def test_variants_are_built_after_commit(
+    media_storage: Path,
+    django_capture_on_commit_callbacks,
+) -> None:
+    category = Category.objects.create(name="Выпечка")
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(
+            category=category,
+            name="Сомса",
+            price=Decimal("8.00"),
+            image=_photo((2400, 1600)),
+        )
+    version = CatalogVersion.current().version
+
+    product.refresh_from_db()
+    assert product.image_variants_source == product.image.name
+    with Image.open(product.image_telegram.path) as telegram:
+        assert telegram.format == "JPEG"
+        assert telegram.size == (1280, 853)
+    with Image.open(product.image_thumbnail.path) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert max(thumbnail.size) == 320
+    assert product.image_thumbnail.size < product.image_telegram.size < product.image.size
+
+    data = ProductSerializer(product).data
+    assert data["image_telegram"].endswith("_tg.jpg")
+    assert data["image_thumbnail"].endswith("_thumb.webp")
+
+    # Сохранение без смены фото не перезапускает обработку
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        product.name = "Сомса с тыквой"
+        product.save()
+    assert CatalogVersion.current().version == version + 1
+    product.refresh_from_db()
+    assert product.image_variants_source == product.image.name
+    assert len(callbacks) == 1  # только инвалидация кэша каталога
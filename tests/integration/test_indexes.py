@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.user.models import Order
+
+
+@pytest.mark.django_db
+def test_hot_paths_use_their_indexes() -> None:
+    out = StringIO()
+    call_command("explain_hot_paths", orders=3000, batch_size=1000, stdout=out)
+
+    output = out.getvalue()
+    assert "[MISS]" not in output
+    assert "order_new_created_idx" in output
+    assert "order_phone_created_idx" in output
+    assert "admin search by part of phone" in output
+    assert "All hot paths use their indexes" in output
+    # Сгенерированные заказы откатываются
+    assert not Order.objects.exists()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from api.user.models import Category, Order, OrderItem, Product
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+def create_orders(count: int, items_per_order: int = 3) -> None:
+    category = Category.objects.create(name="Напитки")
+    products = [
+        Product.objects.create(
+            category=category,
+            name=f"Товар {i}",
+            price=Decimal("10.00"),
+        )
+        for i in range(items_per_order)
+    ]
+    for n in range(count):
+        order = Order.objects.create(total=Decimal("30.00"), phone=f"+99890000{n:04d}")
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=product, quantity=1, price=product.price)
+            for product in products
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("orders", [2, 20])
+def test_new_orders_query_count_is_constant(
+    client: Client,
+    django_assert_num_queries,
+    orders: int,
+) -> None:
+    create_orders(orders)
+
+    # Заказы, их позиции и товары — сколько бы заказов ни накопилось
+    with django_assert_num_queries(2):
+        response = client.get("/order/new/", {"limit": 50})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["results"]) == orders
+    assert body["results"][0]["items"][0]["product"].startswith("Товар")
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.django_db
+def test_new_orders_without_pagination_params_is_a_plain_list(
+    client: Client,
+    django_assert_num_queries,
+) -> None:
+    create_orders(60, items_per_order=1)
+
+    # Старые клиенты не передают limit/cursor и ждут все новые заказы списком
+    with django_assert_num_queries(2):
+        body = client.get("/order/new/").json()
+
+    assert isinstance(body, list)
+    assert len(body) == 60
+    assert body[0]["items"][0]["product"] == "Товар 0"
+
+
+@pytest.mark.django_db
+def test_new_orders_keyset_pagination(client: Client) -> None:
+    create_orders(5, items_per_order=1)
+    Order.objects.filter(phone="+998900000002").update(is_new=False)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/order/new/", params).json()
+        seen += [order["order_id"] for order in body["results"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = list(
+        Order.objects.filter(is_new=True)
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True),
+    )
+    assert seen == expected
+    assert len(seen) == 4
+    assert client.get("/order/new/", {"cursor": "garbage"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_admin_finds_orders_by_part_of_phone(
+    client: Client,
+    admin_user,
+    settings,
+) -> None:
+    settings.AXES_ENABLED = False
+    client.force_login(admin_user)
+    create_orders(3, items_per_order=1)
+    order = Order.objects.get(phone="+998900000001")
+
+    response = client.get("/admin/user/order/", {"q": "0000001"})
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == [order]
+
+    # Точный телефон — отдельным параметром списка
+    response = client.get("/admin/user/order/", {"phone": "+998900000002"})
+    assert response.status_code == 200
+    assert [o.phone for o in response.context["cl"].result_list] == ["+998900000002"]
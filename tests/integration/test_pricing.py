@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.user import pricing
+from api.user.models import (
+    CatalogVersion,
+    Category,
+    PriceCampaign,
+    Product,
+    normalize_search_text,
+)
+from api.user.pricing import (
+    apply_campaign,
+    finish_campaign,
+    run_due_campaigns,
+    start_campaign,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.test import Client
+
+PRODUCTS = 60
+
+
+@pytest.fixture
+def menu() -> tuple[Category, Category]:
+    pizza, drinks = Category.objects.bulk_create(
+        [Category(name="Пицца"), Category(name="Напитки")],
+    )
+    Product.objects.bulk_create(
+        Product(
+            category=pizza,
+            name=f"Пицца {i}",
+            search_name=normalize_search_text(f"Пицца {i}"),
+            price=Decimal("100.00"),
+        )
+        for i in range(PRODUCTS)
+    )
+    Product.objects.create(category=drinks, name="Чай", price=Decimal("10.00"))
+    return pizza, drinks
+
+
+@pytest.fixture
+def invalidations(monkeypatch) -> list[set[int]]:
+    calls: list[set[int]] = []
+    monkeypatch.setattr(pricing, "invalidate_products", calls.append)
+    return calls
+
+
+@pytest.mark.django_db
+def test_command_reprices_in_batches_and_invalidates_once(
+    menu,
+    invalidations,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    pizza, drinks = menu
+    version = CatalogVersion.current().version
+
+    # Число запросов зависит от количества пачек, не товаров
+    with django_assert_max_num_queries(20), django_capture_on_commit_callbacks(
+        execute=True,
+    ):
+        call_command(
+            "reprice",
+            percent="-12.5",
+            category=pizza.id,
+            batch_size=25,
+            stdout=StringIO(),
+        )
+
+    assert set(pizza.products.values_list("price", flat=True)) == {Decimal("87.50")}
+    assert drinks.products.get().price == Decimal("10.00")
+    assert invalidations == [{pizza.id}]
+    assert CatalogVersion.current().version == version + 1
+
+
+@pytest.mark.django_db
+def test_campaign_reads_products_one_batch_at_a_time(menu, invalidations) -> None:
+    pizza, _drinks = menu
+    campaign = PriceCampaign(
+        name="Пицца",
+        kind=PriceCampaign.Kind.DISCOUNT,
+        value=10,
+        category=pizza,
+    )
+
+    def batch_reads(table: str, run: Callable[[], int]) -> list[str]:
+        with CaptureQueriesContext(connection) as queries:
+            assert run() == PRODUCTS
+        return [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(f'SELECT "{table}".')
+        ]
+
+    # Весь каталог в памяти не держим: каждая пачка читается отдельным запросом под LIMIT
+    reads = batch_reads("user_product", lambda: start_campaign(campaign, batch_size=25))
+    assert len(reads) == 3
+    assert all("LIMIT 25" in sql for sql in reads)
+    assert pizza.products.filter(discount_percent=10).count() == PRODUCTS
+
+    reads = batch_reads(
+        "user_pricecampaignitem",
+        lambda: finish_campaign(campaign, batch_size=25),
+    )
+    assert len(reads) == 3
+    assert all("LIMIT 25" in sql for sql in reads)
+    assert not pizza.products.filter(discount_percent=10).exists()
+
+
+@pytest.mark.django_db
+def test_command_requires_a_filter_and_keeps_prices_positive(menu) -> None:
+    with pytest.raises(CommandError, match="--all"):
+        call_command("reprice", discount=10, stdout=StringIO())
+    with pytest.raises(CommandError, match="нулевой"):
+        call_command("reprice", amount="-10", name="чай", stdout=StringIO())
+    assert not PriceCampaign.objects.exists()
+
+
+@pytest.mark.django_db
+def test_campaign_without_filter_needs_all_products(menu, invalidations) -> None:
+    pizza, _drinks = menu
+    campaign = PriceCampaign(
+        name="Все",
+        kind=PriceCampaign.Kind.DISCOUNT,
+        value=Decimal(5),
+        category=pizza,
+    )
+    campaign.full_clean()
+    start_campaign(campaign, batch_size=1000)
+
+    # Категорию удалили — кампания не расширяется до всего меню
+    pizza.delete()
+    assert not PriceCampaign.objects.exists()
+
+    campaign = PriceCampaign(name="Все", kind=PriceCampaign.Kind.DISCOUNT, value=5)
+    with pytest.raises(ValidationError, match="all_products"):
+        campaign.full_clean()
+    assert not campaign.products().exists()
+    campaign.all_products = True
+    campaign.full_clean()
+    assert campaign.products().count() == 1
+
+
+@pytest.mark.django_db
+def test_overlapping_campaign_is_rejected(menu, invalidations) -> None:
+    pizza, drinks = menu
+    start_campaign(
+        PriceCampaign(
+            name="Пицца",
+            kind=PriceCampaign.Kind.DISCOUNT,
+            value=10,
+            category=pizza,
+        ),
+    )
+    overlapping = PriceCampaign(
+        name="Вторая",
+        kind=PriceCampaign.Kind.DISCOUNT,
+        value=20,
+        name_pattern="пицца 1",
+        starts_at=timezone.now() + timedelta(hours=1),
+    )
+    with pytest.raises(ValidationError, match="Пицца"):
+        overlapping.full_clean()
+
+    # Планировщик тоже не применит её, пока первая действует
+    overlapping.save()
+    with pytest.raises(ValueError, match="active campaigns"):
+        apply_campaign(overlapping)
+    assert not pizza.products.filter(discount_percent=20).exists()
+
+    other = PriceCampaign(
+        name="Чай",
+        kind=PriceCampaign.Kind.DISCOUNT,
+        value=20,
+        category=drinks,
+    )
+    other.full_clean()
+    assert start_campaign(other) == 1
+
+
+@pytest.mark.django_db
+def test_scheduled_campaign_applies_and_rolls_back(
+    menu,
+    invalidations,
+    django_capture_on_commit_callbacks,
+) -> None:
+    pizza, _drinks = menu
+    start = timezone.now() + timedelta(hours=1)
+    campaign = PriceCampaign(
+        name="Счастливый час",
+        kind=PriceCampaign.Kind.DISCOUNT,
+        value=Decimal(30),
+        name_pattern="ПИЦЦА",
+        starts_at=start,
+        ends_at=start + timedelta(hours=2),
+    )
+    assert start_campaign(campaign) is None
+    assert run_due_campaigns(start - timedelta(minutes=1)) == (0, 0)
+    assert not pizza.products.filter(discount_percent=30).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert run_due_campaigns(start) == (1, 0)
+    assert pizza.products.filter(discount_percent=30).count() == PRODUCTS
+
+    # Цену, изменённую вручную во время кампании, окончание не трогает
+    edited = pizza.products.first()
+    edited.discount_percent = 50
+    edited.save()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert run_due_campaigns(start + timedelta(hours=2)) == (0, 1)
+    assert pizza.products.filter(discount_percent=0).count() == PRODUCTS - 1
+    assert Product.objects.get(pk=edited.pk).discount_percent == 50
+    campaign.refresh_from_db()
+    assert campaign.status == PriceCampaign.Status.FINISHED
+    assert invalidations == [{pizza.id}, {pizza.id}]
+
+
+@pytest.mark.django_db
+def test_admin_action_reprices_selected_products(
+    client: Client,
+    admin_user,
+    menu,
+    settings,
+) -> None:
+    # Вход в админку тут не проверяем — axes не нужен
+    settings.AXES_ENABLED = False
+    client.force_login(admin_user)
+    pizza, _drinks = menu
+    selected = list(pizza.products.values_list("id", flat=True)[:3])
+
+    response = client.post(
+        "/admin/user/product/",
+        {
+            "action": "reprice",
+            "_selected_action": selected,
+            "kind": PriceCampaign.Kind.AMOUNT,
+            "value": "15.50",
+        },
+    )
+
+    assert response.status_code == 302
+    assert set(
+        Product.objects.filter(id__in=selected).values_list("price", flat=True),
+    ) == {Decimal("115.50")}
+    assert Product.objects.filter(price=Decimal("100.00")).count() == PRODUCTS - 3
+    campaign = PriceCampaign.objects.get()
+    assert campaign.status == PriceCampaign.Status.ACTIVE
+    assert campaign.items.count() == 3
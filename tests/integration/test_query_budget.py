@@ -0,0 +1,183 @@
+"""Query and response-time budgets for every API view.
+
+Each test seeds a realistic amount of data, makes one request and checks
+the exact number of queries and a generous time ceiling. The measured time
+is recorded as a test property: it is listed in the terminal summary and
+lands in `--junitxml` reports for comparison between releases.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import TYPE_CHECKING, NamedTuple
+
+import pytest
+
+from api.user.models import Cart, CartItem, Category, Order, OrderItem, Product
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from contextlib import AbstractContextManager
+
+    from django.test import Client
+
+PHONE = "+998901234567"
+CATEGORIES = 20
+PRODUCTS_PER_CATEGORY = 25
+CART_LINES = 30
+NEW_ORDERS = 200
+ITEMS_PER_ORDER = 3
+
+
+class Budget(NamedTuple):
+    queries: int
+    seconds: float
+
+
+# Cache is a DummyCache in tests, so catalog views are measured on a cold cache
+BUDGETS = {
+    "get_categories": Budget(queries=2, seconds=0.5),
+    "get_products_by_category": Budget(queries=3, seconds=0.5),
+    "add_to_cart": Budget(queries=2, seconds=0.5),
+    "get_cart": Budget(queries=2, seconds=0.5),
+    "make_order": Budget(queries=9, seconds=1.0),
+    "get_new_orders": Budget(queries=2, seconds=0.5),
+}
+
+
+@pytest.fixture
+def catalog() -> list[Product]:
+    categories = Category.objects.bulk_create(
+        Category(name=f"Категория {i}") for i in range(CATEGORIES)
+    )
+    return Product.objects.bulk_create(
+        Product(
+            category=category,
+            name=f"{category.name} / товар {i}",
+            price=Decimal("12.35"),
+            discount_percent=10 if i % 3 == 0 else 0,
+        )
+        for category in categories
+        for i in range(PRODUCTS_PER_CATEGORY)
+    )
+
+
+@pytest.fixture
+def cart(catalog: list[Product]) -> Cart:
+    cart = Cart.objects.create(phone=PHONE)
+    CartItem.objects.bulk_create(
+        CartItem(cart=cart, product=product, quantity=2)
+        for product in catalog[:CART_LINES]
+    )
+    return cart
+
+
+@pytest.fixture
+def new_orders(catalog: list[Product]) -> list[Order]:
+    orders = Order.objects.bulk_create(
+        Order(phone=f"+99890{i:07d}", total=Decimal("37.05")) for i in range(NEW_ORDERS)
+    )
+    OrderItem.objects.bulk_create(
+        OrderItem(
+            order=order,
+            product=catalog[(n * ITEMS_PER_ORDER + i) % len(catalog)],
+            quantity=1,
+            price=Decimal("12.35"),
+        )
+        for n, order in enumerate(orders)
+        for i in range(ITEMS_PER_ORDER)
+    )
+    return orders
+
+
+@pytest.fixture
+def within_budget(
+    django_assert_num_queries,
+    record_property: Callable[[str, object], None],
+) -> Callable[[str], AbstractContextManager[None]]:
+    @contextmanager
+    def check(endpoint: str) -> Iterator[None]:
+        budget = BUDGETS[endpoint]
+        with django_assert_num_queries(budget.queries):
+            started = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - started
+
+        record_property("endpoint", endpoint)
+        record_property("queries", budget.queries)
+        record_property("duration_ms", round(elapsed * 1000, 2))
+        assert (
+            elapsed < budget.seconds
+        ), f"{endpoint} took {elapsed * 1000:.1f} ms, budget {budget.seconds * 1000:.0f} ms"
+
+    return check
+
+
+@pytest.mark.django_db
+def test_get_categories_budget(client: Client, catalog, within_budget) -> None:
+    with within_budget("get_categories"):
+        response = client.get("/categories/")
+    assert len(response.json()) == CATEGORIES
+
+
+@pytest.mark.django_db
+def test_get_products_by_category_budget(
+    client: Client,
+    catalog: list[Product],
+    within_budget,
+) -> None:
+    with within_budget("get_products_by_category"):
+        response = client.get(f"/products/{catalog[0].category_id}/")
+    assert len(response.json()) == PRODUCTS_PER_CATEGORY
+
+
+@pytest.mark.django_db
+def test_add_to_cart_budget(
+    client: Client,
+    cart: Cart,
+    catalog: list[Product],
+    within_budget,
+) -> None:
+    with within_budget("add_to_cart"):
+        response = client.post(
+            "/cart/add/",
+            {"phone": PHONE, "product_id": catalog[0].id, "quantity": 1},
+            content_type="application/json",
+        )
+    assert response.status_code == 200
+    assert cart.items.get(product=catalog[0]).quantity == 3
+
+
+@pytest.mark.django_db
+def test_get_cart_budget(client: Client, cart: Cart, within_budget) -> None:
+    with within_budget("get_cart"):
+        response = client.get(f"/cart/{PHONE}/")
+    assert len(response.json()["items"]) == CART_LINES
+
+
+@pytest.mark.django_db
+def test_make_order_budget(client: Client, cart: Cart, within_budget) -> None:
+    with within_budget("make_order"):
+        response = client.post(
+            "/order/",
+            {"phone": PHONE},
+            content_type="application/json",
+            HTTP_IDEMPOTENCY_KEY="budget:1",
+        )
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == CART_LINES
+
+
+@pytest.mark.django_db
+def test_get_new_orders_budget(client: Client, new_orders, within_budget) -> None:
+    with within_budget("get_new_orders"):
+        first = client.get("/order/new/", {"limit": 50}).json()
+    assert len(first["results"]) == 50
+
+    # Следующая страница стоит столько же
+    with within_budget("get_new_orders"):
+        second = client.get("/order/new/", {"cursor": first["next_cursor"]}).json()
+    assert len(second["results"]) == 50
+    assert second["results"][0]["order_id"] < first["results"][-1]["order_id"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.user.models import Category, Product
+from api.user.rendering import dumps
+from api.user.serializers import ProductSerializer
+from tests.load.render_bench import run_benchmark
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+def test_dumps_matches_drf_json() -> None:
+    data = {
+        "total": Decimal("37.05"),
+        "updated_at": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "name": "Сомса",
+        "items": [1, 2.5, None, True],
+    }
+    assert dumps(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+def test_products_match_serializer_output(client: Client) -> None:
+    category = Category.objects.create(name="Выпечка")
+    Product.objects.create(
+        category=category,
+        name="Сомса",
+        price=Decimal("12.35"),
+        discount_percent=15,
+        image="product_images/somsa 1.jpg",
+        image_thumbnail="product_images/variants/somsa_thumb.jpg",
+    )
+    Product.objects.create(category=category, name="Чай", price=Decimal("3.00"))
+
+    response = client.get(f"/products/{category.id}/")
+
+    expected = ProductSerializer(
+        category.products.all(),
+        many=True,
+        context={"request": response.wsgi_request},
+    ).data
+    assert response.content == JSONRenderer().render(expected)
+    assert response.json()[0]["image"] == (
+        "http://testserver/media/product_images/somsa%201.jpg"
+    )
+
+
+@pytest.mark.django_db
+def test_render_benchmark_reports_identical_output() -> None:
+    (result,) = run_benchmark([30], repeat=1)
+
+    assert result["products"] == 30
+    assert result["identical_output"]
+    assert {"serializer", "values_drf_json", "values_orjson"} <= set(result)
+    # Товары бенчмарка откатываются
+    assert not Product.objects.exists()
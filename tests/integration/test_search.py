@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from api.user.models import Category, Product
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+@pytest.fixture
+def menu() -> Category:
+    category = Category.objects.create(name="Пицца")
+    for name in ("Маргарита", "Мёдовик", "Морс клюквенный", "Пепперони", "Margherita"):
+        Product.objects.create(category=category, name=name, price=Decimal("10.00"))
+    return category
+
+
+@pytest.mark.django_db
+def test_search_matches_normalized_prefix(
+    client: Client,
+    menu: Category,
+    django_assert_num_queries,
+) -> None:
+    with django_assert_num_queries(1):
+        response = client.get("/products/search/", {"q": "  МАР"})
+    assert [p["name"] for p in response.json()] == ["Маргарита"]
+    assert response.json()[0]["category"] == menu.id
+
+    assert [p["name"] for p in client.get("/products/search/?q=медов").json()] == [
+        "Мёдовик",
+    ]
+    assert [p["name"] for p in client.get("/products/search/?q=m").json()] == []
+    assert len(client.get("/products/search/?q=мо&limit=1").json()) == 1
+    assert client.get("/products/search/?q=мо&limit=x").status_code == 400
+
+
+@pytest.mark.django_db
+def test_search_follows_renames(client: Client, menu: Category) -> None:
+    product = Product.objects.get(name="Пепперони")
+    product.name = "Пицца Пепперони"
+    product.save(update_fields=["name"])
+    assert [p["id"] for p in client.get("/products/search/?q=пицца").json()] == [
+        product.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_search_uses_search_name_index() -> None:
+    plan = (
+        Product.objects.filter(search_name__gte="мар", search_name__lt="мар\U0010ffff")
+        .order_by("search_name")
+        .explain()
+    )
+    assert "USING INDEX" in plan
+    assert "search_name" in plan
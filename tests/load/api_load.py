@@ -0,0 +1,312 @@
+"""Asyncio load generator that replays the bot's call sequence against the API.
+
+Every virtual user behaves like one bot customer: categories → products →
+cart/add (one or more) → cart/<phone> → order, then waits for `--think-time`
+and starts over. The number of virtual users follows ramp stages, and the
+report lists throughput and p50/p95/p99 per endpoint as JSON.
+
+Usage (SQLite or a local Postgres via DATABASE_URL):
+    python manage.py migrate
+    python -m tests.load.api_load seed --categories 20 --products 25
+    WORKERS=4 THREADS=4 make run.server.prod   # or: python manage.py runserver
+    python -m tests.load.api_load run http://127.0.0.1:80 \
+        --stages 10:30,50:60,50:120,0:10 --output report.json
+
+`--stages users:seconds,...` ramps linearly to `users` over `seconds`, like
+k6 stages. Without it, `--users` are started over `--ramp-up` seconds and
+held for `--duration` seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+ENDPOINTS = ("categories", "products", "cart_add", "cart", "order")
+CONTROL_INTERVAL = 0.1
+
+
+def parse_stages(value: str) -> list[tuple[int, float]]:
+    stages = []
+    for part in value.split(","):
+        users, seconds = part.split(":")
+        stages.append((int(users), float(seconds)))
+    return stages
+
+
+def target_users(stages: list[tuple[int, float]], elapsed: float) -> int | None:
+    """Сколько пользователей должно работать сейчас; None — профиль закончился."""
+    current = 0
+    for users, seconds in stages:
+        if elapsed < seconds:
+            return round(current + (users - current) * elapsed / seconds)
+        elapsed -= seconds
+        current = users
+    return None
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    # Nearest-rank: значение, не меньше которого p% выборки
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Stats:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    statuses: dict[str, dict[int, int]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(int)),
+    )
+    journeys: int = 0
+
+    def record(self, endpoint: str, seconds: float, status: int | None) -> None:
+        self.latencies[endpoint].append(seconds)
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+        if status is not None:
+            self.statuses[endpoint][status] += 1
+
+    def report(self, duration: float, peak_users: int) -> dict[str, Any]:
+        endpoints = {}
+        for endpoint in ENDPOINTS:
+            values = sorted(self.latencies.get(endpoint, ()))
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "statuses": dict(self.statuses.get(endpoint, {})),
+                "rps": round(len(values) / duration, 2) if duration else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+            }
+        requests = sum(e["requests"] for e in endpoints.values())
+        return {
+            "duration_s": round(duration, 2),
+            "peak_users": peak_users,
+            "journeys": self.journeys,
+            "requests": requests,
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "throughput_rps": round(requests / duration, 2) if duration else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class VirtualUser:
+    def __init__(  # noqa: PLR0913
+        self,
+        client: httpx.AsyncClient,
+        stats: Stats,
+        phone: str,
+        *,
+        think_time: float,
+        max_lines: int,
+        order_ratio: float,
+        rng: random.Random,
+    ) -> None:
+        self.client = client
+        self.stats = stats
+        self.phone = phone
+        self.think_time = think_time
+        self.max_lines = max_lines
+        self.order_ratio = order_ratio
+        self.rng = rng
+        self.stopping = False
+
+    async def call(self, endpoint: str, method: str, url: str, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, time.perf_counter() - started, None)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - started, response.status_code)
+        if response.status_code >= 400:
+            return None
+        return response.json()
+
+    async def run(self) -> None:
+        while not self.stopping:
+            await self.journey()
+            # Пауза «пользователя» между заказами, ±50%
+            await asyncio.sleep(self.think_time * self.rng.uniform(0.5, 1.5))
+
+    async def journey(self) -> None:
+        categories = await self.call("categories", "GET", "/categories/")
+        if not categories:
+            return
+        category = self.rng.choice(categories)
+        products = await self.call("products", "GET", f"/products/{category['id']}/")
+        if not products:
+            return
+
+        for _ in range(self.rng.randint(1, self.max_lines)):
+            product = self.rng.choice(products)
+            await self.call(
+                "cart_add",
+                "POST",
+                "/cart/add/",
+                json={
+                    "phone": self.phone,
+                    "product_id": product["id"],
+                    "quantity": self.rng.randint(1, 3),
+                },
+            )
+        await self.call("cart", "GET", f"/cart/{self.phone}/")
+
+        if self.rng.random() < self.order_ratio:
+            await self.call(
+                "order",
+                "POST",
+                "/order/",
+                json={"phone": self.phone},
+                headers={"Idempotency-Key": uuid.uuid4().hex},
+            )
+        self.stats.journeys += 1
+
+
+async def run_load(  # noqa: PLR0913
+    base_url: str,
+    stages: list[tuple[int, float]],
+    *,
+    think_time: float = 1.0,
+    max_lines: int = 3,
+    order_ratio: float = 0.3,
+    seed: int = 0,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Any]:
+    stats = Stats()
+    rng = random.Random(seed)  # noqa: S311
+    peak = max(users for users, _seconds in stages)
+    limits = httpx.Limits(max_connections=peak, max_keepalive_connections=peak)
+    users: list[tuple[VirtualUser, asyncio.Task]] = []
+    retired: list[asyncio.Task] = []
+    user_ids = itertools.count()
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=30,
+        limits=limits,
+        transport=transport,
+    ) as client:
+        started = time.perf_counter()
+        while (target := target_users(stages, time.perf_counter() - started)) is not None:
+            while len(users) < target:
+                vu = VirtualUser(
+                    client,
+                    stats,
+                    # Каждому пользователю — свой телефон, поэтому корзины не пересекаются
+                    phone=f"+99877{next(user_ids):07d}",
+                    think_time=think_time,
+                    max_lines=max_lines,
+                    order_ratio=order_ratio,
+                    rng=random.Random(rng.random()),  # noqa: S311
+                )
+                users.append((vu, asyncio.create_task(vu.run())))
+            while len(users) > target:
+                # Лишний пользователь доигрывает текущий сценарий и выходит
+                vu, task = users.pop()
+                vu.stopping = True
+                retired.append(task)
+            await asyncio.sleep(CONTROL_INTERVAL)
+
+        tasks = [*retired, *(task for _vu, task in users)]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        duration = time.perf_counter() - started
+
+    return stats.report(duration, peak)
+
+
+def seed_catalog(categories: int, products: int) -> None:
+    import os
+    from decimal import Decimal
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.config.settings")
+    django.setup()
+
+    from api.user.catalog import invalidate_catalog
+    from api.user.models import CatalogVersion, Category, Product, normalize_search_text
+
+    created = Category.objects.bulk_create(
+        Category(name=f"Load {i}") for i in range(categories)
+    )
+    Product.objects.bulk_create(
+        Product(
+            category=category,
+            name=f"{category.name} / {i}",
+            search_name=normalize_search_text(f"{category.name} / {i}"),
+            price=Decimal(10_000 + i * 500),
+            discount_percent=10 if i % 4 == 0 else 0,
+        )
+        for category in created
+        for i in range(products)
+    )
+    # bulk_create не шлёт сигналы — каталог сбрасываем сами
+    CatalogVersion.bump()
+    invalidate_catalog()
+    print(f"Seeded {categories} categories × {products} products")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Create a catalog to shop from")
+    seed.add_argument("--categories", type=int, default=20)
+    seed.add_argument("--products", type=int, default=25)
+
+    run = commands.add_parser("run", help="Run virtual users against a server")
+    run.add_argument("url")
+    run.add_argument("--users", type=int, default=20)
+    run.add_argument("--ramp-up", type=float, default=10)
+    run.add_argument("--duration", type=float, default=60)
+    run.add_argument("--stages", type=parse_stages, help="users:seconds,...")
+    run.add_argument("--think-time", type=float, default=1.0)
+    run.add_argument("--max-lines", type=int, default=3)
+    run.add_argument("--order-ratio", type=float, default=0.3)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        seed_catalog(args.categories, args.products)
+        return
+
+    stages = args.stages or [(args.users, args.ramp_up), (args.users, args.duration)]
+    report = asyncio.run(
+        run_load(
+            args.url,
+            stages,
+            think_time=args.think_time,
+            max_lines=args.max_lines,
+            order_ratio=args.order_ratio,
+            seed=args.seed,
+        ),
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,547 @@
+"""Offline benchmark for the bot handlers: fake Telegram, fake API, real Dispatcher.
+
+Synthetic `Message`/`CallbackQuery` updates for the whole customer flow
+(/start → language → contact → menu → category → product → plus → add to cart →
+cart → order) are fed into a `Dispatcher` with the real `router` and
+`router_func`. Telegram is replaced by a session that records every outgoing
+call, and the API by an in-process httpx transport. The report lists
+per-action and per-handler latency, Telegram calls per action and how long
+the event loop was blocked.
+
+Usage:
+    python -m tests.load.bot_harness --users 50 --api-latency 0.02 --output bot.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import httpx
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import SendDocument, SendMessage, SendPhoto
+from aiogram.types import (
+    CallbackQuery,
+    Chat,
+    Contact,
+    InlineKeyboardMarkup,
+    Message,
+    PhotoSize,
+    Update,
+    User,
+)
+from PIL import Image
+
+from tests.load.api_load import percentile
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+
+    from aiogram.methods import TelegramMethod
+    from aiogram.types import TelegramObject
+
+BOT_TOKEN = "42:HARNESS"  # noqa: S105
+# bot.config.bot требует токен при импорте; настоящий здесь не нужен
+os.environ.setdefault("TELEGRAM_API_TOKEN", BOT_TOKEN)
+BOT_USER = User(id=42, is_bot=True, first_name="Harness bot")
+
+# Шаг сценария, к которому относится вызов Telegram; наследуется фоновыми задачами
+current_action: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_action",
+    default="startup",
+)
+
+CATEGORIES = [{"id": 1, "name": "🍕 Пицца"}, {"id": 2, "name": "🥤 Напитки"}]
+PRODUCTS = {
+    1: [
+        {
+            "id": 10,
+            "name": "Маргарита",
+            "price": "50000.00",
+            "discount_percent": 10,
+            "final_price": 45000.0,
+            "image": "http://api.local/media/product_images/margherita.jpg",
+        },
+    ],
+    2: [
+        {
+            "id": 20,
+            "name": "Морс",
+            "price": "12000.00",
+            "discount_percent": 0,
+            "final_price": 12000.0,
+            "image": None,
+        },
+    ],
+}
+
+
+def _to_ms(seconds: list[float]) -> dict[str, float]:
+    values = sorted(seconds)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+@functools.cache
+def _product_jpeg() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1280, 853), "orange").save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class FakeApi:
+    """Минимальный API магазина в памяти: каталог, корзины, заказы, компания."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.carts: dict[str, dict[int, int]] = defaultdict(dict)
+        self.order_ids = itertools.count(1)
+        self.orders: dict[str, dict[str, Any]] = {}
+        self.requests: Counter[str] = Counter()
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(  # noqa: C901, PLR0911
+        self,
+        request: httpx.Request,
+    ) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        path = request.url.path
+        self.requests[re.sub(r"/\d[^/]*/", "/<id>/", path)] += 1
+
+        if path == "/categories/":
+            return httpx.Response(200, json=CATEGORIES)
+        if match := re.fullmatch(r"/products/(\d+)/", path):
+            return httpx.Response(200, json=PRODUCTS.get(int(match[1]), []))
+        if path.startswith("/media/"):
+            return httpx.Response(200, content=_product_jpeg())
+        if path == "/cart/add/":
+            body = json.loads(request.content)
+            cart = self.carts[body["phone"]]
+            cart[body["product_id"]] = cart.get(body["product_id"], 0) + body["quantity"]
+            return httpx.Response(200, json={"message": "Товар добавлен в корзину"})
+        if match := re.fullmatch(r"/cart/([^/]+)/", path):
+            return httpx.Response(200, json=self._cart(match[1]))
+        if path == "/order/":
+            key = request.headers.get("Idempotency-Key")
+            if key in self.orders:
+                return httpx.Response(200, json={**self.orders[key], "replayed": True})
+            phone = json.loads(request.content)["phone"]
+            cart = self._cart(phone)
+            self.carts.pop(phone, None)
+            order = {
+                "order_id": next(self.order_ids),
+                "total": cart["total_price"],
+                "phone": phone,
+                "items": cart["items"],
+                "replayed": False,
+            }
+            if key:
+                self.orders[key] = order
+            return httpx.Response(200, json=order)
+        if re.fullmatch(r"/company/\d+/", path):
+            return httpx.Response(
+                200,
+                json={
+                    "name": "Aira Market",
+                    "phone": "90 123 45 67",
+                    "subscription_expires_at": "2999-01-01T00:00:00",
+                },
+            )
+        return httpx.Response(404, json={"error": "not found"})
+
+    def _cart(self, phone: str) -> dict[str, Any]:
+        products = {p["id"]: p for rows in PRODUCTS.values() for p in rows}
+        items = [
+            {
+                "name": products[product_id]["name"],
+                "quantity": quantity,
+                "price": products[product_id]["price"],
+                "discount_percent": products[product_id]["discount_percent"],
+            }
+            for product_id, quantity in self.carts.get(phone, {}).items()
+        ]
+        total = sum(
+            products[pid]["final_price"] * qty
+            for pid, qty in self.carts.get(phone, {}).items()
+        )
+        return {"items": items, "total_price": total}
+
+
+@dataclass
+class SentCall:
+    action: str
+    method: str
+    chat_id: int | None
+
+
+class RecordingSession(BaseSession):
+    """Сессия вместо Telegram: запоминает вызовы и отвечает правдоподобными объектами."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[SentCall] = []
+        self.inline_messages: dict[int, Message] = {}
+        self._message_ids = itertools.count(1000)
+        self._file_ids = itertools.count(1)
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[Any],
+        timeout: int | None = None,  # noqa: ARG002
+    ) -> Any:
+        chat_id = getattr(method, "chat_id", None)
+        self.calls.append(SentCall(current_action.get(), type(method).__name__, chat_id))
+        if not isinstance(method, (SendMessage, SendPhoto, SendDocument)):
+            return True
+
+        photo = None
+        if isinstance(method, SendPhoto):
+            file_id = (
+                method.photo
+                if isinstance(method.photo, str)
+                else f"photo-{next(self._file_ids)}"
+            )
+            photo = [
+                PhotoSize(
+                    file_id=file_id,
+                    file_unique_id=file_id,
+                    width=1280,
+                    height=853,
+                ),
+            ]
+        message = Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(timezone.utc),
+            chat=Chat(id=chat_id, type="private"),
+            from_user=BOT_USER,
+            text=getattr(method, "text", None),
+            caption=getattr(method, "caption", None),
+            photo=photo,
+            reply_markup=(
+                method.reply_markup
+                if isinstance(method.reply_markup, InlineKeyboardMarkup)
+                else None
+            ),
+        ).as_(bot)
+        if message.reply_markup is not None:
+            # Кнопки последнего такого сообщения «нажимает» следующий шаг сценария
+            self.inline_messages[chat_id] = message
+        return message
+
+    async def stream_content(
+        self,
+        *_args: Any,
+        **_kwargs: Any,
+    ) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError
+        yield b""  # pragma: no cover
+
+    async def close(self) -> None:
+        pass
+
+
+class HandlerTimer(BaseMiddleware):
+    def __init__(self) -> None:
+        self.timings: dict[str, list[float]] = defaultdict(list)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            name = data["handler"].callback.__name__
+            self.timings[name].append(time.perf_counter() - started)
+
+
+class LoopLagMonitor:
+    """Меряет, насколько позже просыпается `sleep(interval)`: это и есть блокировка цикла."""
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.01) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self.blocked = 0.0
+        self.stalls = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - expected
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.stalls += 1
+                self.blocked += lag
+
+    def report(self) -> dict[str, float]:
+        return {
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "blocked_ms": round(self.blocked * 1000, 2),
+            "stalls": self.stalls,
+            "threshold_ms": self.threshold * 1000,
+        }
+
+
+@functools.cache
+def build_dispatcher() -> tuple[Dispatcher, HandlerTimer]:
+    # Роутер подключается только к одному диспетчеру — поэтому собираем диспетчер один раз
+    from bot.bot_func import router_func
+    from bot.handlers import router
+
+    dispatcher = Dispatcher(storage=MemoryStorage())
+    dispatcher.include_router(router)
+    dispatcher.include_router(router_func)
+    timer = HandlerTimer()
+    dispatcher.message.middleware(timer)
+    dispatcher.callback_query.middleware(timer)
+    return dispatcher, timer
+
+
+@dataclass
+class FlowStep:
+    action: str
+    text: str | None = None
+    contact: bool = False
+    callback: str | None = None
+
+
+FLOW = [
+    FlowStep("start", text="/start"),
+    FlowStep("language", text="🇷🇺 Русский"),
+    FlowStep("contact", contact=True),
+    FlowStep("menu", text="🍽 Меню"),
+    FlowStep("category", text=CATEGORIES[0]["name"]),
+    FlowStep("product", text=PRODUCTS[1][0]["name"]),
+    FlowStep("increase", callback="increase"),
+    FlowStep("add_to_cart", callback="addtocart"),
+    FlowStep("cart", text="🧺 Моя корзина"),
+    FlowStep("order", callback="make_order"),
+    # Повторное нажатие той же кнопки: заказ не дублируется, чек не приходит снова
+    FlowStep("order_again", callback="make_order"),
+]
+
+
+@dataclass
+class Report:
+    action_latency: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list),
+    )
+    unhandled: Counter[str] = field(default_factory=Counter)
+
+
+class BotHarness:
+    def __init__(self, users: int = 10, api_latency: float = 0.0) -> None:
+        self.users = users
+        self.api = FakeApi(api_latency)
+        self.session = RecordingSession()
+        self.bot = Bot(BOT_TOKEN, session=self.session)
+        self.dispatcher, self.timer = build_dispatcher()
+        # Диспетчер общий на процесс — замеры прошлого прогона не нужны
+        self.timer.timings.clear()
+        self.update_ids = itertools.count(1)
+        self.report = Report()
+
+    def make_update(self, user_id: int, step: FlowStep) -> Update:
+        user = User(id=user_id, is_bot=False, first_name=f"User {user_id}")
+        chat = Chat(id=user_id, type="private")
+        update_id = next(self.update_ids)
+        if step.callback:
+            return Update(
+                update_id=update_id,
+                callback_query=CallbackQuery(
+                    id=str(update_id),
+                    from_user=user,
+                    chat_instance=str(user_id),
+                    data=step.callback,
+                    message=self.session.inline_messages[user_id],
+                ),
+            )
+        return Update(
+            update_id=update_id,
+            message=Message(
+                message_id=update_id,
+                date=datetime.now(timezone.utc),
+                chat=chat,
+                from_user=user,
+                text=step.text,
+                contact=(
+                    Contact(
+                        phone_number=f"+99890{user_id:07d}",
+                        first_name=user.first_name,
+                        user_id=user_id,
+                    )
+                    if step.contact
+                    else None
+                ),
+            ),
+        )
+
+    async def run_user(self, user_id: int) -> None:
+        from bot.cards import card_editor
+
+        for step in FLOW:
+            update = self.make_update(user_id, step)
+            current_action.set(step.action)
+            started = time.perf_counter()
+            result = await self.dispatcher.feed_update(self.bot, update)
+            self.report.action_latency[step.action].append(time.perf_counter() - started)
+            # Отложенная правка карточки — не в задержке, но в вызовах этого шага
+            await asyncio.gather(
+                *(
+                    task
+                    for (
+                        chat_id,
+                        _message_id,
+                    ), task in card_editor._tasks.items()
+                    if chat_id == user_id
+                ),
+            )
+            if result is UNHANDLED:
+                self.report.unhandled[step.action] += 1
+
+    async def run(self) -> dict[str, Any]:
+        from bot import bot_func, utils
+        from bot.api_client import close_api_client, open_api_client
+        from bot.catalog import CatalogCache
+        from bot.config.bot import API_URL, RECEIPT_FONT_PATH
+        from bot.notifications import AdminNotifier
+        from bot.photos import PhotoCache
+        from bot.receipts import ReceiptRenderer
+        from bot.storage import ProfileStore
+
+        monitor = LoopLagMonitor()
+        with tempfile.TemporaryDirectory() as tmp, ExitStack() as patches:
+            notifier = AdminNotifier(workers=2, global_rate=1000, chat_rate=1000)
+            renderer = ReceiptRenderer(
+                RECEIPT_FONT_PATH,
+                bot_func.LOGO,
+                workers=1,
+                use_processes=False,
+            )
+            # Синглтоны бота, которые держат файлы и фоновые задачи, — отдельные на время прогона
+            for module, name, value in (
+                (utils, "profile_store", ProfileStore(str(Path(tmp) / "profiles.json"))),
+                (bot_func, "photo_cache", PhotoCache(str(Path(tmp) / "photos.json"))),
+                (bot_func, "catalog_cache", CatalogCache(API_URL)),
+                (bot_func, "admin_notifier", notifier),
+                (bot_func, "receipt_renderer", renderer),
+            ):
+                patches.enter_context(mock.patch.object(module, name, value))
+
+            await open_api_client(transport=self.api.transport())
+            monitor.start()
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(
+                    *(self.run_user(1_000_000 + i) for i in range(self.users)),
+                )
+                elapsed = time.perf_counter() - started
+                # Чек админам уходит в фоне — дожидаемся отправки до конца замера
+                await notifier.close()
+            finally:
+                await monitor.stop()
+                renderer.close()
+                await bot_func.catalog_cache.close()
+                await utils.profile_store.aflush()
+                await close_api_client()
+
+        return self.build_report(elapsed, monitor)
+
+    def build_report(self, elapsed: float, monitor: LoopLagMonitor) -> dict[str, Any]:
+        user_chats = {1_000_000 + i for i in range(self.users)}
+        per_action: dict[str, Counter[str]] = defaultdict(Counter)
+        background: Counter[str] = Counter()
+        for call in self.session.calls:
+            # Чаты админов — фоновая рассылка чеков, остальное — ответы пользователю
+            if call.chat_id is not None and call.chat_id not in user_chats:
+                background[call.method] += 1
+            else:
+                per_action[call.action][call.method] += 1
+
+        actions = {}
+        for step in FLOW:
+            methods = per_action[step.action]
+            actions[step.action] = {
+                **_to_ms(self.report.action_latency[step.action]),
+                "telegram_calls_per_user": round(sum(methods.values()) / self.users, 2),
+                "telegram_methods": dict(methods),
+                "unhandled": self.report.unhandled[step.action],
+            }
+        return {
+            "users": self.users,
+            "duration_s": round(elapsed, 3),
+            "actions_per_s": round(self.users * len(FLOW) / elapsed, 1),
+            "actions": actions,
+            "handlers": {
+                name: _to_ms(v) for name, v in sorted(self.timer.timings.items())
+            },
+            "background_telegram_calls": dict(background),
+            "api_requests": dict(self.api.requests),
+            "event_loop": monitor.report(),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument(
+        "--api-latency",
+        type=float,
+        default=0.0,
+        help="Seconds per API call",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    harness = BotHarness(users=args.users, api_latency=args.api_latency)
+    report = json.dumps(asyncio.run(harness.run()), indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Fake Telegram update poster for the bot webhook.
+
+Posts synthetic `message` updates the way Telegram does (JSON body plus the
+secret token header) and reports acknowledgement latency.
+
+Usage:
+    RUNNING_MODE=WEBHOOK WEBHOOK_URL=https://example.com python -m bot
+    python -m tests.load.fake_updates http://127.0.0.1:8080/webhook \
+        --secret "$WEBHOOK_SECRET" --updates 500 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import httpx
+
+from bot.webhook import SECRET_HEADER
+
+_update_ids = itertools.count(1)
+
+
+def make_message_update(user_id: int, text: str) -> dict:
+    update_id = next(_update_ids)
+    user = {"id": user_id, "is_bot": False, "first_name": f"User {user_id}"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private", "first_name": user["first_name"]},
+            "from": user,
+            "text": text,
+        },
+    }
+
+
+async def post_updates(
+    url: str,
+    secret: str,
+    updates: list[dict],
+    concurrency: int = 10,
+    client: httpx.AsyncClient | None = None,
+) -> list[tuple[int, float]]:
+    """Отправить апдейты и вернуть `(статус, секунды до ответа)` для каждого."""
+    semaphore = asyncio.Semaphore(concurrency)
+    own_client = client is None
+    client = client or httpx.AsyncClient(timeout=10)
+
+    async def post(update: dict) -> tuple[int, float]:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                url,
+                json=update,
+                headers={SECRET_HEADER: secret},
+            )
+            return response.status_code, time.perf_counter() - started
+
+    try:
+        return await asyncio.gather(*(post(update) for update in updates))
+    finally:
+        if own_client:
+            await client.aclose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url")
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--text", default="/start")
+    args = parser.parse_args()
+
+    updates = [
+        make_message_update(1_000_000 + i % args.users, args.text)
+        for i in range(args.updates)
+    ]
+    started = time.perf_counter()
+    results = await post_updates(args.url, args.secret, updates, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _status, latency in results)
+    errors = sum(status != 200 for status, _latency in results)
+    print(f"updates:     {len(results)} ({errors} non-200)")
+    print(f"throughput:  {len(results) / elapsed:.1f} updates/s")
+    print(f"ack p50:     {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"ack p95:     {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Receipts/s benchmark for PDF receipt rendering.
+
+Compares the legacy approach (full font + PNG logo loaded for every receipt and
+written to temp files) with the prepared-assets renderer, inline and in a pool.
+
+Usage:
+    python -m tests.load.receipts_benchmark --receipts 200 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from fpdf import FPDF
+
+from bot.config.bot import RECEIPT_FONT_PATH
+from bot.receipts import (
+    Receipt,
+    ReceiptRenderer,
+    build_receipt_pdf,
+    prepare_assets,
+    strip_emojis,
+)
+
+LOGO = str(Path(__file__).resolve().parents[2] / "media" / "logo.png")
+
+RECEIPT = Receipt(
+    order_id=1024,
+    company_name="Aira Market 🛒",
+    company_phone="90 123 45 67",
+    client_phone="+998901234567",
+    created_at="17.10.2026 12:00",
+    total=187500.0,
+    items=[
+        {"name": f"Товар №{i} 🍎", "quantity": i % 5 + 1, "price": "12500.00",
+         "discount_percent": 10 if i % 3 == 0 else 0}
+        for i in range(12)
+    ],
+)  # fmt: skip
+
+
+def render_legacy(receipt: Receipt) -> bytes:
+    class PDF(FPDF):
+        def __init__(self) -> None:
+            super().__init__(format=(80, 300))
+            self.add_font("DejaVu", "", RECEIPT_FONT_PATH)
+            self.set_font("DejaVu", "", 9)
+            self.set_auto_page_break(auto=True, margin=10)
+            self.add_page()
+
+        def line_text(self, text: str, h: float = 5) -> None:
+            self.cell(0, h, text, new_x="LMARGIN", new_y="NEXT", align="C")
+
+    pdf = PDF()
+    pdf.image(LOGO, x=(80 - 40) / 2, w=40)
+    pdf.ln(3)
+    pdf.line_text(strip_emojis(receipt.company_name))
+    for item in receipt.items:
+        pdf.line_text(f"{strip_emojis(item['name'])[:25]} x{item['quantity']}")
+    pdf.line_text(f"ИТОГО: {receipt.total:.2f} сум")
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        pdf.output(path)
+        return Path(path).read_bytes()
+    finally:
+        Path(path).unlink()
+
+
+def bench_sync(name: str, render, count: int) -> None:
+    started = time.perf_counter()
+    for _ in range(count):
+        render(RECEIPT)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<24} {count / elapsed:8.1f} receipts/s")
+
+
+async def bench_pool(name: str, renderer: ReceiptRenderer, count: int) -> None:
+    await renderer.start()
+    await renderer.render(RECEIPT)  # прогрев воркеров
+    started = time.perf_counter()
+    await asyncio.gather(*(renderer.render(RECEIPT) for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    renderer.close()
+    print(f"{name:<24} {count / elapsed:8.1f} receipts/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--receipts", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    assets = prepare_assets(RECEIPT_FONT_PATH, LOGO)
+
+    bench_sync("legacy", render_legacy, max(args.receipts // 10, 5))
+    bench_sync("prepared, inline", lambda r: build_receipt_pdf(r, assets), args.receipts)
+    asyncio.run(
+        bench_pool(
+            f"prepared, {args.workers} processes",
+            ReceiptRenderer(RECEIPT_FONT_PATH, LOGO, workers=args.workers),
+            args.receipts,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Serialization throughput: ProductSerializer + JSONRenderer vs `.values()` + orjson.
+
+For each catalog size the products of one category are rendered the way
+`get_products_by_category` used to (model instances, `ProductSerializer`,
+`build_absolute_uri` per image, DRF's JSON encoder) and the way it does now
+(`product_rows` + `dumps`). A middle variant renders the same rows with DRF's
+encoder to show how much each half contributes. The products are created in
+a transaction that is rolled back, so any database will do.
+
+Usage:
+    python manage.py migrate
+    python -m tests.load.render_bench --products 1000 10000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def run_benchmark(sizes: list[int], repeat: int = 5) -> list[dict[str, Any]]:
+    from django.conf import settings
+    from django.db import transaction
+    from django.test import RequestFactory
+    from rest_framework.renderers import JSONRenderer
+
+    from api.user.catalog import request_origin
+    from api.user.models import Category, Product
+    from api.user.rendering import dumps, product_rows
+    from api.user.serializers import ProductSerializer
+
+    host = next((h for h in settings.ALLOWED_HOSTS if h not in {"*", ""}), "localhost")
+    request = RequestFactory().get("/products/1/", HTTP_HOST=host.lstrip("."))
+    origin = request_origin(request)
+
+    results = []
+    with transaction.atomic():
+        for size in sizes:
+            category = Category.objects.create(name=f"render_bench {size}")
+            Product.objects.bulk_create(
+                Product(
+                    category=category,
+                    name=f"Товар {i}",
+                    price=Decimal(10_000 + i * 5) / 100,
+                    discount_percent=15 if i % 3 == 0 else 0,
+                    image=f"product_images/{i}.jpg",
+                    image_telegram=f"product_images/variants/{i}_telegram.jpg",
+                    image_thumbnail=f"product_images/variants/{i}_thumb.jpg",
+                )
+                for i in range(size)
+            )
+            products = category.products.all()
+
+            variants = {
+                "serializer": lambda qs=products: JSONRenderer().render(
+                    ProductSerializer(qs, many=True, context={"request": request}).data,
+                ),
+                "values_drf_json": lambda qs=products: JSONRenderer().render(
+                    product_rows(qs, origin),
+                ),
+                "values_orjson": lambda qs=products: dumps(product_rows(qs, origin)),
+            }
+            timings = {name: best_of(repeat, func) for name, func in variants.items()}
+            bodies = {body for _seconds, body in timings.values()}
+
+            baseline = timings["serializer"][0]
+            results.append(
+                {
+                    "products": size,
+                    "identical_output": len(bodies) == 1,
+                    **{
+                        name: {
+                            "ms": round(seconds * 1000, 2),
+                            "rows_per_s": round(size / seconds),
+                            "speedup": round(baseline / seconds, 2),
+                        }
+                        for name, (seconds, _body) in timings.items()
+                    },
+                },
+            )
+        # Сгенерированные товары не должны остаться в базе
+        transaction.set_rollback(True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.config.settings")
+    django.setup()
+
+    print(json.dumps(run_benchmark(args.products, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from bot.cards import CardEditor
+
+
+class FakeMessage:
+    def __init__(self) -> None:
+        self.chat = SimpleNamespace(id=1)
+        self.message_id = 10
+        self.edits: list[dict[str, Any]] = []
+
+    async def edit_caption(self, **kwargs: Any) -> None:
+        self.edits.append(kwargs)
+
+
+def test_card_editor_coalesces_fast_taps() -> None:
+    message = FakeMessage()
+
+    async def scenario() -> None:
+        editor = CardEditor(delay=0.02)
+        for quantity in range(2, 7):
+            editor.schedule(message, caption=f"x{quantity}")
+        await asyncio.sleep(0.1)
+
+        editor.schedule(message, caption="x7")
+        await asyncio.sleep(0.1)
+        await editor.close()
+
+    asyncio.run(scenario())
+
+    assert message.edits == [{"caption": "x6"}, {"caption": "x7"}]
+
+
+def test_cancelled_edit_is_not_sent() -> None:
+    message = FakeMessage()
+
+    async def scenario() -> None:
+        editor = CardEditor(delay=0.02)
+        editor.schedule(message, caption="x2")
+        # Добавили товар в корзину до истечения задержки: правки не будет
+        await editor.cancel(message)
+        await asyncio.sleep(0.05)
+        assert not editor._tasks
+
+    asyncio.run(scenario())
+
+    assert message.edits == []
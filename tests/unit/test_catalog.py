@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from bot.api_client import close_api_client, open_api_client
+from bot.catalog import CatalogCache
+
+
+def test_catalog_cache_serves_from_memory_and_revalidates() -> None:
+    calls: list[str] = []
+    version = {"value": "1"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        headers = {"X-Catalog-Version": version["value"]}
+        if request.url.path == "/categories/":
+            return httpx.Response(200, json=[{"id": 1, "name": "Pizza"}], headers=headers)
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": 10,
+                    "name": "Margherita",
+                    "price": "50000.00",
+                    "discount_percent": 0,
+                    "final_price": 50000.0,
+                    "image": None,
+                },
+            ],
+            headers=headers,
+        )
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = CatalogCache("http://api", ttl=60, stale_ttl=120)
+        try:
+            first, second = await asyncio.gather(
+                cache.get_categories(),
+                cache.get_categories(),
+            )
+            assert first == second
+            assert first[0].name == "Pizza"
+            assert calls == ["/categories/"]
+
+            products = await cache.get_products(1)
+            assert products[0].as_dict()["name"] == "Margherita"
+            assert cache.find_product(10) is products[0]
+
+            # Устаревшие данные отдаются сразу, обновление идёт в фоне
+            cache._entries["categories"].fetched_at -= 90
+            version["value"] = "2"
+            assert await cache.get_categories() == first
+            await asyncio.sleep(0)
+            await asyncio.gather(*cache._pending.values())
+
+            # Новая версия каталога сбросила товары
+            assert cache.version == "2"
+            assert cache.find_product(10) is None
+            assert calls.count("/categories/") == 2
+        finally:
+            await cache.close()
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+
+def test_catalog_cache_returns_none_when_api_is_down() -> None:
+    async def scenario() -> None:
+        await open_api_client(
+            transport=httpx.MockTransport(lambda _request: httpx.Response(500)),
+        )
+        try:
+            assert await CatalogCache("http://api").get_categories() is None
+        finally:
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+
+def test_catalog_cache_revalidates_with_etag() -> None:
+    seen_etags: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_etags.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"abc"':
+            return httpx.Response(304, headers={"ETag": '"abc"'})
+        return httpx.Response(
+            200,
+            json=[{"id": 1, "name": "Pizza"}],
+            headers={"ETag": '"abc"'},
+        )
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = CatalogCache("http://api", ttl=0, stale_ttl=0)
+        try:
+            first = await cache.get_categories()
+            second = await cache.get_categories()
+            assert second == first
+        finally:
+            await cache.close()
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+    assert seen_etags == [None, '"abc"']
+
+
+def test_catalog_cache_warm_up_fills_every_entry() -> None:
+    calls: list[str] = []
+    snapshot = {
+        "version": 7,
+        "updated_at": "2026-01-01T00:00:00Z",
+        "categories": [
+            {
+                "id": 1,
+                "name": "Pizza",
+                "products": [
+                    {
+                        "id": 10,
+                        "name": "Margherita",
+                        "price": "50000.00",
+                        "discount_percent": 0,
+                        "final_price": 50000.0,
+                        "image": "http://api/media/m.png",
+                        "image_telegram": "http://api/media/m_tg.jpg",
+                    },
+                ],
+            },
+        ],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=snapshot)
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = CatalogCache("http://api", ttl=60, stale_ttl=120)
+        try:
+            assert await cache.warm_up()
+            assert cache.version == "7"
+            assert (await cache.get_categories())[0].name == "Pizza"
+            products = await cache.get_products(1)
+            assert products[0].image == "http://api/media/m_tg.jpg"
+            assert calls == ["/catalog/"]
+        finally:
+            await cache.close()
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+
+def test_catalog_cache_search_is_cached_per_query() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": 10,
+                    "name": "Margherita",
+                    "price": "50000.00",
+                    "discount_percent": 0,
+                    "final_price": 50000.0,
+                    "image": None,
+                    "category": 1,
+                },
+            ],
+        )
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = CatalogCache("http://api", search_ttl=60, search_size=2)
+        try:
+            assert await cache.search_products("m") == ()
+            found = await cache.search_products("Mar")
+            assert found[0].category_id == 1
+            assert await cache.search_products(" mar ") is found
+            assert calls == ["mar"]
+            assert cache.find_product(10) is found[0]
+
+            # Старые запросы вытесняются
+            await cache.search_products("pep")
+            await cache.search_products("que")
+            await cache.search_products("mar")
+            assert calls == ["mar", "pep", "que", "mar"]
+        finally:
+            await cache.close()
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+
+def test_catalog_cache_probes_version_before_serving_fresh_entries() -> None:
+    calls: list[str] = []
+    version = {"value": "1"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        headers = {"X-Catalog-Version": version["value"]}
+        if request.url.path == "/catalog/version/":
+            return httpx.Response(200, json={"version": 1}, headers=headers)
+        return httpx.Response(200, json=[{"id": 1, "name": "Pizza"}], headers=headers)
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = CatalogCache("http://api", ttl=300, version_interval=10)
+        try:
+            await cache.get_categories()
+            # Запись свежая, интервал проверки не прошёл — API не трогаем
+            await cache.get_categories()
+            assert calls == ["/categories/"]
+
+            cache._version_checked_at -= 11
+            await cache.get_categories()
+            assert calls == ["/categories/", "/catalog/version/"]
+
+            # Цены поменялись: проверка версии сбрасывает ещё свежий кэш
+            cache._version_checked_at -= 11
+            version["value"] = "2"
+            await cache.get_categories()
+            assert calls[-2:] == ["/catalog/version/", "/categories/"]
+            assert cache.version == "2"
+        finally:
+            await cache.close()
+            await close_api_client()
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from bot.api_client import close_api_client, open_api_client
+from bot.customers import CustomerClient
+
+
+def test_customer_client_sends_bot_token() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "POST":
+            return httpx.Response(200, json={"upserted": 1})
+        return httpx.Response(
+            200,
+            json=[{"telegram_id": 7, "phone": "+998901112233", "language": "uz"}],
+        )
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        client = CustomerClient("http://api", token="bot-secret")  # noqa: S106
+        try:
+            assert await client.get(7) == {"phone": "+998901112233", "language": "uz"}
+            await client.save(8, "+15550000000", "en")
+        finally:
+            await close_api_client()
+
+    asyncio.run(scenario())
+
+    assert [request.url.path for request in requests] == [
+        "/customers/",
+        "/customers/bulk/",
+    ]
+    assert all(request.headers["X-Bot-Token"] == "bot-secret" for request in requests)
+    assert json.loads(requests[1].content) == [
+        {"telegram_id": 8, "phone": "+15550000000", "language": "en"},
+    ]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisEventIsolation, RedisStorage
+
+import bot.fsm
+from bot.config.bot import FsmStorage
+
+
+def test_redis_fsm_storage_uses_ttls_and_compact_json(monkeypatch) -> None:
+    monkeypatch.setattr(bot.fsm, "FSM_STORAGE", FsmStorage.REDIS)
+    monkeypatch.setattr(bot.fsm, "FSM_STATE_TTL", 3600)
+
+    storage, isolation = bot.fsm.create_fsm_storage()
+
+    assert isinstance(storage, RedisStorage)
+    assert isinstance(isolation, RedisEventIsolation)
+    assert storage.state_ttl == 3600
+    assert storage.key_builder.prefix == "bot:fsm"
+    assert storage.json_dumps({"name": "Чай", "quantity": 2}) == (
+        '{"name":"Чай","quantity":2}'
+    )
+
+
+def test_memory_fsm_storage_by_default() -> None:
+    storage, _isolation = bot.fsm.create_fsm_storage()
+
+    assert isinstance(storage, MemoryStorage)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot import handlers, utils
+
+USER_ID = 7
+BOT_ID = 42
+PHONE = "+998901234567"
+
+
+def make_state() -> FSMContext:
+    key = StorageKey(bot_id=BOT_ID, chat_id=USER_ID, user_id=USER_ID)
+    return FSMContext(storage=MemoryStorage(), key=key)
+
+
+def test_contact_keeps_phone_and_language_after_registration(monkeypatch) -> None:
+    save_phone = AsyncMock()
+    monkeypatch.setattr(handlers, "save_phone", save_phone)
+    monkeypatch.setattr(handlers, "show_menu", AsyncMock())
+    message = SimpleNamespace(
+        from_user=SimpleNamespace(id=USER_ID, is_bot=False),
+        contact=SimpleNamespace(phone_number=PHONE),
+    )
+
+    async def scenario() -> tuple[str | None, dict]:
+        state = make_state()
+        await state.set_state(handlers.RegState.waiting_for_phone)
+        await state.update_data(language="uz")
+        await handlers.handle_contact(message, state)
+        return await state.get_state(), await state.get_data()
+
+    current_state, data = asyncio.run(scenario())
+
+    # Регистрация завершена; телефон и язык остались для корзины и заказа
+    assert current_state is None
+    assert data == {"phone": PHONE, "language": "uz"}
+    save_phone.assert_awaited_once_with(USER_ID, PHONE, "uz")
+
+
+def test_phone_of_bot_message_is_looked_up_by_chat(monkeypatch) -> None:
+    lookups: list[int] = []
+
+    async def get_phone(user_id: int) -> str:
+        lookups.append(user_id)
+        return PHONE
+
+    monkeypatch.setattr(utils, "get_phone", get_phone)
+    # call.message: сообщение написал бот, в личном чате id чата — id пользователя
+    bot_message = SimpleNamespace(
+        from_user=SimpleNamespace(id=BOT_ID, is_bot=True),
+        chat=SimpleNamespace(id=USER_ID),
+    )
+    user_message = SimpleNamespace(
+        from_user=SimpleNamespace(id=USER_ID, is_bot=False),
+        chat=SimpleNamespace(id=USER_ID),
+    )
+
+    async def scenario() -> list[str | None]:
+        return [
+            await utils.get_user_phone(bot_message, make_state()),
+            await utils.get_user_phone(user_message, make_state()),
+        ]
+
+    assert asyncio.run(scenario()) == [PHONE, PHONE]
+    assert lookups == [USER_ID, USER_ID]
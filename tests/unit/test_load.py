@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from tests.load.api_load import parse_stages, percentile, run_load, target_users
+
+
+def test_stages_ramp_linearly() -> None:
+    stages = parse_stages("10:10,10:5,0:5")
+    assert target_users(stages, 0) == 0
+    assert target_users(stages, 5) == 5
+    assert target_users(stages, 12) == 10
+    assert target_users(stages, 17.5) == 5
+    assert target_users(stages, 20) is None
+
+
+def test_percentile_is_nearest_rank() -> None:
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+
+def test_virtual_users_replay_the_bot_sequence() -> None:
+    carts: dict[str, int] = {}
+    order_keys: set[str] = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/categories/":
+            return httpx.Response(200, json=[{"id": 1, "name": "Pizza"}])
+        if path == "/products/1/":
+            return httpx.Response(200, json=[{"id": 10, "name": "Margherita"}])
+        if path == "/cart/add/":
+            phone = json.loads(request.content)["phone"]
+            carts[phone] = carts.get(phone, 0) + 1
+            return httpx.Response(200, json={"message": "ok"})
+        if path.startswith("/cart/"):
+            return httpx.Response(200, json={"items": [], "total_price": 0})
+        if path == "/order/":
+            order_keys.add(request.headers["Idempotency-Key"])
+            return httpx.Response(200, json={"order_id": len(order_keys)})
+        return httpx.Response(404)
+
+    report = asyncio.run(
+        run_load(
+            "http://api",
+            [(4, 0.1), (4, 0.3)],
+            think_time=0.01,
+            order_ratio=1.0,
+            transport=httpx.MockTransport(handler),
+        ),
+    )
+
+    assert report["peak_users"] == 4
+    assert report["errors"] == 0
+    assert report["journeys"] > 4
+    assert len(carts) == 4  # каждому пользователю — отдельная корзина
+    endpoints = report["endpoints"]
+    assert endpoints["order"]["requests"] == len(order_keys)
+    assert endpoints["categories"]["requests"] >= endpoints["order"]["requests"]
+    assert 0 < endpoints["cart"]["p50_ms"] <= endpoints["cart"]["p99_ms"]
+    json.dumps(report)
+
+
+def test_bot_harness_completes_the_customer_flow() -> None:
+    from tests.load.bot_harness import FLOW, BotHarness
+
+    report = asyncio.run(BotHarness(users=2).run())
+
+    assert set(report["actions"]) == {step.action for step in FLOW}
+    assert not any(action["unhandled"] for action in report["actions"].values())
+    # Телефон после регистрации не теряется: товар доходит до корзины и заказа
+    assert report["api_requests"]["/cart/add/"] == 2
+    assert report["api_requests"]["/order/"] == 4
+    assert report["actions"]["product"]["telegram_methods"] == {"SendPhoto": 2}
+    # Повтор заказа не шлёт второй чек ни клиенту, ни админам
+    assert "SendMessage" not in report["actions"]["order_again"]["telegram_methods"]
+    assert report["background_telegram_calls"]["SendDocument"] == 2
+    assert report["handlers"]["process_order"]["count"] == 4
+    assert {"max_lag_ms", "blocked_ms", "stalls"} <= set(report["event_loop"])
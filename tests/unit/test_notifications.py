@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendDocument
+
+from bot.notifications import AdminNotifier, TokenBucket
+
+METHOD = SendDocument(chat_id=1, document="file-id")
+
+
+def test_notifier_retries_after_flood_wait_and_drops_blocked_chats() -> None:
+    calls: list[int] = []
+
+    async def send_flaky() -> None:
+        calls.append(1)
+        if len(calls) == 1:
+            raise TelegramRetryAfter(
+                method=METHOD,
+                message="Too Many Requests",
+                retry_after=0,
+            )
+
+    async def send_blocked() -> None:
+        calls.append(2)
+        raise TelegramForbiddenError(method=METHOD, message="bot was blocked by the user")
+
+    async def scenario() -> None:
+        notifier = AdminNotifier(workers=2, global_rate=100, chat_rate=100)
+        notifier.enqueue(1, send_flaky)
+        notifier.enqueue(2, send_blocked)
+        await notifier.close(timeout=1)
+
+    asyncio.run(scenario())
+
+    assert sorted(calls) == [1, 1, 2]
+
+
+def test_token_bucket_limits_rate() -> None:
+    async def scenario() -> float:
+        bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # Первый токен сразу, остальные четыре — каждые 1/20 секунды
+    assert asyncio.run(scenario()) >= 0.18
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from aiogram.types import BufferedInputFile
+
+from bot.api_client import close_api_client, open_api_client
+from bot.photos import PhotoCache, answer_cached_photo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class FakeMessage:
+    def __init__(self) -> None:
+        self.sent: list[Any] = []
+
+    async def answer_photo(self, photo: Any, **_kwargs: Any) -> SimpleNamespace:
+        self.sent.append(photo)
+        return SimpleNamespace(photo=[SimpleNamespace(file_id=f"id-{len(self.sent)}")])
+
+
+def test_photo_is_uploaded_once_then_sent_by_file_id(tmp_path: Path) -> None:
+    downloads: list[str] = []
+    default = tmp_path / "default.jpeg"
+    default.write_bytes(b"default")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        downloads.append(request.url.path)
+        return httpx.Response(200, content=b"pizza")
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        cache = PhotoCache(str(tmp_path / "file_ids.json"))
+        message = FakeMessage()
+        try:
+            for _ in range(3):
+                await answer_cached_photo(
+                    message,
+                    "http://api/media/pizza.jpg",
+                    cache,
+                    str(default),
+                    caption="Pizza",
+                )
+            # Копия картинки по другому URL — переиспользуем file_id по хэшу
+            await answer_cached_photo(
+                message,
+                "http://api/media/pizza_copy.jpg",
+                cache,
+                str(default),
+            )
+            await asyncio.sleep(0.05)
+        finally:
+            await close_api_client()
+
+        assert isinstance(message.sent[0], BufferedInputFile)
+        assert message.sent[1:] == ["id-1", "id-1", "id-1"]
+        assert downloads == ["/media/pizza.jpg", "/media/pizza_copy.jpg"]
+
+    asyncio.run(scenario())
+
+    stored = json.loads((tmp_path / "file_ids.json").read_text())
+    assert stored["urls"]["http://api/media/pizza.jpg"]["file_id"] == "id-1"
+    assert (
+        PhotoCache(str(tmp_path / "file_ids.json")).get(
+            "http://api/media/pizza.jpg",
+        )
+        == "id-1"
+    )
+
+
+def test_failed_download_falls_back_without_caching_url(tmp_path: Path) -> None:
+    default = tmp_path / "default.jpeg"
+    default.write_bytes(b"default")
+
+    async def scenario() -> None:
+        await open_api_client(
+            transport=httpx.MockTransport(lambda _request: httpx.Response(404)),
+        )
+        cache = PhotoCache(str(tmp_path / "file_ids.json"))
+        try:
+            await answer_cached_photo(
+                FakeMessage(),
+                "http://api/media/missing.jpg",
+                cache,
+                str(default),
+            )
+        finally:
+            await close_api_client()
+        assert cache.get("http://api/media/missing.jpg") is None
+
+    asyncio.run(scenario())
+
+
+def test_replaced_photo_behind_same_url_is_uploaded_again(tmp_path: Path) -> None:
+    default = tmp_path / "default.jpeg"
+    default.write_bytes(b"default")
+    content = {"body": b"pizza", "etag": '"v1"'}
+    conditional: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == content["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=content["body"],
+            headers={"ETag": content["etag"]},
+        )
+
+    async def scenario() -> None:
+        await open_api_client(transport=httpx.MockTransport(handler))
+        # Каждую отправку из кэша сначала сверяем на сервере
+        cache = PhotoCache(str(tmp_path / "file_ids.json"), revalidate_after=0)
+        message = FakeMessage()
+        url = "http://api/media/pizza.jpg"
+        try:
+            await answer_cached_photo(message, url, cache, str(default))
+            await answer_cached_photo(message, url, cache, str(default))
+            content.update(body=b"new pizza", etag='"v2"')
+            await answer_cached_photo(message, url, cache, str(default))
+            await asyncio.sleep(0.05)
+        finally:
+            await close_api_client()
+
+        assert message.sent[1] == "id-1"
+        assert isinstance(message.sent[2], BufferedInputFile)
+        assert conditional == [None, '"v1"', '"v1"']
+        assert cache.get(url) == "id-3"
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from bot.config.bot import RECEIPT_FONT_PATH
+from bot.receipts import Receipt, ReceiptRenderer
+
+LOGO = str(Path(__file__).resolve().parents[2] / "media" / "logo.png")
+
+
+@pytest.mark.skipif(not Path(RECEIPT_FONT_PATH).exists(), reason="DejaVu font missing")
+def test_renderer_builds_pdf_in_memory() -> None:
+    receipt = Receipt(
+        order_id=7,
+        company_name="Aira 🛒",
+        company_phone="90 000 00 00",
+        client_phone="+998900000000",
+        created_at="01.01.2026 10:00",
+        total=9000.0,
+        items=[
+            {"name": "Чай 🍵", "quantity": 2, "price": "5000", "discount_percent": 10},
+        ],
+    )
+
+    async def scenario() -> bytes:
+        renderer = ReceiptRenderer(
+            RECEIPT_FONT_PATH,
+            LOGO,
+            workers=1,
+            use_processes=False,
+        )
+        try:
+            return await renderer.render(receipt)
+        finally:
+            renderer.close()
+
+    pdf = asyncio.run(scenario())
+
+    assert pdf.startswith(b"%PDF")
+    assert len(pdf) < 100_000
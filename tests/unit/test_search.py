@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from aiogram.dispatcher.event.bases import UNHANDLED
+
+from bot import search
+from bot.catalog import CatalogProduct
+
+
+class FakeState:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def set_state(self, state: Any) -> None:
+        self.state = state
+
+    async def update_data(self, **kwargs: Any) -> None:
+        self.data.update(kwargs)
+
+
+def test_found_product_is_opened_by_id_from_our_bot_only(monkeypatch) -> None:
+    product = CatalogProduct.from_api(
+        {
+            "id": 12,
+            "name": "Маргарита",
+            "price": "50000.00",
+            "discount_percent": 0,
+            "final_price": 50000.0,
+            "image": None,
+            "category": 1,
+        },
+    )
+    previews: list[dict] = []
+
+    async def send_product_preview(message, product, quantity, state) -> None:
+        previews.append(product)
+
+    monkeypatch.setattr(search.catalog_cache, "find_product", {12: product}.get)
+    monkeypatch.setattr(search, "send_product_preview", send_product_preview)
+    result = search.build_search_result(product, "ru")
+
+    def message(text: str, via_bot_id: int) -> SimpleNamespace:
+        return SimpleNamespace(
+            text=text,
+            via_bot=SimpleNamespace(id=via_bot_id),
+            bot=SimpleNamespace(id=1),
+        )
+
+    async def scenario() -> list[Any]:
+        state = FakeState()
+        return [
+            await search.open_found_product(
+                message(result.input_message_content.message_text, 2),
+                state,
+            ),
+            # Товар без id в последней строке не открывается, даже если название совпадает
+            await search.open_found_product(message("Маргарита", 1), state),
+            await search.open_found_product(message("Маргарита\n#13", 1), state),
+            await search.open_found_product(
+                message(result.input_message_content.message_text, 1),
+                state,
+            ),
+        ]
+
+    assert asyncio.run(scenario()) == [UNHANDLED, UNHANDLED, UNHANDLED, None]
+    assert previews == [product.as_dict()]
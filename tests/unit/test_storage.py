@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import TYPE_CHECKING
+
+from bot.storage import ProfileStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_profile_store_reads_file_once(tmp_path: Path) -> None:
+    path = tmp_path / "phones.json"
+    path.write_text(json.dumps({"1": {"phone": "+998", "language": "uz"}, "2": "+1"}))
+
+    store = ProfileStore(str(path), reload_interval=60)
+
+    assert store.get(1) == {"phone": "+998", "language": "uz"}
+    assert store.get("2") == {"phone": "+1", "language": "ru"}
+    assert store.get(3) is None
+
+
+def test_profile_store_writes_atomically_outside_loop(tmp_path: Path) -> None:
+    path = tmp_path / "phones.json"
+    store = ProfileStore(str(path))
+
+    store.set(1, "+998", "en")
+
+    assert json.loads(path.read_text()) == {"1": {"phone": "+998", "language": "en"}}
+    assert os.listdir(tmp_path) == ["phones.json"]
+
+
+def test_profile_store_batches_writes_inside_loop(tmp_path: Path) -> None:
+    path = tmp_path / "phones.json"
+    store = ProfileStore(str(path), flush_delay=0.01)
+
+    async def scenario() -> None:
+        store.set(1, "+1")
+        store.set(2, "+2")
+        assert not path.exists()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+
+    assert set(json.loads(path.read_text())) == {"1", "2"}
+
+
+def test_profile_store_reloads_changed_file(tmp_path: Path) -> None:
+    path = tmp_path / "phones.json"
+    path.write_text(json.dumps({"1": {"phone": "+1", "language": "ru"}}))
+    store = ProfileStore(str(path), reload_interval=0)
+    assert store.get(2) is None
+
+    path.write_text(json.dumps({"2": {"phone": "+2", "language": "ru"}}) + " ")
+
+    assert store.get(2) == {"phone": "+2", "language": "ru"}
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aiogram import Bot, Dispatcher, Router
+from aiohttp.test_utils import TestServer
+
+from bot.webhook import create_webhook_app, derive_webhook_secret
+from tests.load.fake_updates import make_message_update, post_updates
+
+if TYPE_CHECKING:
+    from aiogram.types import Message
+
+
+def test_webhook_acks_before_handling_and_checks_secret() -> None:
+    handled: list[str] = []
+    router = Router()
+
+    @router.message()
+    async def slow_handler(message: Message) -> None:
+        await asyncio.sleep(1.0)
+        handled.append(message.text)
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+    bot = Bot("42:TEST")
+    secret = derive_webhook_secret("42:TEST")
+
+    async def scenario() -> tuple[list, list]:
+        app = create_webhook_app(dispatcher, bot, path="/webhook", secret_token=secret)
+        server = TestServer(app)
+        await server.start_server()
+        url = str(server.make_url("/webhook"))
+        try:
+            accepted = await post_updates(
+                url,
+                secret,
+                [make_message_update(1, "/start"), make_message_update(2, "hi")],
+            )
+            rejected = await post_updates(url, "wrong", [make_message_update(3, "x")])
+        finally:
+            # Остановка сервера дожидается апдейтов, принятых в фоне
+            await server.close()
+        return accepted, rejected
+
+    accepted, rejected = asyncio.run(scenario())
+
+    assert [status for status, _ in accepted] == [200, 200]
+    assert all(latency < 1.0 for _, latency in accepted)
+    assert [status for status, _ in rejected] == [401]
+    assert sorted(handled) == ["/start", "hi"]